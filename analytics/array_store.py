@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import shutil
+import numpy as np
+
+META_FILE = "meta.json"
+PAGE_SIZE = 4096
+KEEP_VERSIONS = 2        # current build + the one before it (readers may still be opening it)
+REPLACE_RETRIES = 20     # Windows refuses to replace meta.json while a reader has it open
+
+
+def save_arrays(path, arrays, meta=None):
+    """
+    Write a new version of the store at `path`.
+
+    Arrays are written uncompressed on purpose: np.load(mmap_mode="r") can
+    then map them straight from the page cache, so every process reading
+    the store shares one physical copy.
+
+    Every build goes to its own subdirectory (path/v<time>_<pid>/*.npy) and
+    is published by replacing path/meta.json, which names the current
+    version — a single atomic file rename. Readers see either the old or
+    the new store, never a mix, and directories that are still mapped are
+    never renamed. Superseded versions are deleted lazily by later saves.
+    """
+    os.makedirs(path, exist_ok=True)
+    version = f"v{time.time_ns()}_{os.getpid()}"
+    version_path = os.path.join(path, version)
+    os.makedirs(version_path)
+
+    for name, arr in arrays.items():
+        np.save(os.path.join(version_path, f"{name}.npy"), np.ascontiguousarray(arr))
+
+    tmp_meta = os.path.join(path, f"{META_FILE}.{version}.tmp")
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump({"arrays": sorted(arrays), **(meta or {}), "version": version}, f, indent=2, default=str)
+
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(tmp_meta, os.path.join(path, META_FILE))
+            break
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(0.05)
+
+    remove_old_versions(path, keep=version)
+    return path
+
+
+def remove_old_versions(path, keep):
+    """
+    Delete superseded versions beyond the newest KEEP_VERSIONS, plus arrays
+    left at the top level by the older single-directory layout. Anything
+    still mapped (Windows) is skipped and retried on the next save.
+    """
+    versions = sorted(
+        (d for d in os.listdir(path) if d.startswith("v") and os.path.isdir(os.path.join(path, d))),
+        key=lambda d: int(d[1:].split("_")[0]),
+    )
+    stale = [d for d in versions[:-KEEP_VERSIONS] if d != keep]
+    for d in stale:
+        shutil.rmtree(os.path.join(path, d), ignore_errors=True)
+
+    for name in os.listdir(path):
+        if name.endswith(".npy"):
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass
+
+
+def has_arrays(path):
+    """True once a store has been published at `path`."""
+    return os.path.exists(os.path.join(path, META_FILE))
+
+
+def load_meta(path):
+    with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_arrays(path, mmap=True):
+    """Return (arrays, meta) for the current version. With mmap=True the arrays are read-only memory maps."""
+    mode = "r" if mmap else None
+    for attempt in range(REPLACE_RETRIES):
+        meta = load_meta(path)
+        # Stores written before versioning keep their arrays next to meta.json
+        version_path = os.path.join(path, meta["version"]) if "version" in meta else path
+        try:
+            arrays = {
+                name: np.load(os.path.join(version_path, f"{name}.npy"), mmap_mode=mode)
+                for name in meta["arrays"]
+            }
+            return arrays, meta
+        except FileNotFoundError:
+            # Superseded and cleaned up between reading meta.json and opening it — re-read
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+
+
+def warm_arrays(arrays):
+    """Touch one byte per page so the whole store is resident before first use."""
+    touched = 0
+    for arr in arrays.values():
+        raw = np.asarray(arr).reshape(-1).view(np.uint8)
+        raw[::PAGE_SIZE].sum(dtype=np.int64)
+        touched += raw.nbytes
+    return touched
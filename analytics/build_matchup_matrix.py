@@ -0,0 +1,118 @@
+import os
+import sys
+import datetime
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from analytics.array_store import save_arrays, load_arrays, has_arrays
+from analytics.predict_slate import SLATE_VERSIONS, predict_matchups
+from analytics.team_features import fetch_last10_form, fetch_season_features
+from analytics.win_model_versions import MODELS_DIR, get_version
+from profiling import profile_from_env
+
+MATRIX_PATH = os.path.join(MODELS_DIR, "matchup_matrix")
+
+
+class MatchupMatrix:
+    """
+    Precomputed (home %, away %) win probabilities for every ordered
+    (home, away) pair, per model version, plus the feature values each
+    prediction used. Arrays are memory-mapped from models/matchup_matrix.
+    """
+
+    def __init__(self, arrays, meta):
+        self.arrays = arrays
+        self.meta = meta
+        self.team_index = {
+            v: {team: i for i, team in enumerate(meta["teams"][v])}
+            for v in meta["teams"]
+        }
+
+    @classmethod
+    def load(cls, path=MATRIX_PATH):
+        if not has_arrays(path):
+            raise FileNotFoundError(f"No matchup matrix at {path} — run analytics/build_matchup_matrix.py")
+        arrays, meta = load_arrays(path, mmap=True)
+        return cls(arrays, meta)
+
+    def lookup(self, version, home, away):
+        """Return {"home_prob", "away_prob", "features"} or None if the pair is not in the matrix."""
+        index = self.team_index.get(version, {})
+        if home not in index or away not in index or home == away:
+            return None
+
+        i, j = index[home], index[away]
+        home_prob, away_prob = self.arrays[f"{version}_proba"][i, j]
+        if np.isnan(home_prob):
+            return None
+
+        values = self.arrays[f"{version}_features"][i, j]
+        return {
+            "home_prob": float(home_prob),
+            "away_prob": float(away_prob),
+            "features": dict(zip(self.meta["feature_names"][version], map(float, values))),
+        }
+
+
+def build_matchup_matrix(versions=SLATE_VERSIONS, path=MATRIX_PATH):
+    print("\n🧮 Building matchup probability matrix\n")
+
+    conn = get_connection()
+    teams = {}
+    if "v2" in versions:
+        teams["v2"] = sorted(fetch_last10_form(conn).index)
+    if "v3" in versions:
+        teams["v3"] = sorted(fetch_season_features(conn).index)
+
+    # Every ordered (home, away) pair, scored in one batch per model
+    all_teams = sorted(set().union(*teams.values()))
+    pairs = pd.DataFrame(
+        [(h, a) for h in all_teams for a in all_teams if h != a],
+        columns=["HOME_TEAM", "AWAY_TEAM"],
+    )
+
+    scored = predict_matchups(conn, pairs, versions=list(teams))
+    conn.close()
+
+    arrays, feature_names = {}, {}
+    for version, team_list in teams.items():
+        cols = get_version(version)["feature_cols"]
+        n = len(team_list)
+        index = {team: i for i, team in enumerate(team_list)}
+
+        rows = scored[
+            (scored["MODEL_VERSION"] == version)
+            & scored["HOME_TEAM"].isin(index)
+            & scored["AWAY_TEAM"].isin(index)
+        ]
+        i = rows["HOME_TEAM"].map(index).to_numpy()
+        j = rows["AWAY_TEAM"].map(index).to_numpy()
+
+        # Percentages, rounded exactly like the pages display them
+        proba = np.full((n, n, 2), np.nan)
+        proba[i, j] = rows[["HOME_WIN_PROB", "AWAY_WIN_PROB"]].to_numpy(dtype=float)
+        features = np.full((n, n, len(cols)), np.nan)
+        features[i, j] = rows[cols].to_numpy(dtype=float)
+
+        arrays[f"{version}_proba"] = proba
+        arrays[f"{version}_features"] = features
+        feature_names[version] = cols
+
+        print(f"   • {version.upper()}: {n} teams → {len(rows)} ordered matchups")
+
+    save_arrays(path, arrays, {
+        "teams": teams,
+        "feature_names": feature_names,
+        "built_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    })
+
+    print(f"\n💾 Saved → {path}")
+    print("🎉 Predictor pages now answer from the matrix without a model call.\n")
+    return path
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    build_matchup_matrix()
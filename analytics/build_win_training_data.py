@@ -6,6 +6,9 @@ import pandas as pd
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import get_connection
+from analytics.srs_ratings import pregame_srs
+from analytics.head_to_head import pregame_head_to_head
+from profiling import profile_from_env
 
 
 def build_training_data():
@@ -18,6 +21,7 @@ def build_training_data():
     query = """
         SELECT
             g.GAME_ID,
+            g.GAME_DATE,
             g.SEASON,
             g.HOME_TEAM,
             g.AWAY_TEAM,
@@ -64,6 +68,16 @@ def build_training_data():
 
     df = df.dropna(subset=numeric_cols)
 
+    # Opponent-adjusted strength (analytics/srs_ratings.py) from earlier dates only; 0 = league average
+    srs = pregame_srs(df)
+    df["HOME_SRS"] = srs["HOME_SRS"]
+    df["AWAY_SRS"] = srs["AWAY_SRS"]
+
+    # Home team's record vs this opponent from earlier games only
+    h2h = pregame_head_to_head(df)
+    df["HOME_H2H_GAMES"] = h2h["H2H_GAMES"]
+    df["HOME_H2H_WIN_PCT"] = (h2h["H2H_WINS"] / h2h["H2H_GAMES"]).where(h2h["H2H_GAMES"] > 0, 0.5)
+
     # Save to CSV
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     data_dir = os.path.join(project_root, "data")
@@ -77,4 +91,5 @@ def build_training_data():
 
 
 if __name__ == "__main__":
+    profile_from_env()
     build_training_data()
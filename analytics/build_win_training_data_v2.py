@@ -4,6 +4,9 @@ import sys, os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import get_connection
+from profiling import profile_from_env
+
+profile_from_env()
 
 print("\n📡 Building Win Predictor Training Dataset V2 — Momentum Based Model\n")
 
@@ -13,7 +16,7 @@ conn = get_connection()
 # LOAD GAME LOGS (IMPORTANT)
 # =======================
 game_logs = pd.read_sql("""
-    SELECT GAME_DATE, SEASON, HOME_TEAM, AWAY_TEAM, HOME_POINTS, AWAY_POINTS,
+    SELECT GAME_ID, GAME_DATE, SEASON, HOME_TEAM, AWAY_TEAM, HOME_POINTS, AWAY_POINTS,
            WINNER, LOSER
     FROM NBA_GAME_LOGS
     ORDER BY GAME_DATE DESC
@@ -67,6 +70,8 @@ training_rows = []
 
 for idx, row in game_logs.iterrows():
     training_rows.append({
+        "GAME_ID": row.GAME_ID,
+        "GAME_DATE": row.GAME_DATE.date(),
         "HOME_LAST10_WIN_PCT": last10_win_pct(row.HOME_TEAM, row.GAME_DATE),
         "AWAY_LAST10_WIN_PCT": last10_win_pct(row.AWAY_TEAM, row.GAME_DATE),
         "HOME_LAST10_PTS": avg_points_last10(row.HOME_TEAM, row.GAME_DATE),
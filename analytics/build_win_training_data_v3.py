@@ -5,6 +5,9 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import get_connection
+from profiling import profile_from_env
+
+profile_from_env()
 
 print("\n==============================")
 print("📡 BUILDING WIN PREDICTOR V3")
@@ -57,10 +60,10 @@ for _, row in game_logs.iterrows():
         continue
 
     rows.append({
-        "HOME_WIN_PCT": float(home_season.WIN_PCT),
-        "AWAY_WIN_PCT": float(away_season.WIN_PCT),
-        "HOME_SEASON_PTS": float(home_season.POINTS),
-        "AWAY_SEASON_PTS": float(away_season.POINTS),
+        "HOME_WIN_PCT": float(home_season.WIN_PCT.iloc[0]),
+        "AWAY_WIN_PCT": float(away_season.WIN_PCT.iloc[0]),
+        "HOME_SEASON_PTS": float(home_season.POINTS.iloc[0]),
+        "AWAY_SEASON_PTS": float(away_season.POINTS.iloc[0]),
         "HOME_PPG": ppg_map.get(home, 15),
         "AWAY_PPG": ppg_map.get(away, 15),
 
@@ -0,0 +1,282 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from analytics.team_name_map import normalize
+from etl_scripts.db_utils import create_table_if_missing, create_index_if_missing
+from profiling import profile_from_env
+
+# FiveThirtyEight-style NBA Elo
+INITIAL_ELO = 1500.0
+MEAN_ELO = 1505.0            # new-season regression target
+SEASON_CARRYOVER = 0.75      # keep 3/4 of last season's distance from the mean
+K_FACTOR = 20.0
+HOME_ADVANTAGE = 100.0
+
+STATE_DDL = """
+    CREATE TABLE NBA_TEAM_ELO (
+        TEAM_NAME      VARCHAR2(100) PRIMARY KEY,
+        ELO            NUMBER,
+        SEASON         NUMBER,
+        GAMES          NUMBER,
+        LAST_GAME_DATE DATE,
+        LAST_GAME_ID   NUMBER,
+        UPDATED_AT     TIMESTAMP DEFAULT SYSTIMESTAMP
+    )
+"""
+
+HISTORY_DDL = """
+    CREATE TABLE NBA_TEAM_ELO_HISTORY (
+        TEAM_NAME  VARCHAR2(100) NOT NULL,
+        GAME_DATE  DATE          NOT NULL,
+        GAME_ID    NUMBER        NOT NULL,
+        SEASON     NUMBER,
+        OPP_NAME   VARCHAR2(100),
+        IS_HOME    NUMBER(1),
+        ELO_PRE    NUMBER,
+        ELO_POST   NUMBER,
+        CONSTRAINT NBA_TEAM_ELO_HISTORY_PK PRIMARY KEY (TEAM_NAME, GAME_DATE, GAME_ID)
+    )
+"""
+
+# As-of lookups for the whole league on one date
+HISTORY_DATE_INDEX = "CREATE INDEX NBA_TEAM_ELO_HIST_DATE_IX ON NBA_TEAM_ELO_HISTORY (GAME_DATE)"
+
+
+def elo_win_prob(home_elo, away_elo, home_advantage=HOME_ADVANTAGE):
+    """P(home win) — works on scalars or numpy arrays."""
+    diff = np.asarray(away_elo, dtype=float) - np.asarray(home_elo, dtype=float) - home_advantage
+    return 1.0 / (1.0 + 10.0 ** (diff / 400.0))
+
+
+def mov_multiplier(margin, winner_elo_diff):
+    """Margin-of-victory multiplier, damped when the favourite wins (autocorrelation fix)."""
+    return ((abs(margin) + 3.0) ** 0.8) / (7.5 + 0.006 * winner_elo_diff)
+
+
+def regress_to_mean(elo):
+    return MEAN_ELO + SEASON_CARRYOVER * (elo - MEAN_ELO)
+
+
+def apply_games(games, state):
+    """
+    Walk `games` (date order) and update `state` in place:
+    {team: {"ELO", "SEASON", "GAMES", "LAST_GAME_DATE", "LAST_GAME_ID"}}.
+    Returns the per-team history rows. Cost is O(len(games)) — nothing
+    before the watermark is replayed.
+    """
+    history = []
+
+    for g in games.itertuples(index=False):
+        pre = {}
+        for team in (g.HOME_TEAM, g.AWAY_TEAM):
+            s = state.setdefault(team, {"ELO": INITIAL_ELO, "SEASON": g.SEASON, "GAMES": 0})
+            if s["SEASON"] != g.SEASON:
+                s["ELO"] = regress_to_mean(s["ELO"])
+                s["SEASON"] = g.SEASON
+            pre[team] = s["ELO"]
+
+        home_elo, away_elo = pre[g.HOME_TEAM], pre[g.AWAY_TEAM]
+        expected = float(elo_win_prob(home_elo, away_elo))
+        margin = g.HOME_POINTS - g.AWAY_POINTS
+        home_won = 1.0 if margin > 0 else 0.0
+
+        # Elo difference from the winner's side, home edge included
+        winner_diff = (home_elo + HOME_ADVANTAGE - away_elo) * (1 if margin > 0 else -1)
+        shift = K_FACTOR * mov_multiplier(margin, winner_diff) * (home_won - expected)
+
+        post = {g.HOME_TEAM: home_elo + shift, g.AWAY_TEAM: away_elo - shift}
+        for team, opp, is_home in ((g.HOME_TEAM, g.AWAY_TEAM, 1), (g.AWAY_TEAM, g.HOME_TEAM, 0)):
+            s = state[team]
+            s["ELO"] = post[team]
+            s["GAMES"] += 1
+            s["LAST_GAME_DATE"] = g.GAME_DATE
+            s["LAST_GAME_ID"] = g.GAME_ID
+            history.append([team, pd.Timestamp(g.GAME_DATE).to_pydatetime(), int(g.GAME_ID),
+                            int(g.SEASON), opp, is_home, round(pre[team], 2), round(post[team], 2)])
+
+    return history
+
+
+def ensure_tables(cursor):
+    create_table_if_missing(cursor, STATE_DDL)
+    create_table_if_missing(cursor, HISTORY_DDL)
+    create_index_if_missing(cursor, HISTORY_DATE_INDEX)
+
+
+def load_state(conn):
+    df = pd.read_sql("""
+        SELECT TEAM_NAME, ELO, SEASON, GAMES, LAST_GAME_DATE, LAST_GAME_ID
+        FROM NBA_TEAM_ELO
+    """, conn)
+    return {r.TEAM_NAME: {"ELO": r.ELO, "SEASON": r.SEASON, "GAMES": r.GAMES,
+                          "LAST_GAME_DATE": r.LAST_GAME_DATE, "LAST_GAME_ID": r.LAST_GAME_ID}
+            for r in df.itertuples(index=False)}
+
+
+def fetch_new_games(conn, state):
+    """Games strictly after the (GAME_DATE, GAME_ID) watermark, in processing order."""
+    watermark = max(
+        ((s["LAST_GAME_DATE"], s["LAST_GAME_ID"]) for s in state.values() if s.get("LAST_GAME_DATE") is not None),
+        default=(None, None),
+    )
+    games = pd.read_sql("""
+        SELECT GAME_ID, GAME_DATE, SEASON, HOME_TEAM, AWAY_TEAM, HOME_POINTS, AWAY_POINTS
+        FROM NBA_GAME_LOGS
+        WHERE HOME_POINTS IS NOT NULL AND AWAY_POINTS IS NOT NULL
+          AND (:wm_date IS NULL
+               OR GAME_DATE > :wm_date
+               OR (GAME_DATE = :wm_date AND GAME_ID > :wm_id))
+        ORDER BY GAME_DATE, GAME_ID
+    """, conn, params={"wm_date": watermark[0], "wm_id": watermark[1]})
+
+    for col in ["HOME_TEAM", "AWAY_TEAM"]:
+        games[col] = games[col].map(normalize)
+    return games, watermark
+
+
+def count_backfilled(conn, watermark):
+    """Games loaded after the fact with dates at or before the watermark."""
+    if watermark[0] is None:
+        return 0
+    return int(pd.read_sql("""
+        SELECT COUNT(*) AS N
+        FROM NBA_GAME_LOGS g
+        WHERE g.GAME_DATE <= :wm_date
+          AND g.HOME_POINTS IS NOT NULL AND g.AWAY_POINTS IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM NBA_TEAM_ELO_HISTORY h
+              WHERE h.GAME_ID = g.GAME_ID AND h.GAME_DATE = g.GAME_DATE
+          )
+    """, conn, params={"wm_date": watermark[0]})["N"].iloc[0])
+
+
+def save_state(cursor, state, history):
+    cursor.executemany("""
+        INSERT INTO NBA_TEAM_ELO_HISTORY
+        (TEAM_NAME, GAME_DATE, GAME_ID, SEASON, OPP_NAME, IS_HOME, ELO_PRE, ELO_POST)
+        VALUES (:1, :2, :3, :4, :5, :6, :7, :8)
+    """, history)
+
+    cursor.executemany("""
+        MERGE INTO NBA_TEAM_ELO t
+        USING (
+            SELECT :1 AS TEAM_NAME, :2 AS ELO, :3 AS SEASON, :4 AS GAMES,
+                   :5 AS LAST_GAME_DATE, :6 AS LAST_GAME_ID
+            FROM dual
+        ) s
+        ON (t.TEAM_NAME = s.TEAM_NAME)
+        WHEN MATCHED THEN
+            UPDATE SET
+                t.ELO            = s.ELO,
+                t.SEASON         = s.SEASON,
+                t.GAMES          = s.GAMES,
+                t.LAST_GAME_DATE = s.LAST_GAME_DATE,
+                t.LAST_GAME_ID   = s.LAST_GAME_ID,
+                t.UPDATED_AT     = SYSTIMESTAMP
+        WHEN NOT MATCHED THEN
+            INSERT (TEAM_NAME, ELO, SEASON, GAMES, LAST_GAME_DATE, LAST_GAME_ID)
+            VALUES (s.TEAM_NAME, s.ELO, s.SEASON, s.GAMES, s.LAST_GAME_DATE, s.LAST_GAME_ID)
+    """, [
+        # Full precision, so the next incremental run continues exactly
+        [team, float(s["ELO"]), int(s["SEASON"]), int(s["GAMES"]),
+         pd.Timestamp(s["LAST_GAME_DATE"]).to_pydatetime(), int(s["LAST_GAME_ID"])]
+        for team, s in state.items()
+    ])
+
+
+def update_ratings(rebuild=False):
+    print("\n📈 Updating Elo ratings\n")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    ensure_tables(cursor)
+
+    if rebuild:
+        print("🧹 Rebuild requested — replaying every game from scratch")
+        cursor.execute("DELETE FROM NBA_TEAM_ELO_HISTORY")
+        cursor.execute("DELETE FROM NBA_TEAM_ELO")
+        state = {}
+    else:
+        state = load_state(conn)
+
+    games, watermark = fetch_new_games(conn, state)
+    if watermark[0] is not None:
+        print(f"🔖 Watermark: {pd.Timestamp(watermark[0]):%Y-%m-%d} (game {watermark[1]})")
+    print(f"🏀 New games: {len(games)}")
+
+    if not games.empty:
+        history = apply_games(games, state)
+        save_state(cursor, state, history)
+        conn.commit()
+        print(f"💾 {len(history)} rating rows → NBA_TEAM_ELO_HISTORY")
+
+    backfilled = count_backfilled(conn, watermark)
+    if backfilled:
+        print(f"⚠️ {backfilled} games were loaded with dates before the watermark — "
+              "run with --rebuild to fold them in")
+
+    top = sorted(state.items(), key=lambda kv: -kv[1]["ELO"])[:10]
+    if top:
+        print("\n🏆 Top 10")
+        for team, s in top:
+            print(f"   {s['ELO']:7.1f}  {team}")
+
+    cursor.close()
+    conn.close()
+    print("\n🎉 Elo update complete!\n")
+
+
+# =====================================
+# Readers
+# =====================================
+def fetch_current_elo(conn):
+    """Latest rating per team as a Series indexed by TEAM_NAME."""
+    df = pd.read_sql("SELECT TEAM_NAME, ELO FROM NBA_TEAM_ELO", conn)
+    return df.set_index("TEAM_NAME")["ELO"]
+
+
+def rating_as_of(conn, team, as_of):
+    """
+    A team's rating going into `as_of` (games strictly before that date):
+    one descending range scan on the history primary key.
+    """
+    df = pd.read_sql("""
+        SELECT ELO_POST, SEASON
+        FROM (
+            SELECT ELO_POST, SEASON
+            FROM NBA_TEAM_ELO_HISTORY
+            WHERE TEAM_NAME = :team AND GAME_DATE < :as_of
+            ORDER BY GAME_DATE DESC, GAME_ID DESC
+        )
+        WHERE ROWNUM = 1
+    """, conn, params={"team": normalize(team), "as_of": as_of})
+    return float(df["ELO_POST"].iloc[0]) if not df.empty else INITIAL_ELO
+
+
+def fetch_elo_as_of(conn, as_of):
+    """Every team's rating going into `as_of`, as a Series indexed by TEAM_NAME."""
+    df = pd.read_sql("""
+        SELECT TEAM_NAME, ELO_POST AS ELO
+        FROM (
+            SELECT TEAM_NAME, ELO_POST,
+                   ROW_NUMBER() OVER (PARTITION BY TEAM_NAME ORDER BY GAME_DATE DESC, GAME_ID DESC) AS RN
+            FROM NBA_TEAM_ELO_HISTORY
+            WHERE GAME_DATE < :as_of
+        )
+        WHERE RN = 1
+    """, conn, params={"as_of": as_of})
+    return df.set_index("TEAM_NAME")["ELO"]
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Incremental Elo ratings over NBA_GAME_LOGS")
+    parser.add_argument("--rebuild", action="store_true", help="discard stored ratings and replay all games")
+    args = parser.parse_args()
+
+    update_ratings(rebuild=args.rebuild)
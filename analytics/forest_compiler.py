@@ -0,0 +1,350 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics.win_model_versions import WIN_MODEL_VERSIONS, load_artifact
+from analytics.array_store import save_arrays, load_arrays, warm_arrays, has_arrays
+from profiling import profile_from_env
+
+CHUNK_ROWS = 4096    # rows scored per pass in batch mode
+SKLEARN_ROWS = 512   # from here on sklearn's per-tree Cython loop beats the level-by-level numpy walk
+ARRAY_FIELDS = ["feature", "threshold", "children", "missing_left", "is_leaf", "value", "roots", "classes"]
+
+
+class CompiledForest:
+    """
+    A fitted RandomForestClassifier flattened into contiguous node arrays.
+
+    All trees live in one set of arrays; `roots` holds the index of each
+    tree's root node and `children[2 * node + go_left]` is the next node.
+    Thresholds are stored as the largest float32 not above sklearn's
+    float64 threshold, so comparing float32 inputs gives identical splits.
+    """
+
+    def __init__(self, feature, threshold, children, missing_left, is_leaf, value,
+                 roots, classes, feature_names):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.missing_left = missing_left
+        self.is_leaf = is_leaf
+        self.value = value
+        self.roots = roots
+        self.classes_ = np.asarray(classes)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.model = None             # source RandomForestClassifier, for large batches
+        self.source_version = None    # or the win model version to load it from on demand
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def _as_matrix(self, X):
+        if isinstance(X, pd.DataFrame):
+            if self.feature_names is not None:
+                X = X[self.feature_names]
+            X = X.to_numpy()
+        # sklearn trees see float32 inputs
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return X
+
+    def apply(self, X):
+        """Leaf node index reached by every row in every tree → (n_rows, n_trees)."""
+        X = self._as_matrix(X)
+        n_rows, n_features = X.shape
+        flat_x = X.ravel()
+        has_nan = bool(np.isnan(flat_x).any())
+
+        leaves = np.tile(self.roots, n_rows)
+        row_base = np.repeat(np.arange(n_rows, dtype=leaves.dtype) * n_features, self.n_trees)
+
+        # Walk every (row, tree) pair down one level at a time, dropping the
+        # pairs that have reached a leaf so shallow trees finish early
+        active = np.arange(leaves.size)
+        nodes = leaves
+        while active.size:
+            x = flat_x[row_base + self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if has_nan:
+                go_left = np.where(np.isnan(x), self.missing_left[nodes], go_left)
+            nodes = self.children[2 * nodes + go_left]
+
+            leaves[active] = nodes
+            keep = ~self.is_leaf[nodes]
+            active, nodes, row_base = active[keep], nodes[keep], row_base[keep]
+
+        return leaves.reshape(n_rows, self.n_trees)
+
+    def sklearn_model(self):
+        """The source forest (loaded from its pickle the first time), or None if unavailable."""
+        if self.model is None and self.source_version in WIN_MODEL_VERSIONS \
+                and os.path.exists(WIN_MODEL_VERSIONS[self.source_version]["model_path"]):
+            self.model = load_artifact(self.source_version)[0]
+        return self.model
+
+    def predict_proba(self, X):
+        """
+        Same probabilities as RandomForestClassifier.predict_proba, bit for bit.
+        Small batches (single matchups, slates) walk the node arrays; batches of
+        SKLEARN_ROWS or more go to the source model when it can be found.
+        """
+        X = self._as_matrix(X)
+        if X.shape[0] >= SKLEARN_ROWS and self.sklearn_model() is not None:
+            if hasattr(self.model, "feature_names_in_"):
+                X = pd.DataFrame(X, columns=self.model.feature_names_in_)
+            return self.model.predict_proba(X)
+        return self._walk_proba(X)
+
+    def _walk_proba(self, X):
+        X = self._as_matrix(X)
+        out = np.empty((X.shape[0], len(self.classes_)), dtype=np.float64)
+
+        for start in range(0, X.shape[0], CHUNK_ROWS):
+            leaves = self.apply(X[start:start + CHUNK_ROWS])
+            # cumsum adds the trees in order, exactly like sklearn's accumulator
+            total = np.cumsum(self.value[leaves], axis=1)[:, -1, :]
+            out[start:start + CHUNK_ROWS] = total / self.n_trees
+
+        return out
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, f).nbytes for f in ARRAY_FIELDS if f != "classes")
+
+    def save(self, path, meta=None):
+        """Write the node arrays as a memory-mappable directory (see array_store)."""
+        arrays = {f: getattr(self, f) for f in ARRAY_FIELDS if f != "classes"}
+        arrays["classes"] = self.classes_
+        return save_arrays(path, arrays, {"feature_names": self.feature_names, **(meta or {})})
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open a saved forest. With mmap=True every process shares the page-cache copy."""
+        arrays, meta = load_arrays(path, mmap=mmap)
+        forest = cls(
+            feature=arrays["feature"],
+            threshold=arrays["threshold"],
+            children=arrays["children"],
+            missing_left=arrays["missing_left"],
+            is_leaf=arrays["is_leaf"],
+            value=arrays["value"],
+            roots=arrays["roots"],
+            classes=np.array(arrays["classes"]),
+            feature_names=meta.get("feature_names"),
+        )
+        forest.meta = meta
+        forest.source_version = meta.get("version")
+        return forest
+
+    def warm(self):
+        """Fault every page in and run one prediction so the first real call is hot."""
+        warm_arrays({f: getattr(self, f) for f in ARRAY_FIELDS if f != "classes"})
+        n_features = len(self.feature_names) if self.feature_names else int(self.feature.max()) + 1
+        self.predict_proba(np.zeros((1, n_features)))
+        return self
+
+
+def compile_forest(model, feature_names=None):
+    """Flatten a fitted RandomForestClassifier into a CompiledForest."""
+    if getattr(model, "n_outputs_", 1) != 1:
+        raise ValueError("Only single-output forests can be compiled.")
+
+    features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+    offset = 0
+
+    for est in model.estimators_:
+        tree = est.tree_
+        n = tree.node_count
+        is_leaf = tree.children_left == -1
+        idx = np.arange(n)
+
+        # Leaves: dummy feature 0 and self-loops
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        lefts.append(np.where(is_leaf, idx, tree.children_left) + offset)
+        rights.append(np.where(is_leaf, idx, tree.children_right) + offset)
+        missing.append(
+            np.asarray(getattr(tree, "missing_go_to_left", np.zeros(n)), dtype=bool)
+        )
+
+        # sklearn >= 1.4 stores leaf fractions and returns them untouched;
+        # older releases stored weighted counts and normalised at predict time
+        proba = tree.value[:, 0, :].astype(np.float64)
+        normalizer = proba.sum(axis=1)[:, np.newaxis]
+        if not np.allclose(normalizer[is_leaf], 1.0):
+            normalizer[normalizer == 0.0] = 1.0
+            proba = proba / normalizer
+        values.append(proba)
+
+        roots.append(offset)
+        offset += n
+
+    index_dtype = np.int32 if 2 * offset < np.iinfo(np.int32).max else np.int64
+
+    # float32 x <= float64 t  ⇔  x <= (largest float32 that is <= t)
+    threshold64 = np.concatenate(thresholds)
+    threshold = threshold64.astype(np.float32)
+    above = threshold.astype(np.float64) > threshold64
+    threshold[above] = np.nextafter(threshold[above], np.float32(-np.inf))
+
+    left = np.concatenate(lefts)
+    right = np.concatenate(rights)
+    children = np.stack([right, left], axis=1).ravel().astype(index_dtype)
+
+    if feature_names is None and hasattr(model, "feature_names_in_"):
+        feature_names = list(model.feature_names_in_)
+
+    forest = CompiledForest(
+        feature=np.concatenate(features).astype(index_dtype),
+        threshold=threshold,
+        children=children,
+        missing_left=np.concatenate(missing),
+        is_leaf=left == np.arange(offset),
+        value=np.ascontiguousarray(np.concatenate(values)),
+        roots=np.asarray(roots, dtype=index_dtype),
+        classes=model.classes_,
+        feature_names=feature_names,
+    )
+    forest.model = model
+    return forest
+
+
+def compile_version(version):
+    """Load a saved win predictor ("v1"/"v2"/"v3") and compile it."""
+    model, feature_cols, _ = load_artifact(version)
+    return compile_forest(model, feature_cols), model
+
+
+def forest_path(version):
+    """models/win_predictor_v2.pkl → models/win_predictor_v2.forest"""
+    return os.path.splitext(WIN_MODEL_VERSIONS[version]["model_path"])[0] + ".forest"
+
+
+def export_version(version):
+    """Compile a saved pickle and write its memory-mappable .forest directory."""
+    compiled, model = compile_version(version)
+    path = compiled.save(forest_path(version), meta={
+        "version": version,
+        "source": os.path.basename(WIN_MODEL_VERSIONS[version]["model_path"]),
+        "source_mtime": os.path.getmtime(WIN_MODEL_VERSIONS[version]["model_path"]),
+        "n_trees": compiled.n_trees,
+        "n_nodes": compiled.n_nodes,
+    })
+    return path, compiled
+
+
+def load_forest(version, mmap=True):
+    """
+    Fast path for the dashboards: open the memory-mapped .forest export when
+    it is at least as new as the pickle, otherwise compile from the pickle.
+    """
+    pkl_path = WIN_MODEL_VERSIONS[version]["model_path"]
+    path = forest_path(version)
+
+    if has_arrays(path):
+        forest = CompiledForest.load(path, mmap=mmap)
+        if not os.path.exists(pkl_path) or forest.meta.get("source_mtime", 0) >= os.path.getmtime(pkl_path):
+            return forest
+
+    compiled, _ = compile_version(version)
+    return compiled
+
+
+def warm_load(versions=None):
+    """
+    Pre-start step for the Streamlit servers: open every exported forest and
+    fault its pages into the shared page cache before the first user request.
+    """
+    versions = versions or sorted(WIN_MODEL_VERSIONS)
+    warmed = {}
+    for version in versions:
+        if not has_arrays(forest_path(version)):
+            continue
+        forest = CompiledForest.load(forest_path(version)).warm()
+        warmed[version] = forest
+        print(f"🔥 Warmed {version.upper()} — {forest.nbytes / 1e6:.2f} MB mapped from {forest_path(version)}")
+    return warmed
+
+
+def _check_version(version, rows=2000, repeats=200):
+    model, feature_cols, _ = load_artifact(version)
+    compiled = compile_forest(model, feature_cols)
+
+    rng = np.random.default_rng(42)
+    data_path = WIN_MODEL_VERSIONS[version]["data_path"]
+    if os.path.exists(data_path):
+        base = pd.read_csv(data_path)[feature_cols]
+        X = base.sample(rows, replace=True, random_state=42).reset_index(drop=True)
+        X = X * rng.uniform(0.9, 1.1, size=X.shape)
+    else:
+        X = pd.DataFrame(rng.uniform(0, 120, size=(rows, len(feature_cols))), columns=feature_cols)
+
+    exact = np.array_equal(model.predict_proba(X), compiled._walk_proba(X))
+
+    one = X.iloc[[0]]
+    t0 = time.perf_counter()
+    for _ in range(repeats // 10):
+        model.predict_proba(one)
+    sk_single = (time.perf_counter() - t0) / (repeats // 10)
+
+    one_np = one.to_numpy()
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        compiled.predict_proba(one_np)
+    fast_single = (time.perf_counter() - t0) / repeats
+
+    t0 = time.perf_counter()
+    model.predict_proba(X)
+    sk_batch = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    compiled._walk_proba(X)
+    walk_batch = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    compiled.predict_proba(X)
+    fast_batch = time.perf_counter() - t0
+
+    print(f"\n🌲 {version.upper()} — {compiled.n_trees} trees, {compiled.n_nodes:,} nodes")
+    print(f"   • Matches sklearn exactly: {'✅' if exact else '❌'}")
+    print(f"   • Single row: sklearn {sk_single * 1e3:.2f} ms → compiled {fast_single * 1e6:.0f} µs")
+    print(f"   • {rows} rows:  sklearn {sk_batch * 1e3:.1f} ms, node walk {walk_batch * 1e3:.1f} ms "
+          f"→ compiled {fast_batch * 1e3:.1f} ms ({'sklearn' if rows >= SKLEARN_ROWS else 'node walk'} path)")
+    return exact
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Compile win predictor forests and check them against sklearn")
+    parser.add_argument("--version", default="all", choices=["all"] + sorted(WIN_MODEL_VERSIONS))
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--export", action="store_true", help="write models/*.forest memory-mapped artifacts")
+    parser.add_argument("--warm", action="store_true", help="warm-load exported forests (run before streamlit)")
+    args = parser.parse_args()
+
+    versions = sorted(WIN_MODEL_VERSIONS) if args.version == "all" else [args.version]
+    for v in versions:
+        if not os.path.exists(WIN_MODEL_VERSIONS[v]["model_path"]):
+            print(f"\n⚠️ {v.upper()} model not found — skipping.")
+            continue
+        if args.export:
+            path, compiled = export_version(v)
+            print(f"\n💾 {v.upper()} → {path} ({compiled.nbytes / 1e6:.2f} MB, {compiled.n_trees} trees)")
+        elif not args.warm:
+            _check_version(v, rows=args.rows)
+
+    if args.warm:
+        print()
+        warm_load(versions)
+    print()
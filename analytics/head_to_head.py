@@ -0,0 +1,228 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from etl_scripts.db_utils import create_table_if_missing
+from profiling import profile_from_env
+
+LAST_N = 10   # most recent results kept per pair
+
+H2H_DDL = """
+    CREATE TABLE NBA_HEAD_TO_HEAD (
+        TEAM_NAME       VARCHAR2(100) NOT NULL,
+        OPP_NAME        VARCHAR2(100) NOT NULL,
+        GAMES           NUMBER,
+        WINS            NUMBER,
+        HOME_GAMES      NUMBER,
+        HOME_WINS       NUMBER,
+        MARGIN_SUM      NUMBER,
+        LAST_RESULTS    VARCHAR2(20),
+        LAST_GAME_DATE  DATE,
+        LAST_GAME_ID    NUMBER,
+        UPDATED_AT      TIMESTAMP DEFAULT SYSTIMESTAMP,
+        CONSTRAINT NBA_HEAD_TO_HEAD_PK PRIMARY KEY (TEAM_NAME, OPP_NAME)
+    )
+"""
+
+
+def pair_results(games):
+    """Both perspectives of every game: TEAM_NAME vs OPP_NAME with WIN, HOME, MARGIN."""
+    margin = (games["HOME_POINTS"] - games["AWAY_POINTS"]).to_numpy()
+    home_won = (margin > 0).astype(int)
+    both = pd.DataFrame({
+        "TEAM_NAME": np.concatenate([games["HOME_TEAM"], games["AWAY_TEAM"]]),
+        "OPP_NAME": np.concatenate([games["AWAY_TEAM"], games["HOME_TEAM"]]),
+        "GAME_DATE": np.tile(games["GAME_DATE"].to_numpy(), 2),
+        "GAME_ID": np.tile(games["GAME_ID"].to_numpy(), 2),
+        "WIN": np.concatenate([home_won, 1 - home_won]),
+        "HOME": np.repeat([1, 0], len(games)),
+        "MARGIN": np.concatenate([margin, -margin]),
+    })
+    return both.sort_values(["TEAM_NAME", "OPP_NAME", "GAME_DATE", "GAME_ID"], kind="mergesort")
+
+
+def pregame_head_to_head(games):
+    """
+    For training builders: the home team's record against this opponent
+    from games BEFORE each row (no leakage). Returns H2H_GAMES, H2H_WINS
+    and H2H_MARGIN_SUM aligned with `games`.
+    """
+    if "GAME_ID" not in games:
+        games = games.assign(GAME_ID=np.arange(len(games)))
+    results = pair_results(games)
+    home_rows = results[results["HOME"] == 1]
+
+    grouped = results.groupby(["TEAM_NAME", "OPP_NAME"], sort=False)
+    before = pd.DataFrame({
+        "H2H_GAMES": grouped.cumcount(),
+        "H2H_WINS": grouped["WIN"].cumsum() - results["WIN"],
+        "H2H_MARGIN_SUM": grouped["MARGIN"].cumsum() - results["MARGIN"],
+    })
+
+    # pair_results stacks home rows first, so their index is the game's position
+    out = before.loc[home_rows.index].sort_index()
+    out.index = games.index
+    return out
+
+
+def aggregate_pairs(results):
+    """Per ordered pair: counts, margin sum and the last results (newest first)."""
+    results = results.assign(
+        HOME_WIN=results["WIN"] * results["HOME"],
+        RESULT=np.where(results["WIN"] == 1, "W", "L"),
+    )
+    grouped = results.groupby(["TEAM_NAME", "OPP_NAME"], sort=False)
+    agg = grouped.agg(
+        GAMES=("WIN", "size"),
+        WINS=("WIN", "sum"),
+        HOME_GAMES=("HOME", "sum"),
+        HOME_WINS=("HOME_WIN", "sum"),
+        MARGIN_SUM=("MARGIN", "sum"),
+        LAST_GAME_DATE=("GAME_DATE", "last"),
+        LAST_GAME_ID=("GAME_ID", "last"),
+    )
+    agg["LAST_RESULTS"] = grouped["RESULT"].agg(lambda r: "".join(r.iloc[-LAST_N:][::-1]))
+    return agg
+
+
+def combine(existing, new):
+    """Add new-game aggregates onto stored rows for the same pairs."""
+    if existing.empty:
+        return new
+    old = existing.reindex(new.index)
+    combined = new.copy()
+    for col in ["GAMES", "WINS", "HOME_GAMES", "HOME_WINS", "MARGIN_SUM"]:
+        combined[col] = new[col] + old[col].fillna(0)
+    combined["LAST_RESULTS"] = (new["LAST_RESULTS"] + old["LAST_RESULTS"].fillna("")).str[:LAST_N]
+    return combined
+
+
+def ensure_table(cursor):
+    create_table_if_missing(cursor, H2H_DDL)
+
+
+def fetch_new_games(conn):
+    """Games after the table's (LAST_GAME_DATE, LAST_GAME_ID) watermark."""
+    watermark = pd.read_sql("""
+        SELECT LAST_GAME_DATE, LAST_GAME_ID
+        FROM (
+            SELECT LAST_GAME_DATE, LAST_GAME_ID
+            FROM NBA_HEAD_TO_HEAD
+            ORDER BY LAST_GAME_DATE DESC, LAST_GAME_ID DESC
+        )
+        WHERE ROWNUM = 1
+    """, conn)
+    wm_date, wm_id = (watermark.iloc[0].tolist() if not watermark.empty else (None, None))
+
+    return pd.read_sql("""
+        SELECT GAME_ID, GAME_DATE, HOME_TEAM, AWAY_TEAM, HOME_POINTS, AWAY_POINTS
+        FROM NBA_GAME_LOGS
+        WHERE HOME_POINTS IS NOT NULL AND AWAY_POINTS IS NOT NULL
+          AND (:wm_date IS NULL
+               OR GAME_DATE > :wm_date
+               OR (GAME_DATE = :wm_date AND GAME_ID > :wm_id))
+    """, conn, params={"wm_date": wm_date, "wm_id": wm_id})
+
+
+def load_pairs(conn, teams):
+    """Stored rows for every pair involving `teams` (keyed by TEAM_NAME)."""
+    teams = sorted(teams)
+    binds = ", ".join(f":t{i}" for i in range(len(teams)))
+    df = pd.read_sql(f"""
+        SELECT TEAM_NAME, OPP_NAME, GAMES, WINS, HOME_GAMES, HOME_WINS, MARGIN_SUM, LAST_RESULTS
+        FROM NBA_HEAD_TO_HEAD
+        WHERE TEAM_NAME IN ({binds})
+    """, conn, params={f"t{i}": t for i, t in enumerate(teams)})
+    return df.set_index(["TEAM_NAME", "OPP_NAME"])
+
+
+def save_pairs(cursor, pairs):
+    cursor.executemany("""
+        MERGE INTO NBA_HEAD_TO_HEAD t
+        USING (
+            SELECT :1 AS TEAM_NAME, :2 AS OPP_NAME, :3 AS GAMES, :4 AS WINS,
+                   :5 AS HOME_GAMES, :6 AS HOME_WINS, :7 AS MARGIN_SUM,
+                   :8 AS LAST_RESULTS, :9 AS LAST_GAME_DATE, :10 AS LAST_GAME_ID
+            FROM dual
+        ) s
+        ON (t.TEAM_NAME = s.TEAM_NAME AND t.OPP_NAME = s.OPP_NAME)
+        WHEN MATCHED THEN
+            UPDATE SET
+                t.GAMES          = s.GAMES,
+                t.WINS           = s.WINS,
+                t.HOME_GAMES     = s.HOME_GAMES,
+                t.HOME_WINS      = s.HOME_WINS,
+                t.MARGIN_SUM     = s.MARGIN_SUM,
+                t.LAST_RESULTS   = s.LAST_RESULTS,
+                t.LAST_GAME_DATE = s.LAST_GAME_DATE,
+                t.LAST_GAME_ID   = s.LAST_GAME_ID,
+                t.UPDATED_AT     = SYSTIMESTAMP
+        WHEN NOT MATCHED THEN
+            INSERT (TEAM_NAME, OPP_NAME, GAMES, WINS, HOME_GAMES, HOME_WINS,
+                    MARGIN_SUM, LAST_RESULTS, LAST_GAME_DATE, LAST_GAME_ID)
+            VALUES (s.TEAM_NAME, s.OPP_NAME, s.GAMES, s.WINS, s.HOME_GAMES, s.HOME_WINS,
+                    s.MARGIN_SUM, s.LAST_RESULTS, s.LAST_GAME_DATE, s.LAST_GAME_ID)
+    """, [
+        [team, opp, int(r.GAMES), int(r.WINS), int(r.HOME_GAMES), int(r.HOME_WINS),
+         float(r.MARGIN_SUM), r.LAST_RESULTS, pd.Timestamp(r.LAST_GAME_DATE).to_pydatetime(),
+         int(r.LAST_GAME_ID)]
+        for (team, opp), r in pairs.iterrows()
+    ])
+    return len(pairs)
+
+
+def update_head_to_head(rebuild=False):
+    print("\n🆚 Updating head-to-head history\n")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    ensure_table(cursor)
+
+    if rebuild:
+        print("🧹 Rebuild requested — clearing NBA_HEAD_TO_HEAD")
+        cursor.execute("DELETE FROM NBA_HEAD_TO_HEAD")
+
+    games = fetch_new_games(conn)
+    print(f"🏀 New games: {len(games)}")
+
+    if not games.empty:
+        new = aggregate_pairs(pair_results(games))
+        existing = load_pairs(conn, new.index.get_level_values("TEAM_NAME").unique())
+        saved = save_pairs(cursor, combine(existing, new))
+        print(f"💾 {saved} team pairs updated")
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+    print("\n🎉 Head-to-head table up to date!\n")
+
+
+def fetch_head_to_head(conn, team, opp):
+    """
+    One keyed read: `team`'s record against `opp` as a dict, or None.
+    AVG_MARGIN is from `team`'s side; LAST_RESULTS is newest first.
+    """
+    df = pd.read_sql("""
+        SELECT GAMES, WINS, HOME_GAMES, HOME_WINS, MARGIN_SUM, LAST_RESULTS, LAST_GAME_DATE
+        FROM NBA_HEAD_TO_HEAD
+        WHERE TEAM_NAME = :team AND OPP_NAME = :opp
+    """, conn, params={"team": team, "opp": opp})
+    if df.empty:
+        return None
+    row = df.iloc[0].to_dict()
+    row["LOSSES"] = row["GAMES"] - row["WINS"]
+    row["AVG_MARGIN"] = row["MARGIN_SUM"] / row["GAMES"]
+    return row
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Incremental head-to-head aggregates from NBA_GAME_LOGS")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every pair from all games")
+    args = parser.parse_args()
+
+    update_head_to_head(rebuild=args.rebuild)
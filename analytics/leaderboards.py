@@ -0,0 +1,365 @@
+import os
+import sys
+import math
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from etl_scripts.db_utils import create_table_if_missing
+from profiling import profile_from_env
+
+CATEGORIES = ["POINTS", "REBOUNDS", "ASSISTS", "STEALS", "BLOCKS"]
+STAT_COLUMNS = ["MINUTES", "POINTS", "REBOUNDS", "ASSISTS", "STEALS", "BLOCKS", "TURNOVERS"]
+TOP_K = 25               # leaders kept per season and category
+LEADERS_SHOWN = 10       # re-rank from totals when fewer than this many stay provably exact
+MIN_GAMES_SHARE = 0.7    # qualify with 70% of the games of the season's most-used player
+IN_CHUNK = 500           # Oracle caps IN lists at 1000 binds
+
+TOTALS_DDL = """
+    CREATE TABLE NBA_PLAYER_SEASON_TOTALS (
+        SEASON          NUMBER        NOT NULL,
+        PLAYER_ID       NUMBER        NOT NULL,
+        PLAYER_NAME     VARCHAR2(100),
+        TEAM_NAME       VARCHAR2(100),
+        GAMES           NUMBER,
+        MINUTES         NUMBER,
+        POINTS          NUMBER,
+        REBOUNDS        NUMBER,
+        ASSISTS         NUMBER,
+        STEALS          NUMBER,
+        BLOCKS          NUMBER,
+        TURNOVERS       NUMBER,
+        LAST_GAME_DATE  DATE,
+        UPDATED_AT      TIMESTAMP DEFAULT SYSTIMESTAMP,
+        CONSTRAINT NBA_PLAYER_SEASON_TOTALS_PK PRIMARY KEY (SEASON, PLAYER_ID)
+    )
+"""
+
+LEADERS_DDL = """
+    CREATE TABLE NBA_LEAGUE_LEADERS (
+        SEASON       NUMBER        NOT NULL,
+        CATEGORY     VARCHAR2(20)  NOT NULL,
+        LEADER_RANK  NUMBER        NOT NULL,
+        PLAYER_ID    NUMBER,
+        PLAYER_NAME  VARCHAR2(100),
+        TEAM_NAME    VARCHAR2(100),
+        GAMES        NUMBER,
+        TOTAL        NUMBER,
+        PER_GAME     NUMBER,
+        MIN_GAMES    NUMBER,
+        CUTOFF       NUMBER,
+        UPDATED_AT   TIMESTAMP DEFAULT SYSTIMESTAMP,
+        CONSTRAINT NBA_LEAGUE_LEADERS_PK PRIMARY KEY (SEASON, CATEGORY, LEADER_RANK)
+    )
+"""
+
+
+# =====================================
+# Aggregation
+# =====================================
+def aggregate_rows(rows):
+    """Per (SEASON, PLAYER_ID): games, stat sums, latest name / team and last game date."""
+    rows = rows.sort_values("GAME_DATE", kind="mergesort")
+    grouped = rows.groupby(["SEASON", "PLAYER_ID"], sort=False)
+    agg = grouped[STAT_COLUMNS].sum()
+    agg.insert(0, "GAMES", grouped.size())
+    agg.insert(0, "TEAM_NAME", grouped["TEAM_NAME"].last())      # .last() skips NULLs
+    agg.insert(0, "PLAYER_NAME", grouped["PLAYER_NAME"].last())
+    agg["LAST_GAME_DATE"] = grouped["GAME_DATE"].max()
+    return agg
+
+
+def combine(existing, new):
+    """Add new-row aggregates onto the stored totals of the same players."""
+    if existing.empty:
+        return new
+    old = existing.reindex(new.index)
+    combined = new.copy()
+    for col in ["GAMES"] + STAT_COLUMNS:
+        combined[col] = new[col] + old[col].fillna(0)
+    for col in ["PLAYER_NAME", "TEAM_NAME"]:
+        combined[col] = new[col].fillna(old[col])
+    combined["LAST_GAME_DATE"] = pd.concat([new["LAST_GAME_DATE"], old["LAST_GAME_DATE"]], axis=1).max(axis=1)
+    return combined
+
+
+def qualifying_games(max_games):
+    return max(1, math.ceil(MIN_GAMES_SHARE * max_games))
+
+
+def order_board(pool, k):
+    board = pool.sort_values(["PER_GAME", "GAMES", "PLAYER_ID"], ascending=[False, False, True],
+                             kind="mergesort")
+    # Every player left out is at or below the k-th value; NaN = nobody was left out
+    cutoff = board["PER_GAME"].iloc[k - 1] if len(board) > k else np.nan
+    board = board.head(k).reset_index(drop=True)
+    board["LEADER_RANK"] = np.arange(1, len(board) + 1)
+    return board, cutoff
+
+
+def per_game_pool(totals, category):
+    return pd.DataFrame({
+        "PLAYER_ID": totals.index.get_level_values("PLAYER_ID"),
+        "PLAYER_NAME": totals["PLAYER_NAME"].to_numpy(),
+        "TEAM_NAME": totals["TEAM_NAME"].to_numpy(),
+        "GAMES": totals["GAMES"].to_numpy(),
+        "TOTAL": totals[category].to_numpy(),
+        "PER_GAME": (totals[category] / totals["GAMES"]).to_numpy(),
+    })
+
+
+def rank_leaders(totals, category, min_games, k=TOP_K):
+    """Top `k` qualified players by per-game `category` (ties: more games, then lower id)."""
+    pool = per_game_pool(totals, category)
+    return order_board(pool[pool["GAMES"] >= min_games], k)
+
+
+def merge_top_k(stored, touched, category, min_games, k=TOP_K):
+    """
+    New top-k from the stored list plus the players whose totals just changed.
+
+    Every player missing from the stored list was at or below its CUTOFF
+    (or unqualified) and, if untouched, still is — so any stored or touched
+    player above the cutoff is ranked exactly. A leader who slips under it
+    simply leaves the list, which can shrink; once fewer than LEADERS_SHOWN
+    are left, None is returned and the caller re-ranks the season.
+    """
+    cutoff = stored["CUTOFF"].iloc[0] if not stored.empty else np.nan
+    moved = per_game_pool(touched, category)
+    pool = pd.concat([stored[~stored["PLAYER_ID"].isin(moved["PLAYER_ID"])][moved.columns], moved],
+                     ignore_index=True)
+    pool = pool[pool["GAMES"] >= min_games]
+    if not pd.isna(cutoff):
+        pool = pool[pool["PER_GAME"] >= cutoff]
+
+    board, new_cutoff = order_board(pool, k)
+    if pd.isna(new_cutoff):
+        new_cutoff = cutoff
+    if not pd.isna(new_cutoff) and len(board) < min(k, LEADERS_SHOWN):
+        return None
+    return board, new_cutoff
+
+
+# =====================================
+# Storage
+# =====================================
+def ensure_tables(cursor):
+    create_table_if_missing(cursor, TOTALS_DDL)
+    create_table_if_missing(cursor, LEADERS_DDL)
+
+
+def load_watermark(conn):
+    """(last game date folded in, games folded in) — (None, 0) for an empty table."""
+    df = pd.read_sql("""
+        SELECT MAX(LAST_GAME_DATE) AS WM, SUM(GAMES) AS GAMES
+        FROM NBA_PLAYER_SEASON_TOTALS
+    """, conn)
+    wm, games = df.iloc[0]["WM"], df.iloc[0]["GAMES"]
+    if wm is None or pd.isna(wm):
+        return None, 0
+    return pd.Timestamp(wm).to_pydatetime(), int(games)
+
+
+def count_rows_through(conn, wm):
+    return int(pd.read_sql("""
+        SELECT COUNT(*) AS N
+        FROM NBA_PLAYER_LIVE_STATS
+        WHERE SEASON IS NOT NULL AND GAME_DATE <= :wm
+    """, conn, params={"wm": wm})["N"].iloc[0])
+
+
+def fetch_new_rows(conn, wm):
+    """Stat rows after the watermark (every row when `wm` is None)."""
+    return pd.read_sql(f"""
+        SELECT PLAYER_ID, PLAYER_NAME, TEAM_NAME, SEASON, GAME_DATE, {', '.join(STAT_COLUMNS)}
+        FROM NBA_PLAYER_LIVE_STATS
+        WHERE SEASON IS NOT NULL
+          AND (:wm IS NULL OR GAME_DATE > :wm)
+    """, conn, params={"wm": wm})
+
+
+def load_totals(conn, season, player_ids=None):
+    """Stored totals for `season` (only `player_ids` if given), indexed by (SEASON, PLAYER_ID)."""
+    columns = f"SEASON, PLAYER_ID, PLAYER_NAME, TEAM_NAME, GAMES, {', '.join(STAT_COLUMNS)}, LAST_GAME_DATE"
+    if player_ids is None:
+        df = pd.read_sql(f"SELECT {columns} FROM NBA_PLAYER_SEASON_TOTALS WHERE SEASON = :season",
+                         conn, params={"season": season})
+    else:
+        ids = [int(p) for p in player_ids]
+        parts = []
+        for start in range(0, len(ids), IN_CHUNK):
+            chunk = ids[start:start + IN_CHUNK]
+            binds = ", ".join(f":p{i}" for i in range(len(chunk)))
+            params = {f"p{i}": p for i, p in enumerate(chunk)}
+            params["season"] = season
+            parts.append(pd.read_sql(f"""
+                SELECT {columns} FROM NBA_PLAYER_SEASON_TOTALS
+                WHERE SEASON = :season AND PLAYER_ID IN ({binds})
+            """, conn, params=params))
+        df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns.split(", "))
+    return df.set_index(["SEASON", "PLAYER_ID"])
+
+
+def save_totals(cursor, totals):
+    cursor.executemany(f"""
+        MERGE INTO NBA_PLAYER_SEASON_TOTALS t
+        USING (
+            SELECT :1 AS SEASON, :2 AS PLAYER_ID, :3 AS PLAYER_NAME, :4 AS TEAM_NAME, :5 AS GAMES,
+                   :6 AS MINUTES, :7 AS POINTS, :8 AS REBOUNDS, :9 AS ASSISTS, :10 AS STEALS,
+                   :11 AS BLOCKS, :12 AS TURNOVERS, :13 AS LAST_GAME_DATE
+            FROM dual
+        ) s
+        ON (t.SEASON = s.SEASON AND t.PLAYER_ID = s.PLAYER_ID)
+        WHEN MATCHED THEN
+            UPDATE SET
+                t.PLAYER_NAME    = s.PLAYER_NAME,
+                t.TEAM_NAME      = s.TEAM_NAME,
+                t.GAMES          = s.GAMES,
+                t.MINUTES        = s.MINUTES,
+                t.POINTS         = s.POINTS,
+                t.REBOUNDS       = s.REBOUNDS,
+                t.ASSISTS        = s.ASSISTS,
+                t.STEALS         = s.STEALS,
+                t.BLOCKS         = s.BLOCKS,
+                t.TURNOVERS      = s.TURNOVERS,
+                t.LAST_GAME_DATE = s.LAST_GAME_DATE,
+                t.UPDATED_AT     = SYSTIMESTAMP
+        WHEN NOT MATCHED THEN
+            INSERT (SEASON, PLAYER_ID, PLAYER_NAME, TEAM_NAME, GAMES, {', '.join(STAT_COLUMNS)}, LAST_GAME_DATE)
+            VALUES (s.SEASON, s.PLAYER_ID, s.PLAYER_NAME, s.TEAM_NAME, s.GAMES, s.MINUTES, s.POINTS,
+                    s.REBOUNDS, s.ASSISTS, s.STEALS, s.BLOCKS, s.TURNOVERS, s.LAST_GAME_DATE)
+    """, [
+        [int(season), int(player_id),
+         None if pd.isna(r.PLAYER_NAME) else r.PLAYER_NAME,
+         None if pd.isna(r.TEAM_NAME) else r.TEAM_NAME,
+         int(r.GAMES)] + [float(getattr(r, c) or 0) for c in STAT_COLUMNS]
+        + [pd.Timestamp(r.LAST_GAME_DATE).to_pydatetime()]
+        for (season, player_id), r in totals.iterrows()
+    ])
+    return len(totals)
+
+
+def load_stored_leaders(conn, season):
+    return pd.read_sql("""
+        SELECT CATEGORY, LEADER_RANK, PLAYER_ID, PLAYER_NAME, TEAM_NAME, GAMES, TOTAL, PER_GAME, CUTOFF
+        FROM NBA_LEAGUE_LEADERS
+        WHERE SEASON = :season
+    """, conn, params={"season": season})
+
+
+def save_leaders(cursor, season, category, board, cutoff, min_games):
+    cursor.execute("DELETE FROM NBA_LEAGUE_LEADERS WHERE SEASON = :1 AND CATEGORY = :2", [season, category])
+    cursor.executemany("""
+        INSERT INTO NBA_LEAGUE_LEADERS
+        (SEASON, CATEGORY, LEADER_RANK, PLAYER_ID, PLAYER_NAME, TEAM_NAME,
+         GAMES, TOTAL, PER_GAME, MIN_GAMES, CUTOFF)
+        VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9, :10, :11)
+    """, [
+        [season, category, int(r.LEADER_RANK), int(r.PLAYER_ID),
+         None if pd.isna(r.PLAYER_NAME) else r.PLAYER_NAME,
+         None if pd.isna(r.TEAM_NAME) else r.TEAM_NAME,
+         int(r.GAMES), float(r.TOTAL), float(r.PER_GAME), int(min_games),
+         None if pd.isna(cutoff) else float(cutoff)]
+        for r in board.itertuples(index=False)
+    ])
+    return len(board)
+
+
+# =====================================
+# Incremental refresh
+# =====================================
+def refresh_season(conn, cursor, season, new):
+    """Fold one season's new aggregates into the totals, then maintain each top-k list."""
+    ids = new.index.get_level_values("PLAYER_ID")
+    touched = combine(load_totals(conn, season, ids), new)
+    save_totals(cursor, touched)
+
+    max_games = pd.read_sql("SELECT MAX(GAMES) AS G FROM NBA_PLAYER_SEASON_TOTALS WHERE SEASON = :season",
+                            conn, params={"season": season})["G"].iloc[0]
+    min_games = qualifying_games(int(max_games))
+
+    stored = load_stored_leaders(conn, season)
+    season_totals = None
+    reranked = 0
+    for category in CATEGORIES:
+        merged = merge_top_k(stored[stored["CATEGORY"] == category], touched, category, min_games)
+        if merged is None:
+            if season_totals is None:
+                season_totals = load_totals(conn, season)
+            merged = rank_leaders(season_totals, category, min_games)
+            reranked += 1
+        board, cutoff = merged
+        save_leaders(cursor, season, category, board, cutoff, min_games)
+    return len(touched), reranked
+
+
+def refresh_leaderboards(conn, rebuild=False):
+    """
+    Fold NBA_PLAYER_LIVE_STATS rows newer than the totals' watermark into
+    NBA_PLAYER_SEASON_TOTALS and update NBA_LEAGUE_LEADERS for the touched
+    seasons. If rows were loaded on or before the watermark since the last
+    run (the stored game count no longer matches), everything is rebuilt.
+    Returns the number of stat rows folded in.
+    """
+    cursor = conn.cursor()
+    ensure_tables(cursor)
+
+    wm, stored_games = (None, 0) if rebuild else load_watermark(conn)
+    if wm is not None and count_rows_through(conn, wm) != stored_games:
+        print("   ⚠️ Stat rows were backfilled behind the watermark — rebuilding leaderboards")
+        wm = None
+    if wm is None:
+        cursor.execute("DELETE FROM NBA_LEAGUE_LEADERS")
+        cursor.execute("DELETE FROM NBA_PLAYER_SEASON_TOTALS")
+
+    rows = fetch_new_rows(conn, wm)
+    if not rows.empty:
+        new = aggregate_rows(rows)
+        for season, season_new in new.groupby(level="SEASON"):
+            players, reranked = refresh_season(conn, cursor, int(season), season_new)
+            note = f" ({reranked} categories re-ranked from totals)" if reranked else ""
+            print(f"   • {int(season)}: {players} player totals updated{note}")
+
+    conn.commit()
+    cursor.close()
+    return len(rows)
+
+
+def update_leaderboards(rebuild=False):
+    print("\n🏆 Updating season totals and league leaders\n")
+
+    conn = get_connection()
+    folded = refresh_leaderboards(conn, rebuild=rebuild)
+    conn.close()
+
+    print(f"🏀 New stat rows: {folded}")
+    print("\n🎉 NBA_LEAGUE_LEADERS up to date!\n")
+
+
+# =====================================
+# Readers
+# =====================================
+def fetch_leaders(conn, season, category, limit=10):
+    """Top `limit` of a stored leaderboard — a keyed read of at most TOP_K rows."""
+    return pd.read_sql("""
+        SELECT LEADER_RANK, PLAYER_ID, PLAYER_NAME, TEAM_NAME, GAMES, TOTAL, PER_GAME, MIN_GAMES
+        FROM NBA_LEAGUE_LEADERS
+        WHERE SEASON = :season AND CATEGORY = :category AND LEADER_RANK <= :lim
+        ORDER BY LEADER_RANK
+    """, conn, params={"season": season, "category": category, "lim": limit})
+
+
+def leader_seasons(conn):
+    return pd.read_sql("SELECT DISTINCT SEASON FROM NBA_LEAGUE_LEADERS ORDER BY SEASON DESC",
+                       conn)["SEASON"].astype(int).tolist()
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Incremental season totals and top-k leaders from NBA_PLAYER_LIVE_STATS")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every season from all stat rows")
+    args = parser.parse_args()
+
+    update_leaderboards(rebuild=args.rebuild)
@@ -0,0 +1,207 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from etl_scripts.db_utils import create_table_if_missing
+from profiling import profile_from_env
+
+PER_36_STATS = ["POINTS", "REBOUNDS", "ASSISTS", "STEALS", "BLOCKS", "TURNOVERS"]
+LEAGUE_PER = 15.0        # PER is scaled so the minute-weighted league average is 15, as in Hollinger's
+TEAM_MINUTES = 48.0      # team minutes per game / 5 on the floor
+MIN_MINUTES_COVERAGE = 0.8   # win shares only where the listed players cover this much of the team's minutes
+
+ADVANCED_COLUMNS = (
+    [f"{s}_36" for s in PER_36_STATS]
+    + ["TEAM_POINTS", "POINTS_SHARE", "SCORING_USAGE", "EFFICIENCY", "PER", "WIN_SHARES"]
+)
+
+ADVANCED_DDL = f"""
+    CREATE TABLE NBA_PLAYER_ADVANCED (
+        SEASON        NUMBER         NOT NULL,
+        PLAYER_NAME   VARCHAR2(100)  NOT NULL,
+        TEAM_NAME     VARCHAR2(100)  NOT NULL,
+        GAMES_PLAYED  NUMBER,
+        MINUTES       NUMBER,
+        {', '.join(f'{c} NUMBER' for c in ADVANCED_COLUMNS)},
+        UPDATED_AT    TIMESTAMP DEFAULT SYSTIMESTAMP,
+        CONSTRAINT NBA_PLAYER_ADVANCED_PK PRIMARY KEY (SEASON, PLAYER_NAME, TEAM_NAME)
+    )
+"""
+
+
+# =====================================
+# Vectorized metric computation
+# =====================================
+def compute_advanced(stats):
+    """
+    Advanced metrics for every (SEASON, PLAYER_NAME, TEAM_NAME) row of
+    per-game averages, as whole-column numpy operations:
+
+        <STAT>_36      per-36-minute rates
+        POINTS_SHARE   player PPG / team PPG (NBA_TEAM_STATS.POINTS)
+        SCORING_USAGE  % of team scoring taken while on the floor
+        EFFICIENCY     NBA efficiency: PTS + REB + AST + STL + BLK - TOV
+        PER            efficiency per minute, pace-adjusted by team scoring and
+                       scaled so the season's minute-weighted average is 15
+        WIN_SHARES     team wins split by each player's share of team efficiency
+
+    A team-season missing from NBA_TEAM_STATS uses that season's average
+    team scoring; a season with no team rows gets NULL team metrics.
+    WIN_SHARES is NULL unless the team's rows in NBA_PLAYER_STATS cover at
+    least MIN_MINUTES_COVERAGE of its player minutes (5 x 48 per game) —
+    otherwise the few listed players would split all of the team's wins.
+    """
+    df = stats.drop_duplicates(["SEASON", "PLAYER_NAME", "TEAM_NAME"], keep="last").reset_index(drop=True)
+    num = df[["GAMES_PLAYED", "MINUTES"] + PER_36_STATS].astype(float).fillna(0.0)
+    minutes = num["MINUTES"].to_numpy()
+    on_floor = minutes > 0
+    safe_minutes = np.where(on_floor, minutes, 1.0)
+
+    out = df[["SEASON", "PLAYER_NAME", "TEAM_NAME"]].copy()
+    out["GAMES_PLAYED"] = num["GAMES_PLAYED"].to_numpy()
+    out["MINUTES"] = minutes
+    for s in PER_36_STATS:
+        out[f"{s}_36"] = np.where(on_floor, num[s].to_numpy() * 36.0 / safe_minutes, np.nan)
+
+    team_points = df["TEAM_POINTS"].astype(float)
+    team_points = team_points.fillna(team_points.groupby(df["SEASON"]).transform("mean")).to_numpy()
+    points = num["POINTS"].to_numpy()
+    out["TEAM_POINTS"] = team_points
+    out["POINTS_SHARE"] = points / team_points
+    out["SCORING_USAGE"] = np.where(on_floor, 100.0 * points * TEAM_MINUTES / (safe_minutes * team_points), np.nan)
+
+    eff = (num["POINTS"] + num["REBOUNDS"] + num["ASSISTS"] + num["STEALS"]
+           + num["BLOCKS"] - num["TURNOVERS"]).to_numpy()
+    out["EFFICIENCY"] = eff
+
+    # Pace proxy: teams that score more play faster, so their per-minute lines are deflated
+    league_points = pd.Series(team_points).groupby(df["SEASON"]).transform("mean").to_numpy()
+    pace = np.where(np.isnan(team_points), 1.0, league_points / team_points)
+    per_minute = np.where(on_floor, eff / safe_minutes * pace, np.nan)
+    total_minutes = minutes * out["GAMES_PLAYED"].to_numpy()
+    weighted = pd.DataFrame({"w": np.nan_to_num(per_minute) * total_minutes, "m": total_minutes})
+    season_sums = weighted.groupby(df["SEASON"]).transform("sum")
+    league_rate = (season_sums["w"] / season_sums["m"].replace(0, np.nan)).to_numpy()
+    out["PER"] = per_minute * LEAGUE_PER / league_rate
+
+    team_keys = [df["SEASON"], df["TEAM_NAME"]]
+    team_minutes = pd.Series(total_minutes).groupby(team_keys).transform("sum").to_numpy()
+    coverage = team_minutes / (df["TEAM_GAMES"].astype(float).to_numpy() * 5 * TEAM_MINUTES)
+
+    contribution = np.clip(eff, 0, None) * out["GAMES_PLAYED"].to_numpy()
+    team_total = pd.Series(contribution).groupby(team_keys).transform("sum").to_numpy()
+    covered = (team_total > 0) & (coverage >= MIN_MINUTES_COVERAGE)
+    out["WIN_SHARES"] = np.where(covered, df["TEAM_WINS"].astype(float).to_numpy() * contribution
+                                 / np.where(team_total > 0, team_total, 1.0), np.nan)
+    return out
+
+
+# =====================================
+# Storage
+# =====================================
+def ensure_table(cursor):
+    create_table_if_missing(cursor, ADVANCED_DDL)
+
+
+def season_filter(column, seasons):
+    """(" AND column IN (...)", binds) for a non-empty list of seasons, ("", {}) for all of them."""
+    if seasons is None:
+        return "", {}
+    binds = {f"s{i}": int(s) for i, s in enumerate(seasons)}
+    return f" AND {column} IN ({', '.join(':' + b for b in binds)})", binds
+
+
+def fetch_stats(conn, seasons=None):
+    """NBA_PLAYER_STATS rows with their team's season scoring, wins and games from NBA_TEAM_STATS."""
+    where, binds = season_filter("p.SEASON", seasons)
+    # AVG over team rows: load_csv_to_oracle.py appends, so a team-season can appear more than once
+    return pd.read_sql(f"""
+        SELECT p.SEASON, p.PLAYER_NAME, p.TEAM_NAME, p.GAMES_PLAYED, p.MINUTES,
+               {', '.join('p.' + s for s in PER_36_STATS)},
+               t.TEAM_POINTS, t.TEAM_WINS, t.TEAM_GAMES
+        FROM NBA_PLAYER_STATS p
+        LEFT JOIN (
+            SELECT SEASON, TEAM_NAME, AVG(POINTS) AS TEAM_POINTS, AVG(WINS) AS TEAM_WINS,
+                   AVG(WINS + LOSSES) AS TEAM_GAMES
+            FROM NBA_TEAM_STATS
+            GROUP BY SEASON, TEAM_NAME
+        ) t ON t.SEASON = p.SEASON AND t.TEAM_NAME = p.TEAM_NAME
+        WHERE p.SEASON IS NOT NULL AND p.PLAYER_NAME IS NOT NULL AND p.TEAM_NAME IS NOT NULL{where}
+    """, conn, params=binds)
+
+
+def save_advanced(cursor, advanced):
+    cols = ["SEASON", "PLAYER_NAME", "TEAM_NAME", "GAMES_PLAYED", "MINUTES"] + ADVANCED_COLUMNS
+    cursor.executemany(f"""
+        INSERT INTO NBA_PLAYER_ADVANCED ({', '.join(cols)})
+        VALUES ({', '.join(f':{i + 1}' for i in range(len(cols)))})
+    """, [
+        [int(r.SEASON), r.PLAYER_NAME, r.TEAM_NAME]
+        + [None if pd.isna(getattr(r, c)) else round(float(getattr(r, c)), 4) for c in cols[3:]]
+        for r in advanced.itertuples(index=False)
+    ])
+    return len(advanced)
+
+
+# =====================================
+# Refresh
+# =====================================
+def refresh_player_advanced(conn, seasons=None):
+    """
+    Recompute NBA_PLAYER_ADVANCED for `seasons` (every season when None).
+    PER and win shares are relative to the whole season, so a season is
+    always rebuilt as a unit: its rows are replaced in one transaction.
+    Returns the number of rows written.
+    """
+    if seasons is not None and len(seasons) == 0:
+        # e.g. a loader whose CSV had no rows — nothing to recompute (and "IN ()" is invalid SQL)
+        return 0
+
+    cursor = conn.cursor()
+    ensure_table(cursor)
+
+    stats = fetch_stats(conn, seasons)
+    where, binds = season_filter("SEASON", seasons)
+    cursor.execute(f"DELETE FROM NBA_PLAYER_ADVANCED WHERE 1 = 1{where}", binds)
+    written = save_advanced(cursor, compute_advanced(stats)) if not stats.empty else 0
+
+    conn.commit()
+    cursor.close()
+    return written
+
+
+def update_player_advanced(seasons=None):
+    print("\n🧮 Updating advanced player metrics (per-36, usage, PER, win shares)\n")
+
+    conn = get_connection()
+    written = refresh_player_advanced(conn, seasons=seasons)
+    conn.close()
+
+    print(f"💾 {written} player seasons written")
+    print("\n🎉 NBA_PLAYER_ADVANCED up to date!\n")
+
+
+# =====================================
+# Readers
+# =====================================
+def fetch_player_advanced(conn, season, player_names):
+    """Stored metrics for a few players in one season — one keyed read."""
+    names = {f"n{i}": n for i, n in enumerate(player_names)}
+    return pd.read_sql(f"""
+        SELECT PLAYER_NAME, TEAM_NAME, GAMES_PLAYED, MINUTES, {', '.join(ADVANCED_COLUMNS)}
+        FROM NBA_PLAYER_ADVANCED
+        WHERE SEASON = :season AND PLAYER_NAME IN ({', '.join(':' + n for n in names)})
+    """, conn, params={"season": int(season), **names})
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Advanced player metrics from NBA_PLAYER_STATS + NBA_TEAM_STATS")
+    parser.add_argument("--season", type=int, action="append", help="season to recompute (repeatable; default: all)")
+    args = parser.parse_args()
+
+    update_player_advanced(seasons=args.season)
@@ -0,0 +1,256 @@
+import os
+import sys
+import argparse
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from etl_scripts.db_utils import create_table_if_missing
+from profiling import profile_from_env
+
+FORM_STATS = ["POINTS", "REBOUNDS", "ASSISTS", "STEALS", "BLOCKS", "MINUTES"]
+WINDOWS = [5, 10]              # L5_* / L10_* = plain mean of the last N games
+EWMA_SPAN = 10                 # EWMA_* weight: alpha = 2 / (span + 1), like pandas ewm(span=...)
+EWMA_ALPHA = 2.0 / (EWMA_SPAN + 1)
+CONTEXT_GAMES = max(WINDOWS) - 1
+IN_CHUNK = 500                 # Oracle caps IN lists at 1000 binds
+
+FORM_COLUMNS = [f"{prefix}_{stat}" for prefix in [f"L{w}" for w in WINDOWS] + ["EWMA"] for stat in FORM_STATS]
+
+FORM_DDL = f"""
+    CREATE TABLE NBA_PLAYER_FORM (
+        PLAYER_ID       NUMBER        NOT NULL,
+        PLAYER_NAME     VARCHAR2(100),
+        TEAM_NAME       VARCHAR2(100),
+        GAMES           NUMBER,
+        LAST_GAME_DATE  DATE,
+        {', '.join(f'{c} NUMBER' for c in FORM_COLUMNS)},
+        UPDATED_AT      TIMESTAMP DEFAULT SYSTIMESTAMP,
+        CONSTRAINT NBA_PLAYER_FORM_PK PRIMARY KEY (PLAYER_ID)
+    )
+"""
+
+
+# =====================================
+# Vectorized form computation
+# =====================================
+def compute_form(rows, prior=None):
+    """
+    Current form for every player in `rows`, in one grouped pass.
+
+    `rows` holds each player's new games, plus up to CONTEXT_GAMES earlier
+    games flagged CONTEXT = 1 so the L10 window is complete. `prior` (stored
+    NBA_PLAYER_FORM rows indexed by PLAYER_ID) carries GAMES and the EWMA
+    state across runs. The EWMA is the adjust=False recurrence
+    y = a·x + (1-a)·y_prev in closed form: each new game weighs a·(1-a)^k,
+    k = games played after it, and the starting value (the stored EWMA, or
+    the player's first game) weighs (1-a)^n.
+    """
+    rows = rows.sort_values(["PLAYER_ID", "GAME_DATE"], kind="mergesort").reset_index(drop=True)
+    rows[FORM_STATS] = rows[FORM_STATS].astype(float).fillna(0.0)
+    from_end = rows.groupby("PLAYER_ID", sort=False).cumcount(ascending=False)
+
+    form = {}
+    for w in WINDOWS:
+        last_w = rows[from_end < w].groupby("PLAYER_ID")[FORM_STATS].mean()
+        form.update({f"L{w}_{s}": last_w[s] for s in FORM_STATS})
+
+    new = rows[rows["CONTEXT"] == 0]
+    grouped = new.groupby("PLAYER_ID")
+    k = from_end[new.index].to_numpy()
+    decay = 1.0 - EWMA_ALPHA
+    weighted = new[FORM_STATS].mul(EWMA_ALPHA * decay ** k, axis=0).groupby(new["PLAYER_ID"]).sum()
+
+    start = grouped[FORM_STATS].first()
+    games = grouped.size()
+    last_seen = grouped[["PLAYER_NAME", "TEAM_NAME"]].last()     # .last() skips NULLs
+    if prior is not None and not prior.empty:
+        known = start.index.intersection(prior.index)
+        start.loc[known] = prior.loc[known, [f"EWMA_{s}" for s in FORM_STATS]].to_numpy(dtype=float)
+        games = games.add(prior["GAMES"].reindex(games.index).fillna(0)).astype(int)
+        last_seen = last_seen.fillna(prior[["PLAYER_NAME", "TEAM_NAME"]].reindex(last_seen.index))
+    ewma = weighted + start.mul(decay ** grouped.size(), axis=0)
+    form.update({f"EWMA_{s}": ewma[s] for s in FORM_STATS})
+
+    out = pd.DataFrame(form).reindex(games.index)
+    out.insert(0, "LAST_GAME_DATE", grouped["GAME_DATE"].max())
+    out.insert(0, "GAMES", games)
+    out.insert(0, "TEAM_NAME", last_seen["TEAM_NAME"])
+    out.insert(0, "PLAYER_NAME", last_seen["PLAYER_NAME"])
+    return out[["PLAYER_NAME", "TEAM_NAME", "GAMES", "LAST_GAME_DATE"] + FORM_COLUMNS]
+
+
+# =====================================
+# Storage
+# =====================================
+def ensure_table(cursor):
+    create_table_if_missing(cursor, FORM_DDL)
+
+
+def load_watermark(conn):
+    """(last game date folded in, games folded in) — (None, 0) for an empty table."""
+    df = pd.read_sql("SELECT MAX(LAST_GAME_DATE) AS WM, SUM(GAMES) AS GAMES FROM NBA_PLAYER_FORM", conn)
+    wm, games = df.iloc[0]["WM"], df.iloc[0]["GAMES"]
+    if wm is None or pd.isna(wm):
+        return None, 0
+    return pd.Timestamp(wm).to_pydatetime(), int(games)
+
+
+def count_rows_through(conn, wm):
+    return int(pd.read_sql("""
+        SELECT COUNT(*) AS N
+        FROM NBA_PLAYER_LIVE_STATS
+        WHERE PLAYER_ID IS NOT NULL AND GAME_DATE <= :wm
+    """, conn, params={"wm": wm})["N"].iloc[0])
+
+
+def fetch_new_rows(conn, wm):
+    """Stat rows after the watermark (every row when `wm` is None)."""
+    return pd.read_sql(f"""
+        SELECT PLAYER_ID, PLAYER_NAME, TEAM_NAME, GAME_DATE, {', '.join(FORM_STATS)}
+        FROM NBA_PLAYER_LIVE_STATS
+        WHERE PLAYER_ID IS NOT NULL AND GAME_DATE IS NOT NULL
+          AND (:wm IS NULL OR GAME_DATE > :wm)
+    """, conn, params={"wm": wm}).assign(CONTEXT=0)
+
+
+def in_chunks(conn, sql, player_ids, params=None):
+    """Run `sql` (with an {ids} placeholder) over `player_ids` in IN-list chunks."""
+    ids = [int(p) for p in player_ids]
+    parts = []
+    for start in range(0, len(ids), IN_CHUNK):
+        chunk = ids[start:start + IN_CHUNK]
+        binds = ", ".join(f":p{i}" for i in range(len(chunk)))
+        chunk_params = dict(params or {}, **{f"p{i}": p for i, p in enumerate(chunk)})
+        parts.append(pd.read_sql(sql.format(ids=binds), conn, params=chunk_params))
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+
+def fetch_context(conn, wm, player_ids):
+    """Each player's last CONTEXT_GAMES games on or before the watermark (completes the L10 window)."""
+    return in_chunks(conn, f"""
+        SELECT PLAYER_ID, PLAYER_NAME, TEAM_NAME, GAME_DATE, {', '.join(FORM_STATS)}
+        FROM (
+            SELECT s.*, ROW_NUMBER() OVER (PARTITION BY PLAYER_ID ORDER BY GAME_DATE DESC) AS RN
+            FROM NBA_PLAYER_LIVE_STATS s
+            WHERE GAME_DATE <= :wm AND PLAYER_ID IN ({{ids}})
+        )
+        WHERE RN <= {CONTEXT_GAMES}
+    """, player_ids, {"wm": wm}).assign(CONTEXT=1)
+
+
+def load_prior(conn, player_ids):
+    df = in_chunks(conn, f"""
+        SELECT PLAYER_ID, PLAYER_NAME, TEAM_NAME, GAMES, {', '.join(f'EWMA_{s}' for s in FORM_STATS)}
+        FROM NBA_PLAYER_FORM
+        WHERE PLAYER_ID IN ({{ids}})
+    """, player_ids)
+    return df.set_index("PLAYER_ID") if not df.empty else df
+
+
+def save_form(cursor, form):
+    cols = ["PLAYER_ID", "PLAYER_NAME", "TEAM_NAME", "GAMES", "LAST_GAME_DATE"] + FORM_COLUMNS
+    cursor.executemany(f"""
+        MERGE INTO NBA_PLAYER_FORM t
+        USING (
+            SELECT {', '.join(f':{i + 1} AS {c}' for i, c in enumerate(cols))}
+            FROM dual
+        ) s
+        ON (t.PLAYER_ID = s.PLAYER_ID)
+        WHEN MATCHED THEN
+            UPDATE SET
+                {', '.join(f't.{c} = s.{c}' for c in cols[1:])},
+                t.UPDATED_AT = SYSTIMESTAMP
+        WHEN NOT MATCHED THEN
+            INSERT ({', '.join(cols)})
+            VALUES ({', '.join(f's.{c}' for c in cols)})
+    """, [
+        [int(player_id),
+         None if pd.isna(r.PLAYER_NAME) else r.PLAYER_NAME,
+         None if pd.isna(r.TEAM_NAME) else r.TEAM_NAME,
+         int(r.GAMES), pd.Timestamp(r.LAST_GAME_DATE).to_pydatetime()]
+        + [round(float(getattr(r, c)), 4) for c in FORM_COLUMNS]
+        for player_id, r in form.iterrows()
+    ])
+    return len(form)
+
+
+# =====================================
+# Incremental refresh
+# =====================================
+def refresh_player_form(conn, rebuild=False):
+    """
+    Recompute form for the players with NBA_PLAYER_LIVE_STATS rows newer
+    than the table's watermark; everyone else is untouched. If rows were
+    loaded on or before the watermark (stored game counts no longer add
+    up), the table is rebuilt. Returns the number of players updated.
+    """
+    cursor = conn.cursor()
+    ensure_table(cursor)
+
+    wm, stored_games = (None, 0) if rebuild else load_watermark(conn)
+    if wm is not None and count_rows_through(conn, wm) != stored_games:
+        print("   ⚠️ Stat rows were backfilled behind the watermark — rebuilding player form")
+        wm = None
+    if wm is None:
+        cursor.execute("DELETE FROM NBA_PLAYER_FORM")
+
+    rows = fetch_new_rows(conn, wm)
+    updated = 0
+    if not rows.empty:
+        players = rows["PLAYER_ID"].unique()
+        prior = None
+        if wm is not None:
+            rows = pd.concat([fetch_context(conn, wm, players), rows], ignore_index=True)
+            prior = load_prior(conn, players)
+        updated = save_form(cursor, compute_form(rows, prior))
+
+    conn.commit()
+    cursor.close()
+    return updated
+
+
+def update_player_form(rebuild=False):
+    print("\n📈 Updating player form (L5 / L10 / EWMA)\n")
+
+    conn = get_connection()
+    updated = refresh_player_form(conn, rebuild=rebuild)
+    conn.close()
+
+    print(f"💾 {updated} players updated")
+    print("\n🎉 NBA_PLAYER_FORM up to date!\n")
+
+
+# =====================================
+# Readers
+# =====================================
+def fetch_team_form(conn, team, limit=5, order_by="L10_POINTS"):
+    """A team's top `limit` players by a form column — one keyed read."""
+    if order_by not in FORM_COLUMNS:
+        raise ValueError(f"order_by must be one of {FORM_COLUMNS}")
+    return pd.read_sql(f"""
+        SELECT PLAYER_ID, PLAYER_NAME, GAMES, LAST_GAME_DATE, {', '.join(FORM_COLUMNS)}
+        FROM NBA_PLAYER_FORM
+        WHERE TEAM_NAME = :team
+        ORDER BY {order_by} DESC
+        FETCH FIRST {int(limit)} ROWS ONLY
+    """, conn, params={"team": team})
+
+
+def fetch_player_form(conn, player_id):
+    """One player's stored form as a dict, or None."""
+    df = pd.read_sql(f"""
+        SELECT PLAYER_NAME, TEAM_NAME, GAMES, LAST_GAME_DATE, {', '.join(FORM_COLUMNS)}
+        FROM NBA_PLAYER_FORM
+        WHERE PLAYER_ID = :player_id
+    """, conn, params={"player_id": int(player_id)})
+    return df.iloc[0].to_dict() if not df.empty else None
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Incremental L5 / L10 / EWMA player form from NBA_PLAYER_LIVE_STATS")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every player from all stat rows")
+    args = parser.parse_args()
+
+    update_player_form(rebuild=args.rebuild)
@@ -0,0 +1,216 @@
+import os
+import sys
+import datetime
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from analytics.array_store import save_arrays, load_arrays, load_meta, has_arrays
+from profiling import profile_from_env
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORE_PATH = os.path.join(PROJECT_ROOT, "data", "player_logs")
+STAT_COLUMNS = ["POINTS", "REBOUNDS", "ASSISTS", "STEALS", "BLOCKS", "TURNOVERS", "MINUTES"]
+
+
+class PlayerLogStore:
+    """
+    Every player's game log from NBA_PLAYER_LIVE_STATS as columnar arrays,
+    partitioned by player (CSR layout) and memory-mapped from data/player_logs:
+
+        player_ids  (P,)    sorted ids; player k owns rows offsets[k]:offsets[k+1]
+        offsets     (P+1,)
+        game_date   (N,)    datetime64[D], ascending within each player
+        <STAT>      (N,)    float32 per stat column
+        cum_<STAT>  (N+1,)  running sums, so any rolling mean is two lookups
+
+    A lookup is a binary search plus array slices — no query, no copy.
+    """
+
+    def __init__(self, arrays, meta):
+        self.arrays = arrays
+        self.meta = meta
+        self.player_ids = arrays["player_ids"]
+        self.offsets = arrays["offsets"]
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        if not has_arrays(path):
+            raise FileNotFoundError(f"No player log store at {path} — run analytics/player_log_store.py")
+        arrays, meta = load_arrays(path, mmap=True)
+        return cls(arrays, meta)
+
+    def rows(self, player_id):
+        """(start, end) of the player's rows, or (0, 0) for an unknown id."""
+        k = np.searchsorted(self.player_ids, player_id)
+        if k == len(self.player_ids) or self.player_ids[k] != player_id:
+            return 0, 0
+        return int(self.offsets[k]), int(self.offsets[k + 1])
+
+    def players(self):
+        """{PLAYER_ID: latest PLAYER_NAME} for every player in the store."""
+        return dict(zip(self.player_ids.tolist(), self.arrays["player_names"].tolist()))
+
+    def game_log(self, player_id, columns=STAT_COLUMNS, last=None):
+        """Full game log (or the `last` N games), oldest first, as a DataFrame over the mapped arrays."""
+        start, end = self.rows(player_id)
+        if last is not None:
+            start = max(start, end - last)
+        data = {"GAME_DATE": self.arrays["game_date"][start:end]}
+        data.update({c: self.arrays[c][start:end] for c in columns})
+        return pd.DataFrame(data, copy=False)
+
+    def rolling(self, player_id, column, window):
+        """Mean of `column` over each game and up to window-1 before it (shorter at the start)."""
+        start, end = self.rows(player_id)
+        cum = self.arrays[f"cum_{column}"]
+        idx = np.arange(start + 1, end + 1)
+        lo = np.maximum(idx - window, start)
+        return (cum[idx] - cum[lo]) / (idx - lo)
+
+    def overlay(self, player_ids, column, window=None):
+        """Long frame (PLAYER_ID, GAME_DATE, value) for several players — one gather, no per-player query."""
+        spans = [self.rows(p) for p in player_ids]
+        idx = np.concatenate([np.arange(start, end) for start, end in spans] + [np.zeros(0, dtype=np.int64)])
+        if window:
+            values = np.concatenate([self.rolling(p, column, window) for p in player_ids] + [np.zeros(0)])
+        else:
+            values = self.arrays[column][idx]
+        return pd.DataFrame({
+            "PLAYER_ID": np.repeat(list(player_ids), [end - start for start, end in spans]),
+            "GAME_DATE": self.arrays["game_date"][idx],
+            column: values,
+        })
+
+
+# =====================================
+# Build / incremental refresh
+# =====================================
+def fetch_rows(conn, wm=None):
+    """Stat rows after the watermark (every row when `wm` is None)."""
+    return pd.read_sql(f"""
+        SELECT PLAYER_ID, PLAYER_NAME, GAME_DATE, {', '.join(STAT_COLUMNS)}
+        FROM NBA_PLAYER_LIVE_STATS
+        WHERE PLAYER_ID IS NOT NULL AND GAME_DATE IS NOT NULL
+          AND (:wm IS NULL OR GAME_DATE > :wm)
+    """, conn, params={"wm": wm})
+
+
+def count_rows_through(conn, wm):
+    return int(pd.read_sql("""
+        SELECT COUNT(*) AS N
+        FROM NBA_PLAYER_LIVE_STATS
+        WHERE PLAYER_ID IS NOT NULL AND GAME_DATE <= :wm
+    """, conn, params={"wm": wm})["N"].iloc[0])
+
+
+def columns_from_rows(rows):
+    """Query result → flat columns (unsorted), the shape a stored store is read back into."""
+    return {
+        "player_id": rows["PLAYER_ID"].to_numpy(dtype=np.int64),
+        "player_name": rows["PLAYER_NAME"].fillna("").astype(str).to_numpy(),
+        "game_date": pd.to_datetime(rows["GAME_DATE"]).to_numpy().astype("datetime64[D]"),
+        **{c: rows[c].to_numpy(dtype=np.float32, na_value=np.nan) for c in STAT_COLUMNS},
+    }
+
+
+def columns_from_store(store):
+    """Expand the CSR arrays back into flat columns (names repeated per row)."""
+    counts = np.diff(store.offsets)
+    return {
+        "player_id": np.repeat(np.asarray(store.player_ids), counts),
+        "player_name": np.repeat(np.asarray(store.arrays["player_names"]), counts),
+        "game_date": np.asarray(store.arrays["game_date"]),
+        **{c: np.asarray(store.arrays[c]) for c in STAT_COLUMNS},
+    }
+
+
+def to_csr(columns):
+    """Flat columns → the CSR arrays PlayerLogStore maps."""
+    order = np.lexsort((columns["game_date"], columns["player_id"]))
+    pid = columns["player_id"][order]
+    names = columns["player_name"][order]
+
+    player_ids, first = np.unique(pid, return_index=True)
+    offsets = np.append(first, len(pid)).astype(np.int64)
+    # Latest non-empty name per player (.last() skips the NaNs)
+    player_names = (
+        pd.Series(names).replace("", np.nan).groupby(pid).last()
+        .reindex(player_ids).fillna("").to_numpy(dtype=str)
+    )
+
+    arrays = {
+        "player_ids": player_ids,
+        "offsets": offsets,
+        "player_names": player_names,
+        "game_date": columns["game_date"][order],
+    }
+    for c in STAT_COLUMNS:
+        values = columns[c][order].astype(np.float32)
+        arrays[c] = values
+        arrays[f"cum_{c}"] = np.concatenate([[0.0], np.nancumsum(values, dtype=np.float64)])
+    return arrays
+
+
+def refresh_player_store(conn, path=STORE_PATH, rebuild=False):
+    """
+    Append NBA_PLAYER_LIVE_STATS rows newer than the store's watermark and
+    rewrite the store atomically. Only the new rows are queried; if rows
+    were loaded on or before the watermark since the last refresh (row
+    counts disagree), the store is rebuilt from the table.
+    Returns the number of rows appended.
+    """
+    store = None
+    if not rebuild and has_arrays(path):
+        store = PlayerLogStore.load(path)
+        wm = datetime.datetime.fromisoformat(store.meta["watermark"])
+        if count_rows_through(conn, wm) != store.meta["rows"]:
+            print("   ⚠️ Stat rows were backfilled behind the watermark — rebuilding the player store")
+            store = None
+
+    wm = datetime.datetime.fromisoformat(store.meta["watermark"]) if store else None
+    rows = fetch_rows(conn, wm)
+    if store is not None and rows.empty:
+        return 0
+
+    new = columns_from_rows(rows)
+    if store is not None:
+        old = columns_from_store(store)
+        new = {k: np.concatenate([old[k], new[k]]) for k in new}
+        del store, old   # release the maps so the superseded version can be deleted (Windows refuses otherwise)
+
+    arrays = to_csr(new)
+    dates = arrays["game_date"]
+    save_arrays(path, arrays, {
+        "columns": STAT_COLUMNS,
+        "rows": int(len(dates)),
+        "players": int(len(arrays["player_ids"])),
+        "watermark": (pd.Timestamp(dates.max()) if len(dates) else pd.Timestamp(1900, 1, 1)).isoformat(),
+        "built_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    })
+    return len(rows)
+
+
+def build_player_store(rebuild=False, path=STORE_PATH):
+    print("\n🗂️ Refreshing the per-player game log store\n")
+
+    conn = get_connection()
+    appended = refresh_player_store(conn, path, rebuild=rebuild)
+    conn.close()
+
+    meta = load_meta(path) if has_arrays(path) else {}
+    print(f"🏀 Rows appended: {appended}")
+    print(f"💾 {meta.get('rows', 0)} games for {meta.get('players', 0)} players → {path}")
+    print("🎉 Game log pages now read from the store.\n")
+    return path
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Memory-mapped per-player game logs from NBA_PLAYER_LIVE_STATS")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild from every stat row")
+    args = parser.parse_args()
+
+    build_player_store(rebuild=args.rebuild)
@@ -0,0 +1,220 @@
+import os
+import sys
+import argparse
+import datetime
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from analytics.forest_compiler import load_forest
+from analytics.team_features import fetch_last10_form, fetch_season_features, build_matchup_features
+from analytics.win_model_versions import get_version
+from etl_scripts.db_utils import create_table_if_missing
+from profiling import profile_from_env
+
+SLATE_VERSIONS = ["v2", "v3"]
+
+PREDICTIONS_DDL = """
+    CREATE TABLE NBA_WIN_PREDICTIONS (
+        GAME_DATE        DATE          NOT NULL,
+        HOME_TEAM        VARCHAR2(100) NOT NULL,
+        AWAY_TEAM        VARCHAR2(100) NOT NULL,
+        MODEL_VERSION    VARCHAR2(10)  NOT NULL,
+        HOME_WIN_PROB    NUMBER,
+        AWAY_WIN_PROB    NUMBER,
+        PREDICTED_WINNER VARCHAR2(100),
+        CREATED_AT       TIMESTAMP DEFAULT SYSTIMESTAMP,
+        CONSTRAINT NBA_WIN_PREDICTIONS_PK
+            PRIMARY KEY (GAME_DATE, HOME_TEAM, AWAY_TEAM, MODEL_VERSION)
+    )
+"""
+
+
+def fetch_scheduled_games(conn, game_date):
+    """
+    Matchups on a date: the API `games` table (fetch_games.py, includes
+    scheduled games) first, then NBA_GAME_LOGS for past dates.
+    """
+    queries = [
+        """
+            SELECT DISTINCT HOME_TEAM, VISITOR_TEAM AS AWAY_TEAM
+            FROM games
+            WHERE game_date >= :d AND game_date < :d + 1
+        """,
+        """
+            SELECT DISTINCT HOME_TEAM, AWAY_TEAM
+            FROM NBA_GAME_LOGS
+            WHERE GAME_DATE >= :d AND GAME_DATE < :d + 1
+        """,
+    ]
+    for q in queries:
+        try:
+            df = pd.read_sql(q, conn, params={"d": game_date})
+        except Exception:
+            # games table might not exist yet
+            continue
+        if not df.empty:
+            return df
+    return pd.DataFrame(columns=["HOME_TEAM", "AWAY_TEAM"])
+
+
+def predict_matchups(conn, matchups, game_date=None, versions=SLATE_VERSIONS, models=None):
+    """
+    Score every HOME_TEAM / AWAY_TEAM row for each model version.
+    Team features come from one query per feature family and each model
+    is evaluated once over the whole slate.
+    """
+    models = models or {v: load_forest(v) for v in versions}
+    as_of = game_date or datetime.datetime.now()
+
+    last10 = fetch_last10_form(conn, as_of=as_of) if "v2" in versions else None
+    season = fetch_season_features(conn) if "v3" in versions else None
+
+    results = []
+    for version in versions:
+        X = build_matchup_features(matchups, version, last10=last10, season=season)
+        scored = matchups.copy()
+
+        usable = X.notna().all(axis=1)
+        if not usable.all():
+            print(f"⚠️ {version.upper()}: no features for {(~usable).sum()} matchup(s) — skipped")
+        X, scored = X[usable], scored[usable]
+        if X.empty:
+            continue
+
+        proba = models[version].predict_proba(X)
+        scored["MODEL_VERSION"] = version
+        scored["HOME_WIN_PROB"] = (proba[:, 1] * 100).round(2)
+        scored["AWAY_WIN_PROB"] = (proba[:, 0] * 100).round(2)
+        scored["PREDICTED_WINNER"] = scored["HOME_TEAM"].where(
+            scored["HOME_WIN_PROB"] > scored["AWAY_WIN_PROB"], scored["AWAY_TEAM"]
+        )
+        results.append(pd.concat([scored, X], axis=1))
+
+    return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+
+
+def predict_matchup(conn, version, home, away, model=None):
+    """
+    One matchup scored exactly like a build_matchup_matrix.py cell (same
+    features, same rounding) — the pages' fallback when the pair is not in
+    the matrix. Returns the MatchupMatrix.lookup dict, or None if a team
+    has no features for this version.
+    """
+    matchup = pd.DataFrame([{"HOME_TEAM": home, "AWAY_TEAM": away}])
+    scored = predict_matchups(conn, matchup, versions=[version],
+                              models={version: model} if model is not None else None)
+    if scored.empty:
+        return None
+
+    row = scored.iloc[0]
+    cols = get_version(version)["feature_cols"]
+    return {
+        "home_prob": float(row["HOME_WIN_PROB"]),
+        "away_prob": float(row["AWAY_WIN_PROB"]),
+        "features": {c: float(row[c]) for c in cols},
+    }
+
+
+def save_predictions(conn, game_date, predictions):
+    """Upsert a scored slate into NBA_WIN_PREDICTIONS."""
+    cursor = conn.cursor()
+    create_table_if_missing(cursor, PREDICTIONS_DDL)
+
+    batch = [
+        [game_date, r.HOME_TEAM, r.AWAY_TEAM, r.MODEL_VERSION,
+         float(r.HOME_WIN_PROB), float(r.AWAY_WIN_PROB), r.PREDICTED_WINNER]
+        for r in predictions.itertuples(index=False)
+    ]
+
+    cursor.executemany("""
+        MERGE INTO NBA_WIN_PREDICTIONS t
+        USING (
+            SELECT :1 AS GAME_DATE, :2 AS HOME_TEAM, :3 AS AWAY_TEAM, :4 AS MODEL_VERSION,
+                   :5 AS HOME_WIN_PROB, :6 AS AWAY_WIN_PROB, :7 AS PREDICTED_WINNER
+            FROM dual
+        ) s
+        ON (t.GAME_DATE = s.GAME_DATE AND t.HOME_TEAM = s.HOME_TEAM
+            AND t.AWAY_TEAM = s.AWAY_TEAM AND t.MODEL_VERSION = s.MODEL_VERSION)
+        WHEN MATCHED THEN
+            UPDATE SET
+                t.HOME_WIN_PROB    = s.HOME_WIN_PROB,
+                t.AWAY_WIN_PROB    = s.AWAY_WIN_PROB,
+                t.PREDICTED_WINNER = s.PREDICTED_WINNER,
+                t.CREATED_AT       = SYSTIMESTAMP
+        WHEN NOT MATCHED THEN
+            INSERT (GAME_DATE, HOME_TEAM, AWAY_TEAM, MODEL_VERSION,
+                    HOME_WIN_PROB, AWAY_WIN_PROB, PREDICTED_WINNER)
+            VALUES (s.GAME_DATE, s.HOME_TEAM, s.AWAY_TEAM, s.MODEL_VERSION,
+                    s.HOME_WIN_PROB, s.AWAY_WIN_PROB, s.PREDICTED_WINNER)
+    """, batch)
+    conn.commit()
+    cursor.close()
+    return len(batch)
+
+
+def load_slate_predictions(conn, game_date, version):
+    """What the dashboard pages read: one keyed query, no model call."""
+    return pd.read_sql("""
+        SELECT HOME_TEAM, AWAY_TEAM, HOME_WIN_PROB, AWAY_WIN_PROB, PREDICTED_WINNER
+        FROM NBA_WIN_PREDICTIONS
+        WHERE GAME_DATE = :game_date AND MODEL_VERSION = :version
+        ORDER BY HOME_TEAM
+    """, conn, params={"game_date": game_date, "version": version})
+
+
+def predict_slate(game_date=None, matchups=None, versions=SLATE_VERSIONS, save=True):
+    game_date = datetime.datetime.combine(game_date or datetime.date.today(), datetime.time())
+
+    print(f"\n📅 Slate predictions for {game_date:%Y-%m-%d}\n")
+
+    conn = get_connection()
+
+    if matchups is None:
+        matchups = fetch_scheduled_games(conn, game_date)
+    if matchups.empty:
+        print("📭 No games scheduled for this date.")
+        conn.close()
+        return pd.DataFrame()
+
+    print(f"🏀 Matchups: {len(matchups)} | Models: {', '.join(v.upper() for v in versions)}")
+
+    predictions = predict_matchups(conn, matchups.reset_index(drop=True), game_date, versions)
+
+    if predictions.empty:
+        print("⚠️ Nothing could be scored.")
+    else:
+        print(predictions[["MODEL_VERSION", "HOME_TEAM", "AWAY_TEAM", "HOME_WIN_PROB", "PREDICTED_WINNER"]]
+              .to_string(index=False))
+        if save:
+            saved = save_predictions(conn, game_date, predictions)
+            print(f"\n💾 Saved {saved} predictions → NBA_WIN_PREDICTIONS")
+
+    conn.close()
+    return predictions
+
+
+def parse_matchup(value):
+    """'Home Team:Away Team' → (home, away)"""
+    home, sep, away = value.partition(":")
+    if not sep or not home.strip() or not away.strip():
+        raise argparse.ArgumentTypeError(f"Expected 'Home Team:Away Team', got {value!r}")
+    return home.strip(), away.strip()
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Score every matchup on a date in one batch")
+    parser.add_argument("--date", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="slate date YYYY-MM-DD (default: today)")
+    parser.add_argument("--matchup", type=parse_matchup, action="append",
+                        help="'Home Team:Away Team' — repeat to score a custom slate")
+    parser.add_argument("--models", nargs="+", default=SLATE_VERSIONS, choices=SLATE_VERSIONS)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    custom = None
+    if args.matchup:
+        custom = pd.DataFrame(args.matchup, columns=["HOME_TEAM", "AWAY_TEAM"])
+
+    predict_slate(args.date, custom, args.models, save=not args.no_save)
@@ -0,0 +1,273 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from etl_scripts.db_utils import create_table_if_missing
+from dashboard.utils.prediction_log import ensure_log_table
+from profiling import profile_from_env
+
+# A prediction is matched to the first game between the same home/away
+# teams on or after the day it was made; if none is played within this
+# many days it is closed out as unmatched so it is not rescanned forever.
+MATCH_WINDOW_DAYS = 14
+
+# Calibration buckets on the home win probability: 0 = [0, 10%), ..., 9 = [90%, 100%]
+N_BUCKETS = 10
+
+OUTCOMES_DDL = """
+    CREATE TABLE NBA_PREDICTION_OUTCOMES (
+        LOG_ROWID      VARCHAR2(18)  NOT NULL,
+        MODEL_VERSION  VARCHAR2(10),
+        HOME_TEAM      VARCHAR2(100),
+        AWAY_TEAM      VARCHAR2(100),
+        PREDICTED_AT   TIMESTAMP,
+        GAME_ID        NUMBER,
+        GAME_DATE      DATE,
+        SEASON         NUMBER,
+        HOME_WIN_PROB  NUMBER,
+        HOME_WON       NUMBER(1),
+        CORRECT        NUMBER(1),
+        BRIER          NUMBER,
+        BUCKET         NUMBER(2),
+        RECONCILED_AT  TIMESTAMP DEFAULT SYSTIMESTAMP,
+        CONSTRAINT NBA_PREDICTION_OUTCOMES_PK PRIMARY KEY (LOG_ROWID)
+    )
+"""
+
+ACCURACY_DDL = """
+    CREATE TABLE NBA_PREDICTION_ACCURACY (
+        MODEL_VERSION  VARCHAR2(10) NOT NULL,
+        SEASON         NUMBER       NOT NULL,
+        BUCKET         NUMBER(2)    NOT NULL,
+        N              NUMBER,
+        CORRECT        NUMBER,
+        BRIER_SUM      NUMBER,
+        LOG_LOSS_SUM   NUMBER,
+        PROB_SUM       NUMBER,
+        HOME_WINS      NUMBER,
+        UPDATED_AT     TIMESTAMP DEFAULT SYSTIMESTAMP,
+        CONSTRAINT NBA_PREDICTION_ACCURACY_PK PRIMARY KEY (MODEL_VERSION, SEASON, BUCKET)
+    )
+"""
+
+
+def ensure_tables(cursor):
+    ensure_log_table(cursor)
+    create_table_if_missing(cursor, OUTCOMES_DDL)
+    create_table_if_missing(cursor, ACCURACY_DDL)
+
+
+def fetch_new_matches(conn):
+    """
+    Logged predictions with no outcome row yet whose game has been played.
+    The NOT EXISTS anti-join means every run only touches new predictions.
+    """
+    return pd.read_sql("""
+        SELECT LOG_ROWID, MODEL_VERSION, HOME_TEAM, AWAY_TEAM, PREDICTED_AT,
+               GAME_ID, GAME_DATE, SEASON, HOME_WIN_PROB, HOME_POINTS, AWAY_POINTS
+        FROM (
+            SELECT ROWIDTOCHAR(l.ROWID) AS LOG_ROWID,
+                   NVL(l.MODEL_VERSION, 'legacy') AS MODEL_VERSION,
+                   l.HOME_TEAM, l.AWAY_TEAM, l.PREDICTED_AT, l.HOME_WIN_PROB,
+                   g.GAME_ID, g.GAME_DATE, g.SEASON, g.HOME_POINTS, g.AWAY_POINTS,
+                   ROW_NUMBER() OVER (PARTITION BY l.ROWID ORDER BY g.GAME_DATE, g.GAME_ID) AS RN
+            FROM NBA_WIN_PREDICTIONS_LOG l
+            JOIN NBA_GAME_LOGS g
+              ON g.HOME_TEAM = l.HOME_TEAM
+             AND g.AWAY_TEAM = l.AWAY_TEAM
+             AND g.GAME_DATE >= TRUNC(l.PREDICTED_AT)
+             AND g.GAME_DATE <  TRUNC(l.PREDICTED_AT) + :window
+             -- Rows the loaders left incomplete cannot be scored or bucketed by season
+             AND g.SEASON IS NOT NULL
+             AND g.GAME_ID IS NOT NULL
+             AND g.HOME_POINTS IS NOT NULL
+             AND g.AWAY_POINTS IS NOT NULL
+            WHERE l.HOME_WIN_PROB IS NOT NULL
+              AND l.PREDICTED_AT IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM NBA_PREDICTION_OUTCOMES o
+                  WHERE o.LOG_ROWID = ROWIDTOCHAR(l.ROWID)
+              )
+        )
+        WHERE RN = 1
+    """, conn, params={"window": MATCH_WINDOW_DAYS})
+
+
+def score_outcomes(matches):
+    """Per-prediction correctness, Brier term and calibration bucket."""
+    p = matches["HOME_WIN_PROB"].astype(float) / 100.0
+    home_won = (matches["HOME_POINTS"] > matches["AWAY_POINTS"]).astype(int)
+
+    scored = matches.copy()
+    scored["P"] = p
+    scored["HOME_WON"] = home_won
+    scored["CORRECT"] = ((p > 0.5).astype(int) == home_won).astype(int)
+    scored["BRIER"] = (p - home_won) ** 2
+    eps = 1e-6
+    scored["LOG_LOSS"] = -(home_won * np.log(p.clip(eps, 1 - eps))
+                           + (1 - home_won) * np.log((1 - p).clip(eps, 1 - eps)))
+    scored["BUCKET"] = np.minimum((p * N_BUCKETS).astype(int), N_BUCKETS - 1)
+    return scored
+
+
+def insert_outcomes(cursor, scored):
+    batch = [
+        [r.LOG_ROWID, r.MODEL_VERSION, r.HOME_TEAM, r.AWAY_TEAM, r.PREDICTED_AT.to_pydatetime(),
+         int(r.GAME_ID), r.GAME_DATE.to_pydatetime(), int(r.SEASON), float(r.HOME_WIN_PROB),
+         int(r.HOME_WON), int(r.CORRECT), float(r.BRIER), int(r.BUCKET)]
+        for r in scored.itertuples(index=False)
+    ]
+    cursor.executemany("""
+        INSERT INTO NBA_PREDICTION_OUTCOMES (
+            LOG_ROWID, MODEL_VERSION, HOME_TEAM, AWAY_TEAM, PREDICTED_AT,
+            GAME_ID, GAME_DATE, SEASON, HOME_WIN_PROB,
+            HOME_WON, CORRECT, BRIER, BUCKET
+        )
+        VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9, :10, :11, :12, :13)
+    """, batch)
+    return len(batch)
+
+
+def merge_accuracy(cursor, scored):
+    """Add this run's per-(version, season, bucket) sums onto the running totals."""
+    deltas = (
+        scored.groupby(["MODEL_VERSION", "SEASON", "BUCKET"])
+        .agg(N=("CORRECT", "size"), CORRECT=("CORRECT", "sum"),
+             BRIER_SUM=("BRIER", "sum"), LOG_LOSS_SUM=("LOG_LOSS", "sum"),
+             PROB_SUM=("P", "sum"), HOME_WINS=("HOME_WON", "sum"))
+        .reset_index()
+    )
+
+    batch = [
+        [r.MODEL_VERSION, int(r.SEASON), int(r.BUCKET), int(r.N), int(r.CORRECT),
+         float(r.BRIER_SUM), float(r.LOG_LOSS_SUM), float(r.PROB_SUM), int(r.HOME_WINS)]
+        for r in deltas.itertuples(index=False)
+    ]
+    cursor.executemany("""
+        MERGE INTO NBA_PREDICTION_ACCURACY t
+        USING (
+            SELECT :1 AS MODEL_VERSION, :2 AS SEASON, :3 AS BUCKET,
+                   :4 AS N, :5 AS CORRECT, :6 AS BRIER_SUM, :7 AS LOG_LOSS_SUM,
+                   :8 AS PROB_SUM, :9 AS HOME_WINS
+            FROM dual
+        ) s
+        ON (t.MODEL_VERSION = s.MODEL_VERSION AND t.SEASON = s.SEASON AND t.BUCKET = s.BUCKET)
+        WHEN MATCHED THEN
+            UPDATE SET
+                t.N            = t.N + s.N,
+                t.CORRECT      = t.CORRECT + s.CORRECT,
+                t.BRIER_SUM    = t.BRIER_SUM + s.BRIER_SUM,
+                t.LOG_LOSS_SUM = t.LOG_LOSS_SUM + s.LOG_LOSS_SUM,
+                t.PROB_SUM     = t.PROB_SUM + s.PROB_SUM,
+                t.HOME_WINS    = t.HOME_WINS + s.HOME_WINS,
+                t.UPDATED_AT   = SYSTIMESTAMP
+        WHEN NOT MATCHED THEN
+            INSERT (MODEL_VERSION, SEASON, BUCKET, N, CORRECT,
+                    BRIER_SUM, LOG_LOSS_SUM, PROB_SUM, HOME_WINS)
+            VALUES (s.MODEL_VERSION, s.SEASON, s.BUCKET, s.N, s.CORRECT,
+                    s.BRIER_SUM, s.LOG_LOSS_SUM, s.PROB_SUM, s.HOME_WINS)
+    """, batch)
+    return len(batch)
+
+
+def close_expired(cursor):
+    """Record predictions whose match window passed with no game (GAME_ID stays NULL)."""
+    cursor.execute("""
+        INSERT INTO NBA_PREDICTION_OUTCOMES (LOG_ROWID, MODEL_VERSION, HOME_TEAM, AWAY_TEAM, PREDICTED_AT)
+        SELECT ROWIDTOCHAR(l.ROWID), NVL(l.MODEL_VERSION, 'legacy'),
+               l.HOME_TEAM, l.AWAY_TEAM, l.PREDICTED_AT
+        FROM NBA_WIN_PREDICTIONS_LOG l
+        WHERE (l.PREDICTED_AT IS NULL
+               OR l.HOME_WIN_PROB IS NULL
+               OR l.PREDICTED_AT < TRUNC(SYSDATE) - :window)
+          AND NOT EXISTS (
+              SELECT 1 FROM NBA_PREDICTION_OUTCOMES o
+              WHERE o.LOG_ROWID = ROWIDTOCHAR(l.ROWID)
+          )
+    """, {"window": MATCH_WINDOW_DAYS})
+    return cursor.rowcount
+
+
+def load_accuracy(conn, model_version=None):
+    """
+    Accuracy / Brier / log-loss per model and season, read from the small
+    aggregate table (what monitoring should query).
+    """
+    return pd.read_sql("""
+        SELECT MODEL_VERSION, SEASON,
+               SUM(N) AS N,
+               ROUND(SUM(CORRECT) / SUM(N), 4)      AS ACCURACY,
+               ROUND(SUM(BRIER_SUM) / SUM(N), 4)    AS BRIER,
+               ROUND(SUM(LOG_LOSS_SUM) / SUM(N), 4) AS LOG_LOSS
+        FROM NBA_PREDICTION_ACCURACY
+        WHERE MODEL_VERSION = NVL(:version, MODEL_VERSION)
+        GROUP BY MODEL_VERSION, SEASON
+        ORDER BY MODEL_VERSION, SEASON
+    """, conn, params={"version": model_version})
+
+
+def load_calibration(conn, model_version, season=None):
+    """Mean predicted vs observed home win rate per probability bucket."""
+    return pd.read_sql("""
+        SELECT BUCKET,
+               SUM(N) AS N,
+               ROUND(SUM(PROB_SUM) / SUM(N), 4)  AS MEAN_PREDICTED,
+               ROUND(SUM(HOME_WINS) / SUM(N), 4) AS OBSERVED
+        FROM NBA_PREDICTION_ACCURACY
+        WHERE MODEL_VERSION = :version
+          AND SEASON = NVL(:season, SEASON)
+        GROUP BY BUCKET
+        ORDER BY BUCKET
+    """, conn, params={"version": model_version, "season": season})
+
+
+def reconcile(rebuild=False):
+    print("\n🔁 Reconciling logged predictions with game results\n")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    ensure_tables(cursor)
+
+    if rebuild:
+        print("🧹 Rebuild requested — clearing outcomes and accuracy totals")
+        cursor.execute("DELETE FROM NBA_PREDICTION_OUTCOMES")
+        cursor.execute("DELETE FROM NBA_PREDICTION_ACCURACY")
+
+    matches = fetch_new_matches(conn)
+    print(f"🏀 New predictions with a final result: {len(matches)}")
+
+    if not matches.empty:
+        scored = score_outcomes(matches)
+        inserted = insert_outcomes(cursor, scored)
+        groups = merge_accuracy(cursor, scored)
+        print(f"   • {inserted} outcomes recorded, {groups} accuracy buckets updated")
+
+    expired = close_expired(cursor)
+    if expired:
+        print(f"⌛ Closed {expired} predictions with no game inside {MATCH_WINDOW_DAYS} days")
+
+    # Outcomes and running totals move together or not at all
+    conn.commit()
+
+    summary = load_accuracy(conn)
+    if not summary.empty:
+        print("\n📊 Running accuracy\n")
+        print(summary.to_string(index=False))
+
+    cursor.close()
+    conn.close()
+    print("\n🎉 Reconciliation complete!\n")
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Match logged win predictions to results and update accuracy")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="recompute outcomes and accuracy from the full log")
+    args = parser.parse_args()
+
+    reconcile(rebuild=args.rebuild)
@@ -0,0 +1,182 @@
+import os
+import sys
+import argparse
+import pandas as pd
+from sklearn.metrics import accuracy_score
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from analytics.win_model_versions import get_version, load_artifact, save_artifact
+from profiling import profile_from_env
+
+# -----------------------------
+# Refresh settings
+# -----------------------------
+SPEC = get_version("v2")
+DATA_PATH = SPEC["data_path"]
+
+LOOKBACK_DAYS = 120      # history pulled in front of the new games for last-10 form
+TREES_PER_REFRESH = 25   # new trees grown on each refresh
+MAX_TREES = 600          # oldest trees are retired beyond this
+WINDOW_ROWS = 2000       # most recent training rows the new trees see
+
+
+def last10_features(game_logs):
+    """
+    Vectorized version of the last-10 helpers in build_win_training_data_v2.py:
+    each team's win % and points over its previous 10 games, taken strictly
+    before the game date (0.50 / 100 when a team has no history yet).
+    """
+    games = game_logs.reset_index(drop=True)
+    games["GAME_IDX"] = games.index
+
+    home = pd.DataFrame({
+        "GAME_IDX": games["GAME_IDX"], "GAME_DATE": games["GAME_DATE"],
+        "TEAM": games["HOME_TEAM"], "PTS": games["HOME_POINTS"],
+        "WIN": (games["WINNER"] == games["HOME_TEAM"]).astype(float), "SIDE": "HOME",
+    })
+    away = pd.DataFrame({
+        "GAME_IDX": games["GAME_IDX"], "GAME_DATE": games["GAME_DATE"],
+        "TEAM": games["AWAY_TEAM"], "PTS": games["AWAY_POINTS"],
+        "WIN": (games["WINNER"] == games["AWAY_TEAM"]).astype(float), "SIDE": "AWAY",
+    })
+    team_games = pd.concat([home, away]).sort_values(["TEAM", "GAME_DATE"], kind="stable")
+
+    grouped = team_games.groupby("TEAM", sort=False)
+    team_games["LAST10_WIN_PCT"] = grouped["WIN"].transform(
+        lambda s: s.shift(1).rolling(10, min_periods=1).mean()
+    ).fillna(0.50)
+    team_games["LAST10_PTS"] = grouped["PTS"].transform(
+        lambda s: s.shift(1).rolling(10, min_periods=1).mean()
+    ).fillna(100)
+
+    # Strictly before the game date: a team's second game on the same day
+    # sees the same form as its first one
+    same_day = team_games.groupby(["TEAM", "GAME_DATE"], sort=False)
+    for col in ["LAST10_WIN_PCT", "LAST10_PTS"]:
+        team_games[col] = same_day[col].transform("first")
+
+    wide = team_games.pivot(index="GAME_IDX", columns="SIDE", values=["LAST10_WIN_PCT", "LAST10_PTS"])
+
+    return pd.DataFrame({
+        "GAME_ID": games["GAME_ID"],
+        "GAME_DATE": games["GAME_DATE"].dt.date,
+        "HOME_LAST10_WIN_PCT": wide[("LAST10_WIN_PCT", "HOME")],
+        "AWAY_LAST10_WIN_PCT": wide[("LAST10_WIN_PCT", "AWAY")],
+        "HOME_LAST10_PTS": wide[("LAST10_PTS", "HOME")],
+        "AWAY_LAST10_PTS": wide[("LAST10_PTS", "AWAY")],
+        "TARGET_WIN": (games["WINNER"] == games["HOME_TEAM"]).astype(int),
+    })
+
+
+def refresh_model(trees=TREES_PER_REFRESH, max_trees=MAX_TREES, dry_run=False):
+    print("\n🔁 Incremental refresh — Win Predictor V2\n")
+
+    if not os.path.exists(SPEC["model_path"]):
+        print("❌ No V2 model yet — run analytics/train_win_model_v2.py first.")
+        return
+
+    model, feature_cols, artifact = load_artifact("v2")
+    trained_through = artifact.get("trained_through") if isinstance(artifact, dict) else None
+
+    if not trained_through:
+        print("❌ Model artifact has no 'trained_through' date.")
+        print("   Rebuild once with build_win_training_data_v2.py + train_win_model_v2.py.")
+        return
+
+    since = pd.Timestamp(trained_through)
+    since_id = artifact.get("trained_through_id")
+    if since_id is None:
+        print("⚠️ Artifact has no 'trained_through_id' — games loaded late on or before")
+        print(f"   {trained_through} cannot be told apart; only later dates are picked up.")
+
+    conn = get_connection()
+    game_logs = pd.read_sql("""
+        SELECT GAME_ID, GAME_DATE, HOME_TEAM, AWAY_TEAM, HOME_POINTS, AWAY_POINTS, WINNER
+        FROM NBA_GAME_LOGS
+        WHERE GAME_DATE > :since - :lookback
+        ORDER BY GAME_DATE, GAME_ID
+    """, conn, params={"since": since.to_pydatetime(), "lookback": LOOKBACK_DAYS})
+    conn.close()
+
+    game_logs["GAME_DATE"] = pd.to_datetime(game_logs["GAME_DATE"])
+    features = last10_features(game_logs)
+
+    # (GAME_DATE, GAME_ID) watermark: later dates, plus games loaded after the
+    # last build (id above every trained game) but dated on or before trained_through
+    dates = pd.to_datetime(features["GAME_DATE"])
+    is_new = dates > since
+    if since_id is not None:
+        is_new |= features["GAME_ID"] > int(since_id)
+    new_rows = features[is_new]
+
+    if new_rows.empty:
+        print(f"✅ No games after {trained_through} (game id {since_id}) — model is up to date.")
+        return
+
+    print(f"📥 New games since {trained_through}: {len(new_rows)}")
+    late = int((dates[is_new] <= since).sum())
+    if late:
+        print(f"   • {late} of them loaded late with dates on or before {trained_through}")
+
+    # How did the current model do on games it has not seen?
+    before = model.predict(new_rows[feature_cols])
+    print(f"   • Accuracy on new games before refresh: {accuracy_score(new_rows['TARGET_WIN'], before):.3f}")
+
+    # -----------------------------
+    # Append to training data + grow new trees on the recent window
+    # -----------------------------
+    history = pd.read_csv(DATA_PATH) if os.path.exists(DATA_PATH) else pd.DataFrame()
+    training = pd.concat([history, new_rows], ignore_index=True)
+    # The v2 builder writes newest first — put everything oldest → newest so the
+    # window really is the most recent games and the CSV stays in one order
+    training["GAME_DATE"] = pd.to_datetime(training["GAME_DATE"])
+    order = ["GAME_DATE", "GAME_ID"] if "GAME_ID" in training.columns else ["GAME_DATE"]
+    training = training.sort_values(order, kind="mergesort").reset_index(drop=True)
+    window = training.tail(WINDOW_ROWS)
+
+    if window["TARGET_WIN"].nunique() < 2:
+        print("⚠️ Recent window only contains one outcome — skipping refresh.")
+        return
+
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + trees)
+    model.fit(window[feature_cols], window["TARGET_WIN"])
+
+    retired = max(0, len(model.estimators_) - max_trees)
+    if retired:
+        model.estimators_ = model.estimators_[retired:]
+    model.set_params(warm_start=False, n_estimators=len(model.estimators_))
+
+    version = int(artifact.get("version", 1)) + 1
+    new_through = str(max(dates.max(), since).date())
+    new_through_id = int(max(new_rows["GAME_ID"].max(), since_id or 0))
+
+    print(f"🌲 Added {trees} trees (retired {retired}) → {len(model.estimators_)} total")
+    print(f"🏷️  Artifact version {version - 1} → {version}, trained through {new_through} (game id {new_through_id})")
+
+    if dry_run:
+        print("\n🧪 Dry run — nothing saved.\n")
+        return
+
+    training.to_csv(DATA_PATH, index=False)
+    save_artifact("v2", model, feature_cols, extra={
+        "version": version,
+        "trained_through": new_through,
+        "trained_through_id": new_through_id,
+        "n_training_rows": len(training),
+    })
+
+    print(f"\n💾 Training data → {DATA_PATH}")
+    print(f"💾 Model saved to: {SPEC['model_path']}")
+    print("\n🎉 Incremental refresh complete!\n")
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Grow the V2 win model on games added since its last build")
+    parser.add_argument("--trees", type=int, default=TREES_PER_REFRESH)
+    parser.add_argument("--max-trees", type=int, default=MAX_TREES)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    refresh_model(trees=args.trees, max_trees=args.max_trees, dry_run=args.dry_run)
@@ -0,0 +1,395 @@
+import os
+import sys
+import time
+import datetime
+import argparse
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from analytics.team_name_map import normalize, CONFERENCES
+from profiling import profile_from_env
+
+SEASON_GAMES = 82
+DEFAULT_SIMS = 20000
+CHUNK_SIMS = 2500          # seasons per matrix op — keeps each chunk's draws ~10 MB
+SIMS_PER_WORKER = 10000    # at least 4 chunks per process, so the default 20k run uses 2 workers
+SEASON_START_MONTH = 7     # season N = July 1 of N-1 up to July 1 of N (offseason split)
+PROB_SOURCES = ["rating", "elo", "v2", "v3"]
+
+# Rating model: win % shrunk toward .500 by this many phantom games, then log5
+REGRESS_GAMES = 20
+
+CONFERENCE_NAMES = ["East", "West"]
+DIRECT_SEEDS = 6           # seeds 1-6 go straight to the playoffs
+PLAYIN_SEEDS = (7, 8, 9, 10)
+
+
+# =====================================
+# Season state from Oracle
+# =====================================
+def load_season_state(conn, season=None, fill=True, seed=0):
+    """
+    Standings so far (NBA_GAME_LOGS) and the remaining schedule (API `games`
+    table, unplayed dates within the season only). With `fill`, teams short
+    of 82 games get a balanced random remainder so early- or mid-season data
+    still simulates.
+    """
+    played = pd.read_sql("""
+        SELECT HOME_TEAM, AWAY_TEAM, HOME_POINTS, AWAY_POINTS, GAME_DATE, SEASON
+        FROM NBA_GAME_LOGS
+        WHERE SEASON = NVL(:season, (SELECT MAX(SEASON) FROM NBA_GAME_LOGS))
+    """, conn, params={"season": season})
+
+    season = int(played["SEASON"].max()) if not played.empty else season
+    # Features and the matchup matrix are keyed by the names as stored ("LA Clippers")
+    db_names = {normalize(raw): raw for raw in pd.concat([played["HOME_TEAM"], played["AWAY_TEAM"]]).unique()}
+    for col in ["HOME_TEAM", "AWAY_TEAM"]:
+        played[col] = played[col].map(normalize)
+
+    home_won = played["HOME_POINTS"] > played["AWAY_POINTS"]
+    winners = played["HOME_TEAM"].where(home_won, played["AWAY_TEAM"])
+    losers = played["AWAY_TEAM"].where(home_won, played["HOME_TEAM"])
+
+    teams = sorted(set(played["HOME_TEAM"]) | set(played["AWAY_TEAM"]) | set(CONFERENCES))
+    standings = pd.DataFrame({
+        "W": winners.value_counts().reindex(teams, fill_value=0),
+        "L": losers.value_counts().reindex(teams, fill_value=0),
+    })
+    standings.index.name = "TEAM"
+
+    last_played = played["GAME_DATE"].max() if not played.empty else None
+    season_start, season_end = season_dates(season)
+    try:
+        # `games` has no SEASON column (fetch_games.py), so bound it by date
+        remaining = pd.read_sql("""
+            SELECT HOME_TEAM, VISITOR_TEAM AS AWAY_TEAM, GAME_DATE
+            FROM games
+            WHERE game_date > NVL(:last_played, DATE '1900-01-01')
+              AND game_date >= :season_start AND game_date < :season_end
+              AND NVL(home_score, 0) = 0 AND NVL(visitor_score, 0) = 0
+        """, conn, params={"last_played": last_played,
+                           "season_start": season_start, "season_end": season_end})
+    except Exception:
+        # games table might not exist yet
+        remaining = pd.DataFrame(columns=["HOME_TEAM", "AWAY_TEAM", "GAME_DATE"])
+
+    for col in ["HOME_TEAM", "AWAY_TEAM"]:
+        remaining[col] = remaining[col].map(normalize)
+    remaining = remaining[remaining["HOME_TEAM"].isin(teams) & remaining["AWAY_TEAM"].isin(teams)]
+
+    if fill:
+        scheduled = standings["W"] + standings["L"]
+        scheduled = scheduled.add(remaining["HOME_TEAM"].value_counts(), fill_value=0)
+        scheduled = scheduled.add(remaining["AWAY_TEAM"].value_counts(), fill_value=0)
+        filler = fill_remaining_schedule(scheduled[scheduled.index.isin(CONFERENCES)], seed=seed)
+        remaining = pd.concat([remaining, filler], ignore_index=True)
+
+    return {"season": season, "teams": teams, "standings": standings, "db_names": db_names,
+            "played": played, "remaining": remaining.reset_index(drop=True)}
+
+
+def season_dates(season=None):
+    """[start, end) dates of a season labelled by its end year (the current one when None)."""
+    if season is None:
+        today = datetime.date.today()
+        season = today.year + (today.month >= SEASON_START_MONTH)
+    return (datetime.datetime(int(season) - 1, SEASON_START_MONTH, 1),
+            datetime.datetime(int(season), SEASON_START_MONTH, 1))
+
+
+def fill_remaining_schedule(games_scheduled, target=SEASON_GAMES, seed=0):
+    """
+    Pair teams still short of `target` games until (almost) everyone reaches it,
+    always pairing the team with the most games left against a random
+    partner and alternating home/away at random.
+    """
+    rng = np.random.default_rng(seed)
+    left = (target - games_scheduled).clip(lower=0).astype(int).to_dict()
+    games = []
+
+    while True:
+        open_teams = [t for t, n in left.items() if n > 0]
+        if len(open_teams) < 2:
+            break
+        team = max(open_teams, key=lambda t: left[t])
+        partners = [t for t in open_teams if t != team]
+        other = partners[rng.integers(len(partners))]
+        home, away = (team, other) if rng.random() < 0.5 else (other, team)
+        games.append((home, away))
+        left[team] -= 1
+        left[other] -= 1
+
+    return pd.DataFrame(games, columns=["HOME_TEAM", "AWAY_TEAM"])
+
+
+# =====================================
+# Per-game win probabilities
+# =====================================
+def rating_probabilities(state):
+    """
+    (T, T) matrix of P(home i beats away j): log5 on regressed win % plus the
+    league's observed home-court edge, all on the logit scale.
+    """
+    standings = state["standings"].reindex(state["teams"])
+    pct = (standings["W"] + REGRESS_GAMES / 2) / (standings["W"] + standings["L"] + REGRESS_GAMES)
+    strength = np.log(pct / (1 - pct)).to_numpy()
+
+    played = state["played"]
+    home_rate = (played["HOME_POINTS"] > played["AWAY_POINTS"]).mean() if len(played) else 0.55
+    home_rate = float(np.clip(home_rate, 0.40, 0.70))
+    home_edge = np.log(home_rate / (1 - home_rate))
+
+    return 1.0 / (1.0 + np.exp(-(strength[:, None] - strength[None, :] + home_edge)))
+
+
+def elo_probabilities(conn, state):
+    """(T, T) matrix from the current NBA_TEAM_ELO ratings (analytics/elo_ratings.py)."""
+    from analytics.elo_ratings import fetch_current_elo, elo_win_prob, INITIAL_ELO
+
+    elo = fetch_current_elo(conn).reindex(state["teams"]).fillna(INITIAL_ELO).to_numpy()
+    return elo_win_prob(elo[:, None], elo[None, :])
+
+
+def model_probabilities(conn, state, version):
+    """
+    (T, T) matrix from a win model: the precomputed matchup matrix first,
+    predict_matchups() for pairs it lacks, the rating model for anything
+    the model cannot score.
+    """
+    from analytics.build_matchup_matrix import MatchupMatrix
+    from analytics.predict_slate import predict_matchups
+
+    db_names = state.get("db_names", {})
+    teams = [db_names.get(team, team) for team in state["teams"]]
+    P = np.full((len(teams), len(teams)), np.nan)
+
+    try:
+        matrix = MatchupMatrix.load()
+    except FileNotFoundError:
+        matrix = None
+
+    missing = []
+    for i, home in enumerate(teams):
+        for j, away in enumerate(teams):
+            if i == j:
+                continue
+            hit = matrix.lookup(version, home, away) if matrix else None
+            if hit:
+                P[i, j] = hit["home_prob"] / 100
+            else:
+                missing.append((home, away))
+
+    if missing:
+        pairs = pd.DataFrame(missing, columns=["HOME_TEAM", "AWAY_TEAM"])
+        scored = predict_matchups(conn, pairs, versions=[version])
+        index = {team: i for i, team in enumerate(teams)}
+        if not scored.empty:
+            P[scored["HOME_TEAM"].map(index), scored["AWAY_TEAM"].map(index)] = scored["HOME_WIN_PROB"] / 100
+
+    fallback = rating_probabilities(state)
+    return np.where(np.isnan(P), fallback, P)
+
+
+def pairwise_probabilities(conn, state, source="rating"):
+    if source == "rating":
+        return rating_probabilities(state)
+    if source == "elo":
+        return elo_probabilities(conn, state)
+    if source in ("v2", "v3"):
+        return model_probabilities(conn, state, source)
+    raise ValueError(f"Unknown probability source {source!r} — expected one of {PROB_SOURCES}")
+
+
+# =====================================
+# Simulation core (numpy only)
+# =====================================
+def _simulate_chunk(seed_seq, n_sims, p_game, home_idx, away_idx, base_wins, conf_ids, P, hist_size):
+    """
+    Simulate `n_sims` seasons at once and return count arrays (small, so
+    shipping them back from a worker process is cheap).
+
+    Each remaining game is one column of a (sims, games) Bernoulli draw.
+    Win totals are then a single matrix product with the game → team
+    incidence matrix: every game adds a win to its away team, and a home
+    win moves that win from the away column to the home column.
+    """
+    rng = np.random.default_rng(seed_seq)
+    n_teams, n_games = len(base_wins), len(p_game)
+
+    delta = np.zeros((n_games, n_teams), dtype=np.float32)
+    delta[np.arange(n_games), home_idx] += 1
+    delta[np.arange(n_games), away_idx] -= 1
+    away_wins = base_wins + np.bincount(away_idx, minlength=n_teams)
+
+    home_win = rng.random((n_sims, n_games), dtype=np.float32) < p_game.astype(np.float32)
+    wins = away_wins + np.rint(home_win.astype(np.float32) @ delta).astype(np.int64)
+
+    # Seeds per conference; ties broken at random
+    seeds = np.zeros((n_sims, n_teams), dtype=np.int64)
+    playoff = np.zeros((n_sims, n_teams), dtype=bool)
+    sims = np.arange(n_sims)
+
+    for c in range(len(CONFERENCE_NAMES)):
+        members = np.flatnonzero(conf_ids == c)
+        if len(members) < max(PLAYIN_SEEDS):
+            continue
+        key = wins[:, members] + rng.random((n_sims, len(members)))
+        order = members[np.argsort(-key, axis=1)]          # team ids by seed
+        seeds[sims[:, None], order] = np.arange(1, len(members) + 1)
+        playoff[sims[:, None], order[:, :DIRECT_SEEDS]] = True
+
+        # Play-in: 7 hosts 8 (winner is the 7 seed), 9 hosts 10,
+        # loser of 7/8 hosts winner of 9/10 for the 8 seed
+        s7, s8, s9, s10 = (order[:, s - 1] for s in PLAYIN_SEEDS)
+        w78 = rng.random(n_sims) < P[s7, s8]
+        win78, lose78 = np.where(w78, s7, s8), np.where(w78, s8, s7)
+        win910 = np.where(rng.random(n_sims) < P[s9, s10], s9, s10)
+        eighth = np.where(rng.random(n_sims) < P[lose78, win910], lose78, win910)
+        playoff[sims, win78] = True
+        playoff[sims, eighth] = True
+
+    team_ids = np.arange(n_teams)
+    win_hist = np.bincount((team_ids * hist_size + wins).ravel(),
+                           minlength=n_teams * hist_size).reshape(n_teams, hist_size)
+    seed_counts = np.bincount((team_ids * 16 + seeds).ravel(),
+                              minlength=n_teams * 16).reshape(n_teams, 16)
+
+    return {
+        "win_hist": win_hist,
+        "seed_counts": seed_counts,
+        "playoff": playoff.sum(axis=0),
+        "playin": ((seeds >= PLAYIN_SEEDS[0]) & (seeds <= PLAYIN_SEEDS[-1])).sum(axis=0),
+        "n": n_sims,
+    }
+
+
+def simulate_seasons(P, home_idx, away_idx, base_wins, conf_ids, n_sims=DEFAULT_SIMS,
+                     workers=None, seed=None):
+    """
+    Run `n_sims` season simulations in CHUNK_SIMS blocks spread over a
+    process pool. Each chunk gets an independent stream spawned from one
+    SeedSequence, so results are reproducible for a fixed seed and worker
+    count does not change them. By default the pool gets one worker per
+    SIMS_PER_WORKER simulations, up to the number of cores.
+    """
+    home_idx = np.asarray(home_idx, dtype=np.int64)
+    away_idx = np.asarray(away_idx, dtype=np.int64)
+    base_wins = np.asarray(base_wins, dtype=np.int64)
+    p_game = P[home_idx, away_idx] if len(home_idx) else np.zeros(0)
+
+    remaining = np.bincount(home_idx, minlength=len(base_wins)) + np.bincount(away_idx, minlength=len(base_wins))
+    hist_size = int((base_wins + remaining).max()) + 1
+
+    sizes = [min(CHUNK_SIMS, n_sims - start) for start in range(0, n_sims, CHUNK_SIMS)]
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(s, n, p_game, home_idx, away_idx, base_wins, conf_ids, P, hist_size)
+            for s, n in zip(streams, sizes)]
+
+    if workers is None:
+        workers = min(n_sims // SIMS_PER_WORKER, os.cpu_count() or 1)
+    workers = min(workers, len(sizes))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        parts = [_simulate_chunk(*a) for a in args]
+
+    return {key: sum(part[key] for part in parts) for key in parts[0]}
+
+
+# =====================================
+# End-to-end run
+# =====================================
+def run_simulation(season=None, source="rating", n_sims=DEFAULT_SIMS, workers=None,
+                   seed=None, fill=True, conn=None):
+    """
+    Returns {"summary", "win_dist", "seed_probs", "season", "games_remaining"}:
+    per-team odds, P(final wins = k) and P(seed = s) as DataFrames.
+    """
+    own_conn = conn is None
+    conn = conn or get_connection()
+    state = load_season_state(conn, season, fill=fill, seed=seed or 0)
+    P = pairwise_probabilities(conn, state, source)
+    if own_conn:
+        conn.close()
+
+    teams = state["teams"]
+    index = {team: i for i, team in enumerate(teams)}
+    standings = state["standings"].reindex(teams)
+    remaining = state["remaining"]
+    conf_ids = np.array([CONFERENCE_NAMES.index(CONFERENCES[t]) if t in CONFERENCES else -1 for t in teams])
+
+    counts = simulate_seasons(
+        P,
+        remaining["HOME_TEAM"].map(index).to_numpy(),
+        remaining["AWAY_TEAM"].map(index).to_numpy(),
+        standings["W"].to_numpy(),
+        conf_ids,
+        n_sims=n_sims, workers=workers, seed=seed,
+    )
+
+    n = counts["n"]
+    win_dist = pd.DataFrame(counts["win_hist"] / n, index=teams)
+    win_dist.index.name = "TEAM"
+    seed_probs = pd.DataFrame(counts["seed_counts"][:, 1:] / n, index=teams, columns=range(1, 16))
+    seed_probs.index.name = "TEAM"
+
+    cdf = win_dist.cumsum(axis=1).to_numpy()
+    wins_axis = np.arange(win_dist.shape[1])
+    summary = pd.DataFrame({
+        "CONFERENCE": [CONFERENCES.get(t) for t in teams],
+        "W": standings["W"].to_numpy(),
+        "L": standings["L"].to_numpy(),
+        "REMAINING": np.bincount(remaining["HOME_TEAM"].map(index), minlength=len(teams))
+                     + np.bincount(remaining["AWAY_TEAM"].map(index), minlength=len(teams)),
+        "MEAN_WINS": (win_dist.to_numpy() * wins_axis).sum(axis=1).round(1),
+        "WINS_P10": (cdf < 0.10).sum(axis=1),
+        "WINS_P90": (cdf < 0.90).sum(axis=1),
+        "TOP_SEED_PCT": (seed_probs[1] * 100).round(1).to_numpy(),
+        "TOP6_PCT": (seed_probs.loc[:, 1:DIRECT_SEEDS].sum(axis=1) * 100).round(1).to_numpy(),
+        "PLAYIN_PCT": (counts["playin"] / n * 100).round(1),
+        "PLAYOFF_PCT": (counts["playoff"] / n * 100).round(1),
+    }, index=pd.Index(teams, name="TEAM"))
+
+    # Only teams in the current league alignment are seeded
+    summary = summary[summary["CONFERENCE"].notna()].sort_values(
+        ["CONFERENCE", "MEAN_WINS"], ascending=[True, False]
+    )
+
+    return {
+        "summary": summary,
+        "win_dist": win_dist.loc[summary.index],
+        "seed_probs": seed_probs.loc[summary.index],
+        "season": state["season"],
+        "games_remaining": len(remaining),
+    }
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of the rest of the season")
+    parser.add_argument("--season", type=int, help="season end year (default: latest in NBA_GAME_LOGS)")
+    parser.add_argument("--source", choices=PROB_SOURCES, default="rating",
+                        help="where per-game win probabilities come from")
+    parser.add_argument("--sims", type=int, default=DEFAULT_SIMS)
+    parser.add_argument("--workers", type=int, help=f"process pool size (default: one per {SIMS_PER_WORKER:,} sims, up to all cores)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--no-fill", action="store_true",
+                        help="only simulate games present in the schedule table")
+    args = parser.parse_args()
+
+    print(f"\n🎲 Simulating {args.sims:,} seasons ({args.source} probabilities)\n")
+    start = time.perf_counter()
+    result = run_simulation(args.season, args.source, args.sims, args.workers, args.seed, fill=not args.no_fill)
+    elapsed = time.perf_counter() - start
+
+    print(f"📅 Season {result['season']} | {result['games_remaining']} games remaining\n")
+    for conf, table in result["summary"].groupby("CONFERENCE"):
+        print(f"🏀 {conf}")
+        print(table.drop(columns="CONFERENCE").to_string())
+        print()
+
+    print(f"⏱️ Done in {elapsed:.2f}s")
@@ -0,0 +1,229 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import lsqr
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from etl_scripts.db_utils import create_table_if_missing
+from profiling import profile_from_env
+
+SRS_DDL = """
+    CREATE TABLE NBA_TEAM_SRS (
+        SEASON          NUMBER        NOT NULL,
+        TEAM_NAME       VARCHAR2(100) NOT NULL,
+        GAMES           NUMBER,
+        MOV             NUMBER,
+        SOS             NUMBER,
+        SRS             NUMBER,
+        HOME_EDGE       NUMBER,
+        SOURCE_GAMES    NUMBER,
+        SOURCE_MAX_ID   NUMBER,
+        UPDATED_AT      TIMESTAMP DEFAULT SYSTIMESTAMP,
+        CONSTRAINT NBA_TEAM_SRS_PK PRIMARY KEY (SEASON, TEAM_NAME)
+    )
+"""
+
+
+def solve_srs(games):
+    """
+    Margin-adjusted ratings for one season.
+
+    Each game is a row of a sparse (games x teams+1) design matrix:
+    +1 for the home team, -1 for the away team and 1 in the last column
+    for home-court edge, with the home margin as the target. One extra
+    row pins the ratings to sum to zero so the system has a unique
+    solution. lsqr solves it directly on the sparse matrix.
+
+    Returns (DataFrame indexed by TEAM_NAME with GAMES, MOV, SOS, SRS; home edge).
+    """
+    teams = sorted(set(games["HOME_TEAM"]) | set(games["AWAY_TEAM"]))
+    index = {team: i for i, team in enumerate(teams)}
+    n_games, n_teams = len(games), len(teams)
+
+    home = games["HOME_TEAM"].map(index).to_numpy()
+    away = games["AWAY_TEAM"].map(index).to_numpy()
+    margin = (games["HOME_POINTS"] - games["AWAY_POINTS"]).to_numpy(dtype=float)
+
+    g = np.arange(n_games)
+    rows = np.concatenate([g, g, g, np.full(n_teams, n_games)])
+    cols = np.concatenate([home, away, np.full(n_games, n_teams), np.arange(n_teams)])
+    vals = np.concatenate([np.ones(n_games), -np.ones(n_games), np.ones(n_games), np.ones(n_teams)])
+
+    A = csr_matrix((vals, (rows, cols)), shape=(n_games + 1, n_teams + 1))
+    b = np.append(margin, 0.0)
+
+    solution = lsqr(A, b, atol=1e-10, btol=1e-10)[0]
+    srs, home_edge = solution[:n_teams], solution[n_teams]
+
+    # Average margin and average opponent rating, per team
+    played = np.bincount(home, minlength=n_teams) + np.bincount(away, minlength=n_teams)
+    margin_sum = np.bincount(home, margin, n_teams) - np.bincount(away, margin, n_teams)
+    opp_sum = np.bincount(home, srs[away], n_teams) + np.bincount(away, srs[home], n_teams)
+
+    ratings = pd.DataFrame({
+        "GAMES": played,
+        "MOV": margin_sum / played,
+        "SOS": opp_sum / played,
+        "SRS": srs,
+    }, index=pd.Index(teams, name="TEAM_NAME"))
+    return ratings, float(home_edge)
+
+
+def pregame_srs(games):
+    """
+    For training builders: each team's SRS solved only on its season's games
+    from EARLIER dates (no leakage — same-day games do not see each other).
+    Returns HOME_SRS and AWAY_SRS aligned with `games`; a team that has not
+    played yet is 0, the league average.
+
+    Same least-squares system as solve_srs, but the (teams+1)^2 normal
+    equations are accumulated date by date, so each date costs one small
+    dense solve instead of a sparse solve over the whole season so far.
+    """
+    out = pd.DataFrame({"HOME_SRS": 0.0, "AWAY_SRS": 0.0}, index=games.index)
+
+    for _, season_games in games.groupby("SEASON"):
+        season_games = season_games.sort_values("GAME_DATE", kind="mergesort")
+        teams = sorted(set(season_games["HOME_TEAM"]) | set(season_games["AWAY_TEAM"]))
+        index = {team: i for i, team in enumerate(teams)}
+        n_teams = len(teams)
+
+        home = season_games["HOME_TEAM"].map(index).to_numpy()
+        away = season_games["AWAY_TEAM"].map(index).to_numpy()
+        margin = (season_games["HOME_POINTS"] - season_games["AWAY_POINTS"]).to_numpy(dtype=float)
+
+        # Design-matrix rows of solve_srs, plus its sum-to-zero pin in the normal matrix
+        rows = np.zeros((len(season_games), n_teams + 1))
+        rows[np.arange(len(rows)), home] = 1.0
+        rows[np.arange(len(rows)), away] = -1.0
+        rows[:, n_teams] = 1.0
+        pin = np.append(np.ones(n_teams), 0.0)
+        normal, target = np.outer(pin, pin), np.zeros(n_teams + 1)
+
+        dates = season_games["GAME_DATE"].to_numpy()
+        bounds = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1], True])
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if start > 0:
+                srs = np.linalg.lstsq(normal, target, rcond=None)[0][:n_teams]
+                day = season_games.index[start:end]
+                out.loc[day, "HOME_SRS"] = srs[home[start:end]]
+                out.loc[day, "AWAY_SRS"] = srs[away[start:end]]
+            normal += rows[start:end].T @ rows[start:end]
+            target += rows[start:end].T @ margin[start:end]
+
+    return out
+
+
+def ensure_table(cursor):
+    create_table_if_missing(cursor, SRS_DDL)
+
+
+def changed_seasons(conn):
+    """
+    Seasons whose games differ from what the stored ratings were solved on,
+    compared by (game count, max GAME_ID) — only those get re-solved.
+    """
+    source = pd.read_sql("""
+        SELECT SEASON, COUNT(*) AS SOURCE_GAMES, MAX(GAME_ID) AS SOURCE_MAX_ID
+        FROM NBA_GAME_LOGS
+        WHERE HOME_POINTS IS NOT NULL AND AWAY_POINTS IS NOT NULL
+        GROUP BY SEASON
+    """, conn)
+    stored = pd.read_sql("""
+        SELECT SEASON, MAX(SOURCE_GAMES) AS SOURCE_GAMES, MAX(SOURCE_MAX_ID) AS SOURCE_MAX_ID
+        FROM NBA_TEAM_SRS
+        GROUP BY SEASON
+    """, conn)
+
+    merged = source.merge(stored, on="SEASON", how="left", suffixes=("", "_STORED"))
+    stale = (
+        (merged["SOURCE_GAMES"] != merged["SOURCE_GAMES_STORED"])
+        | (merged["SOURCE_MAX_ID"] != merged["SOURCE_MAX_ID_STORED"])
+    )
+    return merged.loc[stale, ["SEASON", "SOURCE_GAMES", "SOURCE_MAX_ID"]]
+
+
+def save_season(cursor, season, ratings, home_edge, source_games, source_max_id):
+    cursor.execute("DELETE FROM NBA_TEAM_SRS WHERE SEASON = :1", [season])
+    cursor.executemany("""
+        INSERT INTO NBA_TEAM_SRS
+        (SEASON, TEAM_NAME, GAMES, MOV, SOS, SRS, HOME_EDGE, SOURCE_GAMES, SOURCE_MAX_ID)
+        VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9)
+    """, [
+        [season, team, int(r.GAMES), round(r.MOV, 3), round(r.SOS, 3), round(r.SRS, 3),
+         round(home_edge, 3), source_games, source_max_id]
+        for team, r in ratings.iterrows()
+    ])
+
+
+def update_srs(rebuild=False):
+    print("\n📐 Updating SRS ratings\n")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    ensure_table(cursor)
+
+    if rebuild:
+        cursor.execute("DELETE FROM NBA_TEAM_SRS")
+
+    todo = changed_seasons(conn)
+    if todo.empty:
+        print("✅ All seasons up to date.")
+        cursor.close()
+        conn.close()
+        return
+
+    seasons = [int(s) for s in todo["SEASON"]]
+    print(f"🔄 Seasons to solve: {', '.join(map(str, seasons))}")
+
+    # One read for every changed season
+    games = pd.read_sql(f"""
+        SELECT SEASON, HOME_TEAM, AWAY_TEAM, HOME_POINTS, AWAY_POINTS
+        FROM NBA_GAME_LOGS
+        WHERE HOME_POINTS IS NOT NULL AND AWAY_POINTS IS NOT NULL
+          AND SEASON IN ({", ".join(f":{i + 1}" for i in range(len(seasons)))})
+    """, conn, params=seasons)
+
+    solve_time = 0.0
+    for row in todo.itertuples(index=False):
+        season_games = games[games["SEASON"] == row.SEASON]
+        start = time.perf_counter()
+        ratings, home_edge = solve_srs(season_games)
+        solve_time += time.perf_counter() - start
+
+        save_season(cursor, int(row.SEASON), ratings, home_edge,
+                    int(row.SOURCE_GAMES), int(row.SOURCE_MAX_ID))
+        best = ratings["SRS"].idxmax()
+        print(f"   • {int(row.SEASON)}: {len(ratings)} teams | home edge {home_edge:+.2f} | "
+              f"best {best} ({ratings.loc[best, 'SRS']:+.2f})")
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    print(f"\n⏱️ Solved {len(seasons)} season(s) in {solve_time * 1000:.1f} ms")
+    print("🎉 NBA_TEAM_SRS updated!\n")
+
+
+def fetch_srs(conn, season=None):
+    """SRS / MOV / SOS for one season (default: latest), indexed by TEAM_NAME."""
+    df = pd.read_sql("""
+        SELECT TEAM_NAME, SEASON, GAMES, MOV, SOS, SRS
+        FROM NBA_TEAM_SRS
+        WHERE SEASON = NVL(:season, (SELECT MAX(SEASON) FROM NBA_TEAM_SRS))
+    """, conn, params={"season": season})
+    return df.set_index("TEAM_NAME")
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Sparse least-squares SRS ratings per season")
+    parser.add_argument("--rebuild", action="store_true", help="re-solve every season")
+    args = parser.parse_args()
+
+    update_srs(rebuild=args.rebuild)
@@ -0,0 +1,222 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_connection
+from analytics.team_name_map import conference
+from analytics.streaks import run_length_streaks
+from etl_scripts.db_utils import create_table_if_missing
+from profiling import profile_from_env
+
+STANDINGS_DDL = """
+    CREATE TABLE NBA_STANDINGS_DAILY (
+        SEASON         NUMBER        NOT NULL,
+        SNAPSHOT_DATE  DATE          NOT NULL,
+        TEAM_NAME      VARCHAR2(100) NOT NULL,
+        CONFERENCE     VARCHAR2(10),
+        WINS           NUMBER,
+        LOSSES         NUMBER,
+        WIN_PCT        NUMBER,
+        GAMES_BACK     NUMBER,
+        CONF_RANK      NUMBER,
+        STREAK         NUMBER,
+        CONSTRAINT NBA_STANDINGS_DAILY_PK PRIMARY KEY (SEASON, SNAPSHOT_DATE, TEAM_NAME)
+    )
+"""
+
+
+# =====================================
+# Vectorized snapshot builder
+# =====================================
+def team_results(games):
+    """One row per team per game: TEAM_NAME, GAME_DATE, GAME_ID, WIN (1/0)."""
+    home_won = (games["HOME_POINTS"] > games["AWAY_POINTS"]).astype(int)
+    long = pd.concat([
+        pd.DataFrame({"TEAM_NAME": games["HOME_TEAM"], "GAME_DATE": games["GAME_DATE"],
+                      "GAME_ID": games["GAME_ID"], "WIN": home_won}),
+        pd.DataFrame({"TEAM_NAME": games["AWAY_TEAM"], "GAME_DATE": games["GAME_DATE"],
+                      "GAME_ID": games["GAME_ID"], "WIN": 1 - home_won}),
+    ], ignore_index=True)
+    return long.sort_values(["TEAM_NAME", "GAME_DATE", "GAME_ID"], kind="mergesort").reset_index(drop=True)
+
+
+def build_snapshots(games, base=None):
+    """
+    League table after every game date in `games` (one season).
+
+    Daily W/L counts are pivoted to a (dates x teams) grid and cumsum'd, so
+    the whole season is a handful of array ops. `base` (the last stored
+    snapshot, indexed by TEAM_NAME with WINS / LOSSES / STREAK) lets an
+    incremental run continue from where the table stopped.
+    """
+    results = team_results(games)
+    prior = results["TEAM_NAME"].map(base["STREAK"]).fillna(0).to_numpy() if base is not None else None
+    results["STREAK"] = run_length_streaks(results["TEAM_NAME"].to_numpy(), results["WIN"].to_numpy(), prior)
+
+    teams = sorted(set(results["TEAM_NAME"]) | (set(base.index) if base is not None else set()))
+    dates = np.sort(results["GAME_DATE"].unique())
+
+    daily = results.pivot_table(index="GAME_DATE", columns="TEAM_NAME", values="WIN",
+                                aggfunc=["sum", "count"], fill_value=0)
+    wins = daily["sum"].reindex(index=dates, columns=teams, fill_value=0).cumsum()
+    games_played = daily["count"].reindex(index=dates, columns=teams, fill_value=0).cumsum()
+    losses = games_played - wins
+
+    if base is not None:
+        wins = wins + base["WINS"].reindex(teams).fillna(0).to_numpy()
+        losses = losses + base["LOSSES"].reindex(teams).fillna(0).to_numpy()
+
+    last_streak = results.groupby(["GAME_DATE", "TEAM_NAME"])["STREAK"].last().unstack()
+    streak = last_streak.reindex(index=dates, columns=teams)
+    if base is not None:
+        streak.iloc[0] = streak.iloc[0].fillna(base["STREAK"].reindex(teams))
+    streak = streak.ffill().fillna(0)
+
+    snap = pd.DataFrame({
+        "SNAPSHOT_DATE": np.repeat(dates, len(teams)),
+        "TEAM_NAME": np.tile(teams, len(dates)),
+        "WINS": wins.to_numpy().ravel(),
+        "LOSSES": losses.to_numpy().ravel(),
+        "STREAK": streak.to_numpy().ravel(),
+    })
+    snap["CONFERENCE"] = snap["TEAM_NAME"].map(lambda t: conference(t) or "League")
+
+    played = snap["WINS"] + snap["LOSSES"]
+    snap["WIN_PCT"] = np.where(played > 0, snap["WINS"] / played.where(played > 0, 1), 0.0).round(3)
+
+    # Games back of the conference leader, per date
+    diff = snap["WINS"] - snap["LOSSES"]
+    leader = diff.groupby([snap["SNAPSHOT_DATE"], snap["CONFERENCE"]]).transform("max")
+    snap["GAMES_BACK"] = (leader - diff) / 2
+    snap["CONF_RANK"] = (
+        snap.groupby(["SNAPSHOT_DATE", "CONFERENCE"])["WIN_PCT"]
+        .rank(ascending=False, method="min").astype(int)
+    )
+    return snap
+
+
+# =====================================
+# Incremental refresh
+# =====================================
+def ensure_table(cursor):
+    create_table_if_missing(cursor, STANDINGS_DDL)
+
+
+def load_last_snapshot(conn, season):
+    df = pd.read_sql("""
+        SELECT TEAM_NAME, SNAPSHOT_DATE, WINS, LOSSES, STREAK
+        FROM NBA_STANDINGS_DAILY
+        WHERE SEASON = :season
+          AND SNAPSHOT_DATE = (SELECT MAX(SNAPSHOT_DATE) FROM NBA_STANDINGS_DAILY WHERE SEASON = :season)
+    """, conn, params={"season": season})
+    return df.set_index("TEAM_NAME") if not df.empty else None
+
+
+def save_snapshots(cursor, season, snap):
+    cursor.executemany("""
+        INSERT INTO NBA_STANDINGS_DAILY
+        (SEASON, SNAPSHOT_DATE, TEAM_NAME, CONFERENCE, WINS, LOSSES,
+         WIN_PCT, GAMES_BACK, CONF_RANK, STREAK)
+        VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9, :10)
+    """, [
+        [season, pd.Timestamp(r.SNAPSHOT_DATE).to_pydatetime(), r.TEAM_NAME, r.CONFERENCE,
+         int(r.WINS), int(r.LOSSES), float(r.WIN_PCT), float(r.GAMES_BACK),
+         int(r.CONF_RANK), int(r.STREAK)]
+        for r in snap.itertuples(index=False)
+    ])
+    return len(snap)
+
+
+def refresh_season(conn, cursor, season, rebuild=False):
+    """
+    Append snapshots for dates after the season's last stored one. If games
+    were loaded behind that date (stored totals no longer add up), the
+    season is rebuilt instead.
+    """
+    games = pd.read_sql("""
+        SELECT GAME_ID, GAME_DATE, HOME_TEAM, AWAY_TEAM, HOME_POINTS, AWAY_POINTS
+        FROM NBA_GAME_LOGS
+        WHERE SEASON = :season
+          AND HOME_POINTS IS NOT NULL AND AWAY_POINTS IS NOT NULL
+    """, conn, params={"season": season})
+    if games.empty:
+        return 0
+
+    base = None if rebuild else load_last_snapshot(conn, season)
+    if base is not None:
+        cutoff = base["SNAPSHOT_DATE"].iloc[0]
+        stored_games = int((base["WINS"] + base["LOSSES"]).sum()) // 2
+        if stored_games != int((games["GAME_DATE"] <= cutoff).sum()):
+            print(f"   ⚠️ {season}: games were backfilled — rebuilding the season")
+            base = None
+        else:
+            games = games[games["GAME_DATE"] > cutoff]
+            if games.empty:
+                return 0
+
+    if base is None:
+        cursor.execute("DELETE FROM NBA_STANDINGS_DAILY WHERE SEASON = :1", [season])
+
+    snap = build_snapshots(games, base)
+    return save_snapshots(cursor, season, snap)
+
+
+def update_standings(seasons=None, rebuild=False):
+    print("\n📅 Updating daily standings snapshots\n")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    ensure_table(cursor)
+
+    if seasons is None:
+        seasons = pd.read_sql("SELECT DISTINCT SEASON FROM NBA_GAME_LOGS ORDER BY SEASON", conn)["SEASON"]
+
+    for season in seasons:
+        written = refresh_season(conn, cursor, int(season), rebuild)
+        if written:
+            print(f"   • {int(season)}: {written} snapshot rows")
+        conn.commit()
+
+    cursor.close()
+    conn.close()
+    print("\n🎉 NBA_STANDINGS_DAILY up to date!\n")
+
+
+# =====================================
+# Reader
+# =====================================
+def standings_as_of(conn, season, as_of):
+    """
+    League table as of the end of `as_of` — one lookup of the latest
+    snapshot on or before that date; nothing is re-aggregated.
+    """
+    return pd.read_sql("""
+        SELECT TEAM_NAME, CONFERENCE, CONF_RANK, WINS, LOSSES, WIN_PCT,
+               GAMES_BACK, STREAK, SNAPSHOT_DATE
+        FROM NBA_STANDINGS_DAILY
+        WHERE SEASON = :season
+          AND SNAPSHOT_DATE = (
+              SELECT MAX(SNAPSHOT_DATE) FROM NBA_STANDINGS_DAILY
+              WHERE SEASON = :season AND SNAPSHOT_DATE < :as_of + 1
+          )
+        ORDER BY CONFERENCE, CONF_RANK, TEAM_NAME
+    """, conn, params={"season": season, "as_of": as_of})
+
+
+def format_streak(streak):
+    """+3 → 'W3', -2 → 'L2'"""
+    streak = int(streak)
+    return f"W{streak}" if streak > 0 else f"L{-streak}" if streak < 0 else "-"
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Build per-day standings snapshots from NBA_GAME_LOGS")
+    parser.add_argument("--season", type=int, action="append", help="only these seasons (repeatable)")
+    parser.add_argument("--rebuild", action="store_true", help="recompute the seasons from scratch")
+    args = parser.parse_args()
+
+    update_standings(args.season, rebuild=args.rebuild)
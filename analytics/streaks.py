@@ -0,0 +1,149 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from profiling import profile_from_env
+
+
+def run_length_streaks(group, win, prior=None):
+    """
+    Signed streak AFTER each game (+3 = won three straight, -2 = lost two).
+
+    `group` / `win` are aligned arrays already sorted so each group's games
+    are contiguous and in play order. A new run starts whenever the group
+    or the result changes; the streak is the position inside the run —
+    one cumsum, no per-row Python. `prior` (array of signed streaks, one per
+    row, read only on each group's first run) continues runs from before
+    the first row.
+    """
+    group = np.asarray(group)
+    sign = np.where(np.asarray(win) == 1, 1, -1)
+    n = len(sign)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = group[1:] != group[:-1]
+    new_run = new_group.copy()
+    new_run[1:] |= sign[1:] != sign[:-1]
+
+    # Position within run: index minus the index where the run started
+    idx = np.arange(n)
+    run_start = np.maximum.accumulate(np.where(new_run, idx, 0))
+    length = idx - run_start + 1
+
+    if prior is not None:
+        prior = np.asarray(prior, dtype=np.int64)
+        group_start = np.maximum.accumulate(np.where(new_group, idx, 0))
+        # Rows still in their group's first run, continuing a same-signed streak
+        first_run = run_start == group_start
+        extend = first_run & (np.sign(prior) == sign)
+        length = length + np.where(extend, np.abs(prior), 0)
+
+    return sign * length
+
+
+def team_games(games):
+    """
+    Long frame, one row per team per game, sorted by (SEASON, TEAM, date,
+    GAME_ID). SIDE says which column of `games` the row came from.
+    """
+    home_won = (games["HOME_POINTS"] > games["AWAY_POINTS"]).astype(int).to_numpy()
+    n = len(games)
+    long = pd.DataFrame({
+        "ROW": np.tile(np.arange(n), 2),
+        "SIDE": np.repeat(["HOME", "AWAY"], n),
+        "SEASON": np.tile(games["SEASON"].to_numpy(), 2),
+        "TEAM": np.concatenate([games["HOME_TEAM"].to_numpy(), games["AWAY_TEAM"].to_numpy()]),
+        "GAME_DATE": np.tile(games["GAME_DATE"].to_numpy(), 2),
+        "ORDER": np.tile(games["GAME_ID"].to_numpy() if "GAME_ID" in games else np.arange(n), 2),
+        "WIN": np.concatenate([home_won, 1 - home_won]),
+    })
+    return long.sort_values(["SEASON", "TEAM", "GAME_DATE", "ORDER"], kind="mergesort").reset_index(drop=True)
+
+
+def pregame_streaks(games):
+    """
+    HOME_STREAK / AWAY_STREAK going INTO each game: the signed streak after
+    the team's previous game of the same season, 0 for its first game.
+    Returns a frame aligned with `games`.
+    """
+    long = team_games(games)
+    key = long["SEASON"].astype(str) + "|" + long["TEAM"].astype(str)
+    post = run_length_streaks(key.to_numpy(), long["WIN"].to_numpy())
+
+    # Shift by one inside each team-season: the pre-game streak is the previous post-game one
+    first = np.ones(len(long), dtype=bool)
+    first[1:] = key.to_numpy()[1:] != key.to_numpy()[:-1]
+    pre = np.where(first, 0, np.roll(post, 1))
+
+    out = pd.DataFrame(index=games.index, columns=["HOME_STREAK", "AWAY_STREAK"], dtype="int64")
+    for side in ("HOME", "AWAY"):
+        mask = (long["SIDE"] == side).to_numpy()
+        col = np.empty(len(games), dtype=np.int64)
+        col[long["ROW"].to_numpy()[mask]] = pre[mask]
+        out[f"{side}_STREAK"] = col
+    return out
+
+
+def refresh_streaks(conn, seasons=None):
+    """
+    Recompute HOME_STREAK / AWAY_STREAK in NBA_GAME_LOGS for `seasons`
+    (default: all) and write back only the rows whose values changed.
+    """
+    params = {}
+    where = "WHERE HOME_POINTS IS NOT NULL AND AWAY_POINTS IS NOT NULL"
+    if seasons:
+        seasons = [int(s) for s in seasons]
+        where += f" AND SEASON IN ({', '.join(f':s{i}' for i in range(len(seasons)))})"
+        params = {f"s{i}": s for i, s in enumerate(seasons)}
+
+    games = pd.read_sql(f"""
+        SELECT GAME_ID, SEASON, GAME_DATE, HOME_TEAM, AWAY_TEAM,
+               HOME_POINTS, AWAY_POINTS, HOME_STREAK, AWAY_STREAK
+        FROM NBA_GAME_LOGS
+        {where}
+    """, conn, params=params)
+    if games.empty:
+        return 0
+
+    streaks = pregame_streaks(games)
+    changed = (
+        (games["HOME_STREAK"].fillna(-999) != streaks["HOME_STREAK"])
+        | (games["AWAY_STREAK"].fillna(-999) != streaks["AWAY_STREAK"])
+    )
+
+    batch = np.column_stack([
+        streaks.loc[changed, "HOME_STREAK"].to_numpy(),
+        streaks.loc[changed, "AWAY_STREAK"].to_numpy(),
+        games.loc[changed, "GAME_ID"].to_numpy(),
+    ]).tolist()
+
+    if batch:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            UPDATE NBA_GAME_LOGS
+            SET HOME_STREAK = :1, AWAY_STREAK = :2
+            WHERE GAME_ID = :3
+        """, batch)
+        conn.commit()
+        cursor.close()
+    return len(batch)
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Recompute real pre-game streaks in NBA_GAME_LOGS")
+    parser.add_argument("--season", type=int, action="append", help="only these seasons (repeatable)")
+    args = parser.parse_args()
+
+    # Imported here so the pure helpers above work without an Oracle client
+    from config import get_connection
+
+    conn = get_connection()
+    updated = refresh_streaks(conn, args.season)
+    conn.close()
+    print(f"✅ Streaks refreshed — {updated} games updated.")
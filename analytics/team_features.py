@@ -0,0 +1,100 @@
+import datetime
+import pandas as pd
+
+# Same neutral fallbacks as build_win_training_data_v2.py / _v3.py
+DEFAULT_LAST10_WIN_PCT = 0.50
+DEFAULT_LAST10_PTS = 100.0
+DEFAULT_PPG = 15.0
+
+FAR_FUTURE = datetime.datetime(9999, 12, 31)
+
+
+def fetch_last10_form(conn, as_of=None):
+    """
+    Last-10-game win % and points for every team in ONE query,
+    using only games played strictly before `as_of` (default: all games).
+    Returns a frame indexed by TEAM with LAST10_WIN_PCT, LAST10_PTS, GAMES.
+    """
+    df = pd.read_sql("""
+        SELECT TEAM,
+               AVG(WIN) AS LAST10_WIN_PCT,
+               AVG(PTS) AS LAST10_PTS,
+               COUNT(*) AS GAMES
+        FROM (
+            SELECT TEAM, PTS, WIN,
+                   ROW_NUMBER() OVER (PARTITION BY TEAM ORDER BY GAME_DATE DESC) AS RN
+            FROM (
+                SELECT HOME_TEAM AS TEAM, HOME_POINTS AS PTS, GAME_DATE,
+                       CASE WHEN HOME_POINTS > AWAY_POINTS THEN 1 ELSE 0 END AS WIN
+                FROM NBA_GAME_LOGS
+                WHERE GAME_DATE < :as_of
+                UNION ALL
+                SELECT AWAY_TEAM AS TEAM, AWAY_POINTS AS PTS, GAME_DATE,
+                       CASE WHEN AWAY_POINTS > HOME_POINTS THEN 1 ELSE 0 END AS WIN
+                FROM NBA_GAME_LOGS
+                WHERE GAME_DATE < :as_of
+            )
+        )
+        WHERE RN <= 10
+        GROUP BY TEAM
+    """, conn, params={"as_of": as_of or FAR_FUTURE})
+
+    return df.set_index("TEAM")
+
+
+def fetch_season_features(conn, season=None):
+    """
+    Season win % / points (NBA_TEAM_STATS) plus live player PPG for every
+    team in ONE query — the inputs of the V3 model.
+    Returns a frame indexed by TEAM with WIN_PCT, SEASON_PTS, PPG.
+    """
+    df = pd.read_sql("""
+        SELECT t.TEAM_NAME AS TEAM,
+               AVG(t.WIN_PCT) AS WIN_PCT,
+               AVG(t.POINTS)  AS SEASON_PTS,
+               MAX(p.PPG)     AS PPG
+        FROM NBA_TEAM_STATS t
+        LEFT JOIN (
+            SELECT TEAM_NAME, AVG(POINTS) AS PPG
+            FROM NBA_PLAYER_LIVE_STATS
+            GROUP BY TEAM_NAME
+        ) p ON p.TEAM_NAME = t.TEAM_NAME
+        WHERE t.SEASON = NVL(:season, (SELECT MAX(SEASON) FROM NBA_TEAM_STATS))
+        GROUP BY t.TEAM_NAME
+    """, conn, params={"season": season})
+
+    df = df.set_index("TEAM")
+    df["PPG"] = df["PPG"].fillna(DEFAULT_PPG)
+    return df
+
+
+def build_matchup_features(matchups, version, last10=None, season=None):
+    """
+    Turn a frame of HOME_TEAM / AWAY_TEAM pairs into model inputs for
+    "v2" (last-10 momentum) or "v3" (season + player impact) in one shot.
+    """
+    home = matchups["HOME_TEAM"]
+    away = matchups["AWAY_TEAM"]
+
+    if version == "v2":
+        form = last10.reindex(pd.concat([home, away]).unique())
+        win_pct = form["LAST10_WIN_PCT"].fillna(DEFAULT_LAST10_WIN_PCT)
+        pts = form["LAST10_PTS"].fillna(DEFAULT_LAST10_PTS)
+        return pd.DataFrame({
+            "HOME_LAST10_WIN_PCT": home.map(win_pct).to_numpy(dtype=float),
+            "AWAY_LAST10_WIN_PCT": away.map(win_pct).to_numpy(dtype=float),
+            "HOME_LAST10_PTS": home.map(pts).to_numpy(dtype=float),
+            "AWAY_LAST10_PTS": away.map(pts).to_numpy(dtype=float),
+        }, index=matchups.index)
+
+    if version == "v3":
+        return pd.DataFrame({
+            "HOME_WIN_PCT": home.map(season["WIN_PCT"]).to_numpy(dtype=float),
+            "AWAY_WIN_PCT": away.map(season["WIN_PCT"]).to_numpy(dtype=float),
+            "HOME_SEASON_PTS": home.map(season["SEASON_PTS"]).to_numpy(dtype=float),
+            "AWAY_SEASON_PTS": away.map(season["SEASON_PTS"]).to_numpy(dtype=float),
+            "HOME_PPG": home.map(season["PPG"]).fillna(DEFAULT_PPG).to_numpy(dtype=float),
+            "AWAY_PPG": away.map(season["PPG"]).fillna(DEFAULT_PPG).to_numpy(dtype=float),
+        }, index=matchups.index)
+
+    raise ValueError(f"No batch feature builder for model version {version!r}")
@@ -16,3 +16,28 @@ TEAM_NAME_MAP = {
 
 def normalize(name):
     return TEAM_NAME_MAP.get(name, name)
+
+
+# Current conference alignment, keyed by the normalized team name
+EASTERN_CONFERENCE = [
+    "Atlanta Hawks", "Boston Celtics", "Brooklyn Nets", "Charlotte Hornets",
+    "Chicago Bulls", "Cleveland Cavaliers", "Detroit Pistons", "Indiana Pacers",
+    "Miami Heat", "Milwaukee Bucks", "New York Knicks", "Orlando Magic",
+    "Philadelphia 76ers", "Toronto Raptors", "Washington Wizards",
+]
+
+WESTERN_CONFERENCE = [
+    "Dallas Mavericks", "Denver Nuggets", "Golden State Warriors", "Houston Rockets",
+    "Los Angeles Clippers", "Los Angeles Lakers", "Memphis Grizzlies", "Minnesota Timberwolves",
+    "New Orleans Pelicans", "Oklahoma City Thunder", "Phoenix Suns", "Portland Trail Blazers",
+    "Sacramento Kings", "San Antonio Spurs", "Utah Jazz",
+]
+
+CONFERENCES = {
+    **{team: "East" for team in EASTERN_CONFERENCE},
+    **{team: "West" for team in WESTERN_CONFERENCE},
+}
+
+
+def conference(name):
+    return CONFERENCES.get(normalize(name))
@@ -1,10 +1,15 @@
 import os
+import sys
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report
 import joblib
 
+# Make sure Python can see the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from profiling import profile_from_env
+
 # Paths
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(PROJECT_ROOT, "data", "win_training_data.csv")
@@ -69,4 +74,5 @@ def train_model():
     print(f"\n💾 Model saved to: {MODEL_PATH}")
 
 if __name__ == "__main__":
+    profile_from_env()
     train_model()
@@ -1,4 +1,5 @@
 import os
+import sys
 import joblib
 import pandas as pd
 from sklearn.model_selection import train_test_split
@@ -9,6 +10,12 @@ from sklearn.metrics import (
     classification_report,
 )
 
+# Make sure Python can see the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from profiling import profile_from_env
+
+profile_from_env()
+
 
 # -----------------------------
 # Paths
@@ -119,6 +126,15 @@ print(classification_report(y_test, y_pred, digits=4))
 artifact = {
     "model": model,
     "feature_cols": list(X.columns),
+    # Refresh bookkeeping for analytics/refresh_win_model_v2.py
+    "version": 1,
+    "trained_through": (
+        str(pd.to_datetime(df["GAME_DATE"]).max().date())
+        if "GAME_DATE" in df.columns else None
+    ),
+    # Highest game id seen: games loaded later but dated on/before trained_through have higher ids
+    "trained_through_id": int(df["GAME_ID"].max()) if "GAME_ID" in df.columns else None,
+    "n_training_rows": len(df),
 }
 
 joblib.dump(artifact, MODEL_PATH)
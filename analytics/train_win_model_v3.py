@@ -1,10 +1,17 @@
 import os
+import sys
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, roc_auc_score
 import joblib
 
+# Make sure Python can see the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from profiling import profile_from_env
+
+profile_from_env()
+
 print("\n🏋️‍♂️ Training Win Predictor V3 (Momentum + Player Impact)\n")
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import ParameterSampler, StratifiedKFold, train_test_split
+from sklearn.metrics import accuracy_score, roc_auc_score
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics.win_model_versions import WIN_MODEL_VERSIONS, MODELS_DIR, get_version, save_artifact
+from profiling import profile_from_env
+
+# -----------------------------
+# Search settings
+# -----------------------------
+CACHE_DIR = os.path.join(MODELS_DIR, ".tune_cache")
+
+PARAM_SPACE = {
+    "max_depth": [4, 6, 8, 10, 14, None],
+    "min_samples_split": [2, 4, 10, 20],
+    "min_samples_leaf": [1, 2, 5, 10],
+    "max_features": ["sqrt", 0.5, None],
+    "class_weight": ["balanced", "balanced_subsample"],
+}
+
+# Trees per config in each successive-halving round. Only the best
+# 1/ETA of the configs survive into the next (more expensive) round, but
+# never fewer than two, so the winner is always picked in the last round.
+ROUND_TREES = [50, 150, 400]
+ETA = 3
+
+memory = Memory(CACHE_DIR, verbose=0)
+
+
+@memory.cache
+def score_fold(X, y, train_idx, test_idx, params, n_estimators, seed):
+    """Fit one config on one CV fold and return (roc_auc, accuracy). Cached on disk."""
+    model = RandomForestClassifier(
+        n_estimators=n_estimators, random_state=seed, n_jobs=1, **params
+    )
+    model.fit(X[train_idx], y[train_idx])
+
+    proba = model.predict_proba(X[test_idx])[:, 1]
+    acc = accuracy_score(y[test_idx], (proba >= 0.5).astype(int))
+    try:
+        auc = roc_auc_score(y[test_idx], proba)
+    except ValueError:
+        auc = acc  # only one class in this fold
+    return auc, acc
+
+
+def successive_halving(X, y, configs, folds=5, n_jobs=-1, seed=42):
+    """
+    Evaluate every config on every fold in parallel, keep the best third
+    (at least two) after each round and give the survivors more trees.
+    Returns the leaderboard of the last round (best first).
+    """
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    splits = list(cv.split(X, y))
+    survivors = list(range(len(configs)))
+    leaderboard = []
+
+    for round_no, n_trees in enumerate(ROUND_TREES, start=1):
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(score_fold)(X, y, tr, te, configs[i], n_trees, seed)
+            for i in survivors
+            for tr, te in splits
+        )
+        scores = np.array(results).reshape(len(survivors), folds, 2).mean(axis=1)
+
+        leaderboard = sorted(
+            (
+                {
+                    "params": configs[i],
+                    "n_estimators": n_trees,
+                    "cv_auc": float(auc),
+                    "cv_accuracy": float(acc),
+                }
+                for i, (auc, acc) in zip(survivors, scores)
+            ),
+            key=lambda r: r["cv_auc"],
+            reverse=True,
+        )
+
+        print(
+            f"   • Round {round_no}: {len(survivors)} configs × {folds} folds "
+            f"@ {n_trees} trees — best AUC {leaderboard[0]['cv_auc']:.4f}"
+        )
+
+        keep = min(len(survivors), max(2, len(survivors) // ETA))
+        order = np.argsort(-scores[:, 0], kind="stable")[:keep]
+        survivors = [survivors[i] for i in order]
+        if len(survivors) == 1 and round_no < len(ROUND_TREES):
+            # Only reachable with a single config — nothing to compare
+            break
+
+    return leaderboard
+
+
+def tune_version(version, n_configs=30, folds=5, n_jobs=-1, save=True, seed=42):
+    spec = get_version(version)
+
+    print(f"\n🎛️  Tuning Win Predictor {version.upper()}")
+
+    if not os.path.exists(spec["data_path"]):
+        print(f"❌ Training data not found at {spec['data_path']} — skipping {version}.")
+        return None
+
+    df = pd.read_csv(spec["data_path"])
+    feature_cols, label_col = spec["feature_cols"], spec["label_col"]
+
+    missing = [c for c in feature_cols + [label_col] if c not in df.columns]
+    if missing:
+        print(f"❌ Missing expected columns for {version}: {missing}")
+        return None
+
+    X = df[feature_cols]
+    y = df[label_col]
+
+    # Same hold-out split the trainer scripts use, so test scores are comparable
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=spec["test_size"], random_state=42, stratify=y
+    )
+
+    configs = [spec["params"]] + list(
+        ParameterSampler(PARAM_SPACE, n_iter=n_configs, random_state=seed)
+    )
+    configs = [{k: v for k, v in c.items() if k != "n_estimators"} for c in configs]
+
+    print(f"📊 Training samples: {len(X_train)} | Candidates: {len(configs)} (incl. current)")
+
+    leaderboard = successive_halving(
+        X_train.to_numpy(dtype=np.float64),
+        y_train.to_numpy(),
+        configs,
+        folds=folds,
+        n_jobs=n_jobs,
+        seed=seed,
+    )
+    best = leaderboard[0]
+
+    # -----------------------------
+    # Refit best config on the full training split
+    # -----------------------------
+    n_estimators = max(best["n_estimators"], spec["params"]["n_estimators"])
+    model = RandomForestClassifier(
+        n_estimators=n_estimators, random_state=42, n_jobs=n_jobs, **best["params"]
+    )
+    model.fit(X_train, y_train)
+    # Dashboards score one row at a time — don't ship a thread pool with the model
+    model.set_params(n_jobs=None)
+
+    proba = model.predict_proba(X_test)[:, 1]
+    acc = accuracy_score(y_test, model.predict(X_test))
+    try:
+        auc = roc_auc_score(y_test, proba)
+    except ValueError:
+        auc = None
+
+    print("\n✅ Best config:")
+    print(f"   • Params:   {best['params']} (n_estimators={n_estimators})")
+    print(f"   • CV AUC:   {best['cv_auc']:.4f}")
+    print(f"   • Test Acc: {acc:.4f}")
+    print(f"   • Test AUC: {auc:.4f}" if auc is not None else "   • Test AUC: N/A")
+
+    summary = {
+        "version": version,
+        "best_params": best["params"],
+        "n_estimators": n_estimators,
+        "cv_auc": best["cv_auc"],
+        "test_accuracy": float(acc),
+        "test_auc": None if auc is None else float(auc),
+        "leaderboard": leaderboard[:10],
+    }
+
+    if save:
+        path = save_artifact(version, model, feature_cols)
+        summary_path = os.path.join(MODELS_DIR, f"tuning_{version}.json")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, default=str)
+        print(f"💾 Model saved to: {path}")
+        print(f"🧾 Tuning summary → {summary_path}")
+
+    return summary
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Hyperparameter search for the win predictors")
+    parser.add_argument("--version", default="all", choices=["all"] + sorted(WIN_MODEL_VERSIONS))
+    parser.add_argument("--configs", type=int, default=30, help="random configs to try per version")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=-1, help="worker processes (-1 = all cores)")
+    parser.add_argument("--no-save", action="store_true", help="report only, keep current models")
+    parser.add_argument("--clear-cache", action="store_true", help="drop cached fold results first")
+    args = parser.parse_args()
+
+    if args.clear_cache:
+        memory.clear(warn=False)
+
+    versions = sorted(WIN_MODEL_VERSIONS) if args.version == "all" else [args.version]
+    for v in versions:
+        tune_version(v, n_configs=args.configs, folds=args.folds, n_jobs=args.jobs, save=not args.no_save)
+
+    print("\n🎉 Tuning complete!\n")
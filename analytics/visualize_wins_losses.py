@@ -5,6 +5,9 @@ import cx_Oracle
 import pandas as pd
 import matplotlib.pyplot as plt
 from config import get_connection
+from profiling import profile_from_env
+
+profile_from_env()
 
 # Apply a consistent modern style
 plt.style.use('seaborn-v0_8-talk')
@@ -0,0 +1,124 @@
+import os
+import joblib
+
+# -----------------------------
+# Paths
+# -----------------------------
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
+
+
+# -----------------------------
+# Win predictor versions
+# -----------------------------
+# One entry per trainer script. "artifact" says how the pickle is laid out:
+#   "model" → joblib.dump(model)                        (v1, v3 dashboards)
+#   "dict"  → joblib.dump({"model", "feature_cols"})   (v2 dashboards)
+WIN_MODEL_VERSIONS = {
+    "v1": {
+        "data_path": os.path.join(PROJECT_ROOT, "data", "win_training_data.csv"),
+        "model_path": os.path.join(MODELS_DIR, "win_predictor.pkl"),
+        "feature_cols": [
+            "HOME_WIN_PCT",
+            "AWAY_WIN_PCT",
+            "HOME_STREAK",
+            "AWAY_STREAK",
+            "HOME_SEASON_POINTS",
+            "AWAY_SEASON_POINTS",
+        ],
+        "label_col": "HOME_WIN_FLAG",
+        "test_size": 0.25,
+        "artifact": "model",
+        "params": {
+            "n_estimators": 200,
+            "max_depth": None,
+            "class_weight": "balanced",
+        },
+    },
+    "v2": {
+        "data_path": os.path.join(PROJECT_ROOT, "analytics", "training_data_v2.csv"),
+        "model_path": os.path.join(MODELS_DIR, "win_predictor_v2.pkl"),
+        "feature_cols": [
+            "HOME_LAST10_WIN_PCT",
+            "AWAY_LAST10_WIN_PCT",
+            "HOME_LAST10_PTS",
+            "AWAY_LAST10_PTS",
+        ],
+        "label_col": "TARGET_WIN",
+        "test_size": 0.2,
+        "artifact": "dict",
+        "params": {
+            "n_estimators": 300,
+            "max_depth": 8,
+            "min_samples_split": 20,
+            "min_samples_leaf": 10,
+            "class_weight": "balanced",
+        },
+    },
+    "v3": {
+        "data_path": os.path.join(MODELS_DIR, "win_training_v3.csv"),
+        "model_path": os.path.join(MODELS_DIR, "win_predictor_v3.pkl"),
+        "feature_cols": [
+            "HOME_WIN_PCT",
+            "AWAY_WIN_PCT",
+            "HOME_SEASON_PTS",
+            "AWAY_SEASON_PTS",
+            "HOME_PPG",
+            "AWAY_PPG",
+        ],
+        "label_col": "HOME_WIN_LABEL",
+        "test_size": 0.2,
+        "artifact": "model",
+        "params": {
+            "n_estimators": 400,
+            "max_depth": 14,
+            "min_samples_split": 4,
+            "min_samples_leaf": 2,
+            "class_weight": "balanced_subsample",
+        },
+    },
+}
+
+
+def get_version(version):
+    """Look up a win predictor version ("v1", "v2", "v3")."""
+    if version not in WIN_MODEL_VERSIONS:
+        raise ValueError(
+            f"Unknown model version {version!r} — "
+            f"expected one of {sorted(WIN_MODEL_VERSIONS)}"
+        )
+    return WIN_MODEL_VERSIONS[version]
+
+
+def save_artifact(version, model, feature_cols, path=None, extra=None):
+    """
+    Save a fitted model in the same joblib layout the dashboards load
+    for that version. `extra` keys are only kept for dict artifacts.
+    """
+    spec = get_version(version)
+    path = path or spec["model_path"]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if spec["artifact"] == "dict":
+        artifact = {"model": model, "feature_cols": list(feature_cols)}
+        artifact.update(extra or {})
+    else:
+        artifact = model
+
+    joblib.dump(artifact, path)
+    return path
+
+
+def load_artifact(version, path=None):
+    """
+    Load a saved win predictor and return (model, feature_cols, artifact),
+    whatever layout it was saved in.
+    """
+    spec = get_version(version)
+    artifact = joblib.load(path or spec["model_path"])
+
+    if isinstance(artifact, dict):
+        return artifact["model"], list(artifact["feature_cols"]), artifact
+
+    feature_cols = list(getattr(artifact, "feature_names_in_", spec["feature_cols"]))
+    return artifact, feature_cols, artifact
@@ -0,0 +1,243 @@
+"""
+A local, file-backed stand-in for the Oracle connection returned by
+config.get_connection(), used by the benchmark harness.
+
+It wraps sqlite3 and rewrites the Oracle dialect this repo actually uses:
+numbered binds (:1), TO_DATE, FETCH FIRST / ROWNUM limits, FROM dual,
+SYSTIMESTAMP, identity columns, the create-if-missing PL/SQL blocks from
+etl_scripts/db_utils.py, and MERGE ... USING (SELECT ... FROM dual) upserts.
+Anything else (date arithmetic, analytic functions, PL/SQL beyond those
+blocks) is passed through and fails loudly, so a stage that needs it shows
+up as an error in the results rather than silently measuring the wrong thing.
+"""
+
+import re
+import sqlite3
+import time
+import datetime as dt
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+# Per-process counters, read by benchmarks/stage_runner.py after a stage
+STATS = {"queries": 0, "rows_written": 0, "db_time_s": 0.0}
+
+for _np_type, _py in [(np.int64, int), (np.int32, int), (np.float64, float),
+                      (np.float32, float), (np.bool_, int)]:
+    sqlite3.register_adapter(_np_type, _py)
+sqlite3.register_adapter(pd.Timestamp, lambda v: v.isoformat(" "))
+sqlite3.register_adapter(dt.datetime, lambda v: v.isoformat(" "))
+sqlite3.register_adapter(dt.date, lambda v: v.isoformat())
+
+
+def _to_datetime(raw):
+    try:
+        return dt.datetime.fromisoformat(raw.decode())
+    except ValueError:
+        return raw.decode()
+
+
+# Oracle hands back DATE / TIMESTAMP columns as datetime — so does the stand-in
+sqlite3.register_converter("DATE", _to_datetime)
+sqlite3.register_converter("TIMESTAMP", _to_datetime)
+
+
+def _trunc(value):
+    """TRUNC(date) → midnight; TRUNC(number) → integer part."""
+    if isinstance(value, str):
+        return value[:10] + " 00:00:00"
+    return int(value) if value is not None else None
+
+
+# =====================================
+# Dialect translation
+# =====================================
+PLSQL_BLOCK = re.compile(r"^\s*BEGIN\s+EXECUTE IMMEDIATE\s+'(.*)';\s+EXCEPTION\b.*END;\s*$", re.S | re.I)
+MERGE_DUAL = re.compile(
+    r"MERGE\s+INTO\s+(?P<table>\w+)\s+(?P<t>\w+)\s+"
+    r"USING\s*\(\s*SELECT\s+(?P<select>.*?)\s+FROM\s+dual\s*\)\s*(?P<s>\w+)\s+"
+    r"ON\s*\((?P<on>.*?)\)\s*"
+    r"(?:WHEN\s+MATCHED\s+THEN\s+UPDATE\s+SET\s+(?P<set>.*?)\s*)?"
+    r"WHEN\s+NOT\s+MATCHED\s+THEN\s+INSERT\s*\((?P<cols>.*?)\)\s*VALUES\s*\((?P<vals>.*)\)\s*$",
+    re.S | re.I,
+)
+
+SIMPLE_REWRITES = [
+    (re.compile(r"(?<![:\w]):(\d+)\b"), r"?\1"),
+    (re.compile(r"\bTO_DATE\s*\(\s*([^,()]+?)\s*,\s*'[^']*'\s*\)", re.I), r"\1"),
+    (re.compile(r"\bFETCH\s+FIRST\s+(\d+)\s+ROWS?\s+ONLY\b", re.I), r"LIMIT \1"),
+    (re.compile(r"\bWHERE\s+ROWNUM\s*(?:=|<=)\s*(\d+)\b", re.I), r"LIMIT \1"),
+    (re.compile(r"\s+FROM\s+dual\b", re.I), ""),
+    (re.compile(r"\b(?:SYSTIMESTAMP|SYSDATE)\b", re.I), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bNUMBER\s+GENERATED\s+(?:ALWAYS|BY\s+DEFAULT(?:\s+ON\s+NULL)?)\s+AS\s+IDENTITY"
+                r"(?:\s+PRIMARY\s+KEY)?", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\bCREATE\s+TABLE\s+(?!IF\b)", re.I), "CREATE TABLE IF NOT EXISTS "),
+    (re.compile(r"\bCREATE\s+(UNIQUE\s+)?INDEX\s+(?!IF\b)", re.I), r"CREATE \1INDEX IF NOT EXISTS "),
+    (re.compile(r"\bALTER\s+TABLE\s+(\w+)\s+ADD\s*\((.*)\)\s*$", re.S | re.I), r"ALTER TABLE \1 ADD COLUMN \2"),
+]
+
+
+def split_top_level(text, sep=","):
+    """Split on `sep` outside parentheses and quotes."""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(text):
+        if ch == "'":
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and ch == sep:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return [p for p in parts if p]
+
+
+def merge_to_upsert(match):
+    """MERGE ... USING (SELECT ... FROM dual) → INSERT ... ON CONFLICT DO UPDATE."""
+    table, t, s = match["table"], match["t"], match["s"]
+
+    source = {}
+    for item in split_top_level(match["select"]):
+        expr, alias = re.match(r"(.*?)\s+(?:AS\s+)?(\w+)$", item, re.S | re.I).groups()
+        source[alias.upper()] = expr.strip()
+
+    def resolve(expr):
+        expr = re.sub(rf"\b{s}\.(\w+)", lambda m: source[m[1].upper()], expr)
+        return re.sub(rf"\b{t}\.(\w+)", rf"{table}.\1", expr)
+
+    keys = re.findall(rf"\b{t}\.(\w+)\s*=\s*{s}\.\w+", match["on"])
+    cols = split_top_level(match["cols"])
+    vals = [resolve(v) for v in split_top_level(match["vals"])]
+
+    sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(vals)}) ON CONFLICT ({', '.join(keys)}) "
+    if not match["set"]:
+        return sql + "DO NOTHING"
+
+    sets = []
+    for assignment in split_top_level(match["set"]):
+        col, expr = assignment.split("=", 1)
+        col = re.sub(rf"^{t}\.", "", col.strip())
+        sets.append(f"{col} = {resolve(expr.strip())}")
+    return sql + "DO UPDATE SET " + ", ".join(sets)
+
+
+@lru_cache(maxsize=512)
+def translate(sql):
+    """Oracle SQL (as written in this repo) → (sqlite SQL, is_guarded_ddl)."""
+    guarded = False
+    block = PLSQL_BLOCK.match(sql)
+    if block:
+        sql, guarded = block.group(1).replace("''", "'"), True
+
+    merge = MERGE_DUAL.search(sql)
+    if merge:
+        sql = merge_to_upsert(merge)
+
+    for pattern, repl in SIMPLE_REWRITES:
+        sql = pattern.sub(repl, sql)
+    return sql.strip().rstrip(";"), guarded
+
+
+# =====================================
+# DB-API wrappers
+# =====================================
+class Cursor:
+    def __init__(self, raw):
+        self._cur = raw.cursor()
+        self.arraysize = 100
+
+    @property
+    def description(self):
+        # Oracle upper-cases unquoted identifiers; pandas column names depend on it
+        if self._cur.description is None:
+            return None
+        return [(d[0].upper(),) + tuple(d[1:]) for d in self._cur.description]
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    def _run(self, fn, sql, args, rows=0):
+        translated, guarded = translate(sql)
+        start = time.perf_counter()
+        try:
+            fn(translated, args)
+        except sqlite3.OperationalError as e:
+            # Same contract as the db_utils helpers: "already exists" is fine
+            if not (guarded and ("already exists" in str(e) or "duplicate column" in str(e))):
+                raise
+        except sqlite3.IntegrityError as e:
+            # Loaders look for Oracle's code to skip duplicates
+            if "UNIQUE" in str(e):
+                raise sqlite3.IntegrityError(f"ORA-00001: unique constraint violated ({e})") from e
+            raise
+        finally:
+            STATS["queries"] += 1
+            STATS["rows_written"] += rows
+            STATS["db_time_s"] += time.perf_counter() - start
+        return self
+
+    def execute(self, sql, params=None):
+        args = params if isinstance(params, dict) else list(params or [])
+        written = 1 if re.match(r"\s*(INSERT|UPDATE|MERGE)", sql, re.I) else 0
+        return self._run(self._cur.execute, sql, args, written)
+
+    def executemany(self, sql, seq):
+        seq = [p if isinstance(p, dict) else list(p) for p in seq]
+        if not seq:
+            return self
+        return self._run(self._cur.executemany, sql, seq, len(seq))
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchmany(self, size=None):
+        return self._cur.fetchmany(size or self.arraysize)
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    def close(self):
+        self._cur.close()
+
+
+class Connection:
+    def __init__(self, path):
+        self._raw = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, timeout=30)
+        self._raw.execute("PRAGMA journal_mode=WAL")
+        self._raw.execute("PRAGMA synchronous=NORMAL")
+        self._raw.create_function("NVL", 2, lambda a, b: b if a is None else a)
+        self._raw.create_function("TRUNC", 1, _trunc)
+
+    def cursor(self):
+        return Cursor(self._raw)
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        self._raw.close()
+
+
+def connect(path):
+    return Connection(path)
+
+
+def apply_schema(path, schema_file):
+    """Create the base tables the ETL scripts expect to already exist."""
+    with open(schema_file, "r", encoding="utf-8") as f:
+        script = f.read()
+    raw = sqlite3.connect(path)
+    raw.executescript(script)
+    raw.commit()
+    raw.close()
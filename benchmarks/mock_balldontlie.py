@@ -0,0 +1,466 @@
+"""
+Local stand-in for api.balldontlie.io (v1).
+
+Serves /teams, /players, /games and /stats (with or without the /v1 prefix)
+from a synthetic league (etl_scripts/generate_synthetic_league.py) or from a
+directory that generator wrote. Responses use balldontlie's JSON shapes and
+both pagination styles: cursor (meta.next_cursor) and the legacy ?page=N
+that the etl_*.py scripts still send.
+
+Faults are injected from a seeded RNG so a run can be replayed:
+latency (+ jitter), per-key fixed-window rate limits answered with 429 +
+Retry-After, and random 5xx errors. GET /__mock__/stats returns request
+counters for throughput / retry measurements.
+
+    python benchmarks/mock_balldontlie.py --port 8089 --latency 40 --rate-limit 60 --error-rate 0.02
+    BALLDONTLIE_BASE_URL=http://127.0.0.1:8089/v1 python etl_scripts/etl_load_players.py
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter, defaultdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+# Make sure Python can see the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.team_name_map import EASTERN_CONFERENCE
+from etl_scripts.generate_synthetic_league import TEAMS, iter_seasons
+
+MAX_PER_PAGE = 100
+DEFAULT_PER_PAGE = 25
+POSITIONS = ["G", "F", "C", "G-F", "F-C"]
+
+
+# =====================================
+# League data in balldontlie shapes
+# =====================================
+def team_objects():
+    teams = {}
+    for i, full_name in enumerate(TEAMS, start=1):
+        parts = full_name.split()
+        # "Portland Trail Blazers" → city "Portland", name "Trail Blazers"
+        split = 1 if parts[0] not in ("Golden", "Los", "New", "Oklahoma", "San") else 2
+        teams[full_name] = {
+            "id": i,
+            "conference": "East" if full_name in EASTERN_CONFERENCE else "West",
+            "division": "",
+            "city": " ".join(parts[:split]),
+            "name": " ".join(parts[split:]),
+            "full_name": full_name,
+            "abbreviation": "".join(p[0] for p in parts).upper()[:3],
+        }
+    return teams
+
+
+class LeagueData:
+    """Everything the endpoints serve, sorted by id so cursors are a searchsorted."""
+
+    def __init__(self, games, box):
+        self.teams = team_objects()
+        self.team_by_id = {t["id"]: t for t in self.teams.values()}
+
+        games = games.sort_values("GAME_ID").reset_index(drop=True)
+        games["DATE"] = pd.to_datetime(games["GAME_DATE"]).dt.strftime("%Y-%m-%d")
+        games["API_SEASON"] = games["SEASON"].astype(int) - 1   # balldontlie labels by start year
+        games["HOME_ID"] = games["HOME_TEAM"].map(lambda t: self.teams[t]["id"])
+        games["AWAY_ID"] = games["AWAY_TEAM"].map(lambda t: self.teams[t]["id"])
+        self.games = games
+
+        box = box.merge(games[["GAME_ID", "DATE", "API_SEASON"]], on="GAME_ID", how="left")
+        box["TEAM_ID"] = box["TEAM_NAME"].map(lambda t: self.teams[t]["id"])
+        box = box.sort_values(["GAME_ID", "TEAM_ID", "PLAYER_ID"]).reset_index(drop=True)
+        box["STAT_ID"] = np.arange(1, len(box) + 1)
+        self.stats = box
+
+        # A player's team is where he played most recently
+        latest = box.sort_values("GAME_ID").groupby("PLAYER_ID").last()
+        rng = np.random.default_rng(len(latest))
+        self.players = pd.DataFrame({
+            "PLAYER_ID": latest.index.to_numpy(),
+            "PLAYER_NAME": latest["PLAYER_NAME"].to_numpy(),
+            "TEAM_NAME": latest["TEAM_NAME"].to_numpy(),
+            "POSITION": rng.choice(POSITIONS, len(latest)),
+            "HEIGHT": [f"6-{h}" for h in rng.integers(0, 12, len(latest))],
+            "WEIGHT": rng.integers(180, 265, len(latest)).astype(str),
+        }).reset_index(drop=True)
+
+        self._game_pos = dict(zip(self.games["GAME_ID"], range(len(self.games))))
+        self._player_pos = dict(zip(self.players["PLAYER_ID"], range(len(self.players))))
+
+    @classmethod
+    def generate(cls, seasons=1, start_season=2024, seed=42):
+        chunks = list(iter_seasons(seasons, start_season, seed))
+        return cls(pd.concat([g for g, _, _ in chunks], ignore_index=True),
+                   pd.concat([b for _, b, _ in chunks], ignore_index=True))
+
+    @classmethod
+    def from_dir(cls, path):
+        """A directory written by generate_synthetic_league.py (CSV)."""
+        games = pd.read_csv(os.path.join(path, "nba_game_logs.csv"))
+        games["GAME_ID"] = np.arange(1, len(games) + 1)   # generator numbers games in file order
+        box = pd.read_csv(os.path.join(path, "nba_player_game_stats.csv"))
+        return cls(games, box)
+
+    # ---- serializers ----
+    def player_obj(self, row, with_team=True):
+        first, _, last = row.PLAYER_NAME.partition(" ")
+        obj = {
+            "id": int(row.PLAYER_ID), "first_name": first, "last_name": last,
+            "position": row.POSITION, "height": row.HEIGHT, "weight": row.WEIGHT,
+            "jersey_number": None, "college": None, "country": "USA",
+            "draft_year": None, "draft_round": None, "draft_number": None,
+        }
+        if with_team:
+            obj["team"] = self.teams.get(row.TEAM_NAME)
+        else:
+            obj["team_id"] = self.teams[row.TEAM_NAME]["id"]
+        return obj
+
+    def game_obj(self, row, nested=True):
+        obj = {
+            "id": int(row.GAME_ID), "date": row.DATE, "season": int(row.API_SEASON),
+            "status": "Final", "period": 4, "time": "Final", "postseason": False,
+            "home_team_score": int(row.HOME_POINTS), "visitor_team_score": int(row.AWAY_POINTS),
+        }
+        if nested:
+            obj["home_team"] = self.team_by_id[int(row.HOME_ID)]
+            obj["visitor_team"] = self.team_by_id[int(row.AWAY_ID)]
+        else:
+            obj["home_team_id"] = int(row.HOME_ID)
+            obj["visitor_team_id"] = int(row.AWAY_ID)
+        return obj
+
+    def stat_obj(self, row):
+        minutes = float(row.MINUTES)
+        game = self.games.iloc[self._game_pos[row.GAME_ID]]
+        player = self.players.iloc[self._player_pos[row.PLAYER_ID]]
+        return {
+            "id": int(row.STAT_ID),
+            "min": f"{int(minutes)}:{int(round((minutes % 1) * 60)):02d}",
+            "pts": int(row.POINTS), "reb": int(row.REBOUNDS), "ast": int(row.ASSISTS),
+            "stl": int(row.STEALS), "blk": int(row.BLOCKS), "turnover": int(row.TURNOVERS),
+            "player": self.player_obj(player, with_team=False),
+            "team": self.teams[row.TEAM_NAME],
+            "game": self.game_obj(game, nested=False),
+        }
+
+
+# =====================================
+# Filtering + pagination
+# =====================================
+def ints(query, key):
+    return [int(v) for v in query.get(f"{key}[]", []) + query.get(key, [])]
+
+
+def date_mask(df, query):
+    mask = np.ones(len(df), dtype=bool)
+    dates = query.get("dates[]", []) + query.get("dates", [])
+    if dates:
+        mask &= df["DATE"].isin(dates).to_numpy()
+    if query.get("start_date"):
+        mask &= (df["DATE"] >= query["start_date"][0]).to_numpy()
+    if query.get("end_date"):
+        mask &= (df["DATE"] <= query["end_date"][0]).to_numpy()
+    if ints(query, "seasons"):
+        mask &= df["API_SEASON"].isin(ints(query, "seasons")).to_numpy()
+    return mask
+
+
+def paginate(ids, query):
+    """
+    Positions of the page to return plus the meta block. `ids` must be sorted.
+    ?cursor=<last id> → cursor style; ?page=N → legacy offset style.
+    """
+    per_page = min(max(int(query.get("per_page", [DEFAULT_PER_PAGE])[0]), 1), MAX_PER_PAGE)
+
+    if "page" in query and "cursor" not in query:
+        page = max(int(query["page"][0]), 1)
+        start = (page - 1) * per_page
+        stop = min(start + per_page, len(ids))
+        total_pages = -(-len(ids) // per_page)
+        meta = {"total_pages": total_pages, "current_page": page,
+                "next_page": page + 1 if page < total_pages else None,
+                "per_page": per_page, "total_count": int(len(ids))}
+        return range(start, max(start, stop)), meta
+
+    cursor = int(query.get("cursor", [0])[0])
+    start = int(np.searchsorted(ids, cursor, side="right"))
+    stop = min(start + per_page, len(ids))
+    meta = {"per_page": per_page}
+    if stop < len(ids):
+        meta["next_cursor"] = int(ids[stop - 1])
+    return range(start, stop), meta
+
+
+def list_teams(data, query):
+    teams = sorted(data.teams.values(), key=lambda t: t["id"])
+    if query.get("conference"):
+        teams = [t for t in teams if t["conference"] == query["conference"][0]]
+    return {"data": teams}
+
+
+def list_players(data, query):
+    df = data.players
+    mask = np.ones(len(df), dtype=bool)
+    if query.get("search"):
+        mask &= df["PLAYER_NAME"].str.contains(query["search"][0], case=False, regex=False).to_numpy()
+    if ints(query, "team_ids"):
+        names = [data.team_by_id[i]["full_name"] for i in ints(query, "team_ids") if i in data.team_by_id]
+        mask &= df["TEAM_NAME"].isin(names).to_numpy()
+    if ints(query, "player_ids"):
+        mask &= df["PLAYER_ID"].isin(ints(query, "player_ids")).to_numpy()
+
+    df = df[mask]
+    rows, meta = paginate(df["PLAYER_ID"].to_numpy(), query)
+    return {"data": [data.player_obj(r) for r in df.iloc[list(rows)].itertuples()], "meta": meta}
+
+
+def list_games(data, query):
+    df = data.games
+    mask = date_mask(df, query)
+    if ints(query, "team_ids"):
+        team_ids = ints(query, "team_ids")
+        mask &= (df["HOME_ID"].isin(team_ids) | df["AWAY_ID"].isin(team_ids)).to_numpy()
+    if ints(query, "game_ids"):
+        mask &= df["GAME_ID"].isin(ints(query, "game_ids")).to_numpy()
+
+    df = df[mask]
+    rows, meta = paginate(df["GAME_ID"].to_numpy(), query)
+    return {"data": [data.game_obj(r) for r in df.iloc[list(rows)].itertuples()], "meta": meta}
+
+
+def list_stats(data, query):
+    df = data.stats
+    mask = date_mask(df, query)
+    if ints(query, "player_ids"):
+        mask &= df["PLAYER_ID"].isin(ints(query, "player_ids")).to_numpy()
+    if ints(query, "game_ids"):
+        mask &= df["GAME_ID"].isin(ints(query, "game_ids")).to_numpy()
+    if ints(query, "stat_ids"):
+        mask &= df["STAT_ID"].isin(ints(query, "stat_ids")).to_numpy()
+
+    df = df[mask]
+    rows, meta = paginate(df["STAT_ID"].to_numpy(), query)
+    return {"data": [data.stat_obj(r) for r in df.iloc[list(rows)].itertuples()], "meta": meta}
+
+
+ROUTES = {"teams": list_teams, "players": list_players, "games": list_games, "stats": list_stats}
+
+
+# =====================================
+# Fault injection
+# =====================================
+class Faults:
+    """Latency, 429 quotas and random errors, all from one seeded RNG."""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, rate_limit=0, window_s=60.0,
+                 error_rate=0.0, error_codes=(500, 503), seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.window_s = window_s
+        self.error_rate = error_rate
+        self.error_codes = list(error_codes)
+        self._rng = random.Random(seed)
+        self._windows = defaultdict(lambda: [0.0, 0])   # api key → [window start, count]
+        self._lock = threading.Lock()
+
+    def delay(self):
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        wait = max(self.latency_ms + jitter, 0.0) / 1000
+        if wait:
+            time.sleep(wait)
+
+    def throttle(self, key):
+        """Seconds until the caller may retry, or None if the request is within quota."""
+        if not self.rate_limit:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows[key]
+            if now - window[0] >= self.window_s:
+                window[0], window[1] = now, 0
+            window[1] += 1
+            if window[1] > self.rate_limit:
+                return max(self.window_s - (now - window[0]), 0.0)
+        return None
+
+    def error(self):
+        with self._lock:
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return self._rng.choice(self.error_codes)
+        return None
+
+
+# =====================================
+# HTTP server
+# =====================================
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "MockBallDontLie/1.0"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.count(self.endpoint, status, len(payload))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        if parts and parts[0] == "v1":
+            parts = parts[1:]
+        self.endpoint = parts[0] if parts else ""
+
+        if self.endpoint == "__mock__":
+            return self.send_json(200, self.server.snapshot())
+
+        server = self.server
+        server.faults.delay()
+
+        key = self.headers.get("Authorization", "")
+        if server.api_key and key.replace("Bearer ", "") != server.api_key:
+            return self.send_json(401, {"error": "Unauthorized"})
+
+        retry_after = server.faults.throttle(key)
+        if retry_after is not None:
+            return self.send_json(429, {"error": "Too many requests"},
+                                  {"Retry-After": str(max(int(np.ceil(retry_after)), 1))})
+
+        code = server.faults.error()
+        if code:
+            return self.send_json(code, {"error": "Injected failure"})
+
+        handler = ROUTES.get(self.endpoint)
+        if handler is None:
+            return self.send_json(404, {"error": "Not found"})
+
+        # /teams/<id>, /players/<id>, /games/<id> single-object lookups
+        query = parse_qs(url.query)
+        if len(parts) == 2 and parts[1].isdigit():
+            return self.send_single(int(parts[1]))
+
+        try:
+            body = handler(server.data, query)
+        except ValueError as e:
+            return self.send_json(400, {"error": str(e)})
+        self.send_json(200, body)
+
+
+    def send_single(self, obj_id):
+        data = self.server.data
+        if self.endpoint == "teams":
+            found = data.team_by_id.get(obj_id)
+        else:
+            key = {"players": "player_ids", "games": "game_ids", "stats": "stat_ids"}[self.endpoint]
+            matches = ROUTES[self.endpoint](data, {key: [str(obj_id)], "per_page": ["1"]})["data"]
+            found = matches[0] if matches else None
+        if found is None:
+            return self.send_json(404, {"error": "Not found"})
+        self.send_json(200, {"data": found})
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, data, faults, api_key=None, verbose=False):
+        super().__init__(address, MockHandler)
+        self.data = data
+        self.faults = faults
+        self.api_key = api_key
+        self.verbose = verbose
+        self.started = time.monotonic()
+        self._counts = Counter()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def count(self, endpoint, status, size):
+        with self._lock:
+            self._counts[(endpoint, status)] += 1
+            self._bytes += size
+
+    def snapshot(self):
+        with self._lock:
+            by_status = Counter()
+            by_endpoint = Counter()
+            for (endpoint, status), n in self._counts.items():
+                by_status[str(status)] += n
+                by_endpoint[endpoint] += n
+            total = sum(by_status.values())
+            elapsed = time.monotonic() - self.started
+            return {
+                "requests": total,
+                "by_status": dict(by_status),
+                "by_endpoint": dict(by_endpoint),
+                "bytes_sent": self._bytes,
+                "uptime_s": round(elapsed, 2),
+                "requests_per_s": round(total / elapsed, 2) if elapsed else None,
+            }
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+def start_server(data=None, host="127.0.0.1", port=0, faults=None, api_key=None, verbose=False):
+    """Start in a daemon thread; returns the server (use .base_url, .shutdown())."""
+    server = MockServer((host, port), data or LeagueData.generate(), faults or Faults(), api_key, verbose)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local balldontlie API stand-in with injectable latency / quotas / errors")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--fixture", help="directory written by generate_synthetic_league.py (default: generate in memory)")
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency", type=float, default=0.0, help="added latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± uniform jitter on the latency (ms)")
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests per window per API key (0 = unlimited)")
+    parser.add_argument("--window", type=float, default=60.0, help="rate-limit window (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 5xx")
+    parser.add_argument("--error-codes", type=int, nargs="+", default=[500, 503])
+    parser.add_argument("--fault-seed", type=int, default=0)
+    parser.add_argument("--api-key", help="require this Authorization value (default: accept any)")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    print("\n🏗️ Building league data...")
+    data = LeagueData.from_dir(args.fixture) if args.fixture else LeagueData.generate(args.seasons, seed=args.seed)
+    faults = Faults(args.latency, args.jitter, args.rate_limit, args.window,
+                    args.error_rate, args.error_codes, args.fault_seed)
+
+    server = MockServer((args.host, args.port), data, faults, args.api_key, args.verbose)
+    print(f"🏀 {len(data.teams)} teams | {len(data.players):,} players | {len(data.games):,} games | {len(data.stats):,} stat lines")
+    print(f"🚀 Mock balldontlie API on {server.base_url}")
+    print(f"   export BALLDONTLIE_BASE_URL={server.base_url}")
+    print("   Counters: GET /__mock__/stats — Ctrl+C to stop\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\n📊 {json.dumps(server.snapshot())}")
+        server.server_close()
@@ -0,0 +1,485 @@
+"""
+Headless render profiler for the Streamlit dashboards.
+
+Drives the three app.py tab sections, trend_dashboard.py and
+player_comparison.py through Streamlit's AppTest harness for a matrix of
+widget selections and records, per render: wall / CPU time, query count,
+rows fetched, DB time, chart count + chart render time (st.pyplot and the
+st.*_chart calls, i.e. the figure serialisation Streamlit does) and, in a
+separate tracemalloc pass, peak Python memory.
+
+By default it builds the synthetic benchmark workspace (same data and SQLite
+stand-in as run_benchmarks.py); --live profiles against config.get_connection()
+as-is. Sections are ranked by median render time, the slowest selections are
+listed, and --baseline flags sections that regressed.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import warnings
+import functools
+import itertools
+import statistics
+import tracemalloc
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+# Make sure Python can see the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import (
+    PROJECT_ROOT, RESULTS_DIR, STAGES, THRESHOLD,
+    prepare_workspace, reset_database, run_stage, compare, git_commit, load_json,
+)
+
+BASELINE_PATH = os.path.join(PROJECT_ROOT, "benchmarks", "dashboard_baseline.json")
+DERIVED_STAGES = ["build_leaders", "build_player_store", "build_player_form"]   # tables the pages read that the loaders do not write
+
+# Per-render counters, reset before every AppTest run
+COUNTERS = {"queries": 0, "rows_fetched": 0, "db_time_s": 0.0, "charts": 0, "chart_time_s": 0.0}
+_chart_depth = [0]
+
+CHART_METHODS = ["pyplot", "altair_chart", "vega_lite_chart", "plotly_chart",
+                 "line_chart", "bar_chart", "area_chart", "scatter_chart"]
+WIDGET_TYPES = ["selectbox", "radio", "checkbox", "toggle"]
+
+
+# =====================================
+# Sections + the widgets each one varies (key or label)
+# =====================================
+def section(name, kind, target, vary):
+    return {"name": name, "kind": kind, "target": target, "vary": vary}
+
+
+SECTIONS = [
+    section("app_team_view", "function", "sections.team_view:render_team_view",
+            ["team_season_select", "trend_team_select"]),
+    section("app_players_view", "function", "sections.players_view:render_players_view",
+            ["player_season_select", "player_team_filter"]),
+    section("app_game_logs_view", "function", "sections.game_logs_view:render_game_logs_view",
+            ["logs_season_select", "logs_team_filter"]),
+    section("trend_dashboard", "page", "trend_dashboard.py",
+            ["Season for League Overview:", "Team for detailed view:", "Team Season Filter:"]),
+    section("player_comparison", "page", "player_comparison.py",
+            ["Season", "Player A", "Player B"]),
+    section("league_leaders", "page", "league_leaders.py", ["Season", "Sort By"]),
+    section("game_log_explorer", "page", "game_log_explorer.py", ["Player", "Stat", "Rolling average"]),
+    section("live_player_stats", "page", "live_player_stats.py", ["Select Player ID"]),
+]
+
+
+# =====================================
+# Instrumentation
+# =====================================
+class CountingCursor:
+    """Wraps any DB-API cursor; counts statements, rows fetched and time spent in the driver."""
+
+    def __init__(self, cursor):
+        self._cur = cursor
+
+    def _timed(self, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            COUNTERS["db_time_s"] += time.perf_counter() - start
+
+    def execute(self, *args, **kwargs):
+        COUNTERS["queries"] += 1
+        self._timed(self._cur.execute, *args, **kwargs)
+        return self
+
+    def executemany(self, *args, **kwargs):
+        COUNTERS["queries"] += 1
+        self._timed(self._cur.executemany, *args, **kwargs)
+        return self
+
+    def fetchone(self):
+        row = self._timed(self._cur.fetchone)
+        COUNTERS["rows_fetched"] += row is not None
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._timed(self._cur.fetchmany, *args, **kwargs)
+        COUNTERS["rows_fetched"] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cur.fetchall)
+        COUNTERS["rows_fetched"] += len(rows)
+        return rows
+
+    def __iter__(self):
+        for row in self._cur:
+            COUNTERS["rows_fetched"] += 1
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+class CountingConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def timed_chart(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        # st.line_chart & co. delegate to other chart methods — only time the outer call
+        _chart_depth[0] += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _chart_depth[0] -= 1
+            if _chart_depth[0] == 0:
+                COUNTERS["charts"] += 1
+                COUNTERS["chart_time_s"] += time.perf_counter() - start
+    return wrapper
+
+
+def install_hooks():
+    """Count DB work behind config.get_connection() and time every chart call."""
+    import config
+    import streamlit as st
+    import streamlit.testing.v1  # noqa: F401
+    from streamlit.delta_generator import DeltaGenerator
+
+    # pandas warns on every read_sql through a non-SQLAlchemy connection; Streamlit logs deprecations per render
+    warnings.filterwarnings("ignore", message="pandas only supports SQLAlchemy", category=UserWarning)
+    for name in list(logging.Logger.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    original = config.get_connection
+    config.get_connection = lambda *a, **kw: CountingConnection(original(*a, **kw))
+
+    for name in CHART_METHODS:
+        if hasattr(DeltaGenerator, name):
+            setattr(DeltaGenerator, name, timed_chart(getattr(DeltaGenerator, name)))
+        if hasattr(st, name):
+            # st.pyplot is a method bound at import time; the class patch does not reach it
+            setattr(st, name, timed_chart(getattr(st, name)))
+
+
+# =====================================
+# Driving the pages
+# =====================================
+def make_app(definition, dashboard_dir, timeout):
+    from streamlit.testing.v1 import AppTest
+    if definition["kind"] == "page":
+        return AppTest.from_file(os.path.join(dashboard_dir, definition["target"]), default_timeout=timeout)
+
+    module_name, func_name = definition["target"].split(":")
+    script = (
+        "import sys\n"
+        f"sys.path[:0] = [{os.path.dirname(dashboard_dir)!r}, {dashboard_dir!r}]\n"
+        f"from {module_name} import {func_name}\n"
+        f"{func_name}()\n"
+    )
+    return AppTest.from_string(script, default_timeout=timeout)
+
+
+def find_widget(at, ident):
+    """Widget by key first, then by label."""
+    for kind in WIDGET_TYPES:
+        for widget in getattr(at, kind, []):
+            if getattr(widget, "key", None) == ident or widget.label == ident:
+                return kind, widget
+    return None, None
+
+
+def widget_choices(kind, widget, per_widget):
+    """Spread `per_widget` picks over the options: first, last, then evenly in between."""
+    if kind in ("checkbox", "toggle"):
+        return [True, False][:per_widget]
+    n = len(widget.options)
+    if n <= per_widget:
+        return list(range(n))
+    picks = {round(i * (n - 1) / (per_widget - 1)) for i in range(per_widget)} if per_widget > 1 else {0}
+    return sorted(picks)
+
+
+def apply_choice(at, ident, choice):
+    """Set one widget; returns the human-readable value that was selected."""
+    kind, widget = find_widget(at, ident)
+    if widget is None:
+        return None
+    if kind in ("checkbox", "toggle"):
+        widget.set_value(choice)
+        return choice
+    index = min(choice, len(widget.options) - 1)
+    if kind == "selectbox":
+        widget.select_index(index)
+    else:
+        widget.set_value(widget.options[index])
+    return widget.options[index]
+
+
+def render(at, trace):
+    """One AppTest run with the counters reset around it."""
+    for name in COUNTERS:
+        COUNTERS[name] = 0 if isinstance(COUNTERS[name], int) else 0.0
+    if trace:
+        tracemalloc.start()
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    at.run()
+    result = {
+        "wall_s": round(time.perf_counter() - wall, 4),
+        "cpu_s": round(time.process_time() - cpu, 4),
+        "queries": COUNTERS["queries"],
+        "rows_fetched": COUNTERS["rows_fetched"],
+        "db_time_s": round(COUNTERS["db_time_s"], 4),
+        "charts": COUNTERS["charts"],
+        "chart_time_s": round(COUNTERS["chart_time_s"], 4),
+    }
+    if trace:
+        result["py_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+        tracemalloc.stop()
+    if at.exception:
+        result["error"] = at.exception[0].message
+    return result
+
+
+def profile_section(definition, dashboard_dir, per_widget=3, max_combos=12, repeat=3, trace=True, timeout=120):
+    """Every scenario of one section: default selection, then the widget matrix."""
+    at = make_app(definition, dashboard_dir, timeout)
+    at.run()  # warm-up: module imports and first-touch caches are not what we rank
+    if at.exception:
+        return [{"section": definition["name"], "scenario": "default", "status": "error",
+                 "error": at.exception[0].message}]
+
+    vary = []
+    for ident in definition["vary"]:
+        kind, widget = find_widget(at, ident)
+        if widget is None:
+            print(f"   ⚠️ {definition['name']}: no widget '{ident}' — not varied")
+            continue
+        vary.append((ident, widget_choices(kind, widget, per_widget)))
+
+    matrix = [()] + list(itertools.islice(
+        itertools.product(*[choices for _, choices in vary]), max_combos))
+
+    scenarios = []
+    for combo in matrix:
+        selection = {ident: apply_choice(at, ident, choice) for (ident, _), choice in zip(vary, combo)}
+        runs = [render(at, False) for _ in range(repeat)]
+        traced = render(at, True) if trace else {}
+
+        errors = [r["error"] for r in runs + [traced] if r.get("error")]
+        scenario = {
+            "section": definition["name"],
+            "scenario": "default" if not combo else ", ".join(f"{k}={v}" for k, v in selection.items()),
+            "selection": selection,
+            "status": "error" if errors else "ok",
+            "runs": runs,
+            "wall_s": round(statistics.median(r["wall_s"] for r in runs), 4),
+            "py_peak_mb": traced.get("py_peak_mb"),
+        }
+        for field in ["cpu_s", "queries", "rows_fetched", "db_time_s", "charts", "chart_time_s"]:
+            scenario[field] = statistics.median(r[field] for r in runs)
+        if errors:
+            scenario["error"] = errors[0]
+        scenarios.append(scenario)
+
+        flag = "✅" if scenario["status"] == "ok" else "❌"
+        print(f"   {flag} {scenario['scenario'][:70]:<70} {scenario['wall_s']:8.3f}s")
+    return scenarios
+
+
+# =====================================
+# Report
+# =====================================
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def summarize_section(name, scenarios):
+    ok = [s for s in scenarios if s["status"] == "ok"]
+    if not ok:
+        return {"status": "error", "error": scenarios[0].get("error", "no successful renders")}
+
+    walls = [r["wall_s"] for s in ok for r in s["runs"]]
+    slowest = max(ok, key=lambda s: s["wall_s"])
+    peaks = [s["py_peak_mb"] for s in ok if s.get("py_peak_mb") is not None]
+    summary = {
+        "status": "ok" if len(ok) == len(scenarios) else "partial",
+        "scenarios": len(scenarios),
+        "renders": len(walls),
+        "wall_s": round(statistics.median(walls), 4),
+        "wall_p95_s": round(percentile(walls, 0.95), 4),
+        "wall_max_s": round(max(walls), 4),
+        "py_peak_mb": max(peaks) if peaks else None,
+        "slowest_scenario": slowest["scenario"],
+        "errors": len(scenarios) - len(ok),
+    }
+    for field in ["cpu_s", "queries", "rows_fetched", "db_time_s", "charts", "chart_time_s"]:
+        summary[field] = round(statistics.median(s[field] for s in ok), 4)
+    # Where the render time goes: driver, chart serialisation, everything else (pandas, widgets, layout)
+    wall = summary["wall_s"] or 1e-9
+    summary["db_share"] = round(min(summary["db_time_s"] / wall, 1.0), 3)
+    summary["chart_share"] = round(min(summary["chart_time_s"] / wall, 1.0), 3)
+    return summary
+
+
+def print_report(report, baseline=None, top=10):
+    ranked = sorted(report["sections"].items(), key=lambda kv: kv[1].get("wall_s", 0), reverse=True)
+
+    print(f"\n{'section':<22}{'status':<9}{'p50 s':>8}{'p95 s':>8}{'queries':>9}{'rows':>9}"
+          f"{'db %':>7}{'chart %':>9}{'py MB':>8}{'vs base':>9}")
+    print("-" * 98)
+    for name, s in ranked:
+        if s["status"] == "error":
+            print(f"{name:<22}{'ERROR':<9}  {s.get('error', '')[:60]}")
+            continue
+        delta = ""
+        base = (baseline or {}).get("sections", {}).get(name)
+        if base and base.get("status") in ("ok", "partial") and base.get("wall_s"):
+            delta = f"{(s['wall_s'] / base['wall_s'] - 1) * 100:+.0f}%"
+        print(f"{name:<22}{s['status']:<9}{s['wall_s']:>8.3f}{s['wall_p95_s']:>8.3f}{s['queries']:>9.0f}"
+              f"{s['rows_fetched']:>9.0f}{s['db_share'] * 100:>6.0f}%{s['chart_share'] * 100:>8.0f}%"
+              f"{s['py_peak_mb'] or 0:>8.1f}{delta:>9}")
+
+    hot = sorted((s for s in report["scenarios"] if s["status"] == "ok"), key=lambda s: s["wall_s"], reverse=True)
+    print("\n🔥 Slowest selections")
+    for s in hot[:top]:
+        print(f"   {s['wall_s']:7.3f}s  {s['section']:<20} {s['scenario'][:60]}"
+              f"  ({s['queries']:.0f} queries, {s['rows_fetched']:.0f} rows, {s['chart_time_s']:.2f}s charts)")
+    print()
+
+
+def as_stages(report):
+    """Report in the shape compare() reads; a partially failing section still has comparable timings."""
+    return {"stages": {name: dict(s, status="ok" if s["status"] == "partial" else s["status"])
+                       for name, s in report["sections"].items()}}
+
+
+def save_report(report, path=None):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = path or os.path.join(RESULTS_DIR, f"dash_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    for target in [path, os.path.join(RESULTS_DIR, "dash_latest.json")]:
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return path
+
+
+# =====================================
+# Main
+# =====================================
+def build_workspace(workspace, seasons, seed):
+    """Synthetic league → benchmark DB, via the same loader stages run_benchmarks.py times."""
+    input_dir = prepare_workspace(workspace, seasons, seed)
+    db_path = os.path.join(workspace, "bench.db")
+    reset_database(db_path, input_dir)
+    with open(os.path.join(workspace, "logs", "loaders.log"), "w", encoding="utf-8") as log:
+        for definition in [s for s in STAGES if s["group"] == "loaders" or s["name"] in DERIVED_STAGES]:
+            result = run_stage(workspace, db_path, input_dir, definition, False, log)
+            flag = "✅" if result["status"] == "ok" else "❌"
+            print(f"   {flag} {definition['name']}")
+    return db_path
+
+
+def profile_dashboards(seasons=2, seed=42, repeat=3, per_widget=3, max_combos=12, only=None,
+                       trace=True, live=False, workspace=None, keep=False, timeout=120):
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError:
+        print("❌ streamlit is not installed — nothing to profile")
+        return None
+
+    selected = [s for s in SECTIONS if not only or s["name"] in only]
+    if live:
+        workspace = None
+        dashboard_dir = os.path.join(PROJECT_ROOT, "dashboard")
+        print("🏛 Profiling against config.get_connection() (live database)")
+    else:
+        workspace = workspace or tempfile.mkdtemp(prefix="sdi_dash_")
+        os.makedirs(workspace, exist_ok=True)
+        print(f"📁 Workspace: {workspace}")
+        print(f"🏗️ Loading {seasons} synthetic season(s)...")
+        os.environ["SDI_BENCH_DB"] = build_workspace(workspace, seasons, seed)
+        # The workspace config.py (pointing at the stand-in) must win over the project one
+        sys.path.insert(0, workspace)
+        dashboard_dir = os.path.join(workspace, "dashboard")
+
+    install_hooks()
+
+    scenarios = []
+    for definition in selected:
+        print(f"\n🖥️ {definition['name']}")
+        scenarios.extend(profile_section(definition, dashboard_dir, per_widget, max_combos,
+                                         repeat, trace, timeout))
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "config": {"seasons": None if live else seasons, "seed": seed, "repeat": repeat,
+                   "per_widget": per_widget, "max_combos": max_combos, "live": live},
+        "sections": {s["name"]: summarize_section(s["name"], [x for x in scenarios if x["section"] == s["name"]])
+                     for s in selected},
+        "scenarios": scenarios,
+    }
+
+    if workspace and not keep:
+        shutil.rmtree(workspace, ignore_errors=True)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile dashboard renders headlessly over a matrix of widget selections")
+    parser.add_argument("--seasons", type=int, default=2, help="synthetic seasons to load")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="timed renders per selection (median is reported)")
+    parser.add_argument("--per-widget", type=int, default=3, help="options tried per varied widget")
+    parser.add_argument("--max-combos", type=int, default=12, help="cap on widget combinations per section")
+    parser.add_argument("--only", action="append", help="profile just these sections (repeatable)")
+    parser.add_argument("--no-trace", action="store_true", help="skip the tracemalloc render")
+    parser.add_argument("--live", action="store_true", help="use config.get_connection() instead of synthetic data")
+    parser.add_argument("--workspace", help="reuse this directory instead of a temp dir")
+    parser.add_argument("--keep", action="store_true", help="keep the workspace (DB, loader logs)")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per render")
+    parser.add_argument("--top", type=int, default=10, help="slowest selections to list")
+    parser.add_argument("--out", help="report file (default benchmarks/results/dash_<timestamp>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args()
+
+    report = profile_dashboards(args.seasons, args.seed, args.repeat, args.per_widget, args.max_combos,
+                                args.only, not args.no_trace, args.live, args.workspace, args.keep, args.timeout)
+    if report is None:
+        sys.exit(1)
+    out = save_report(report, args.out)
+
+    baseline = load_json(args.baseline) if os.path.exists(args.baseline) else None
+    print_report(report, baseline, args.top)
+    print(f"💾 Report → {out}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 Baseline updated → {args.baseline}")
+    elif baseline:
+        regressions = compare(as_stages(report), as_stages(baseline), args.threshold)
+        if regressions:
+            print("❌ Render regressions vs baseline:")
+            for name, metric, before, after in regressions:
+                print(f"   {name}: {metric} {before} → {after}")
+            sys.exit(1)
+        print("✅ No render regressions vs baseline")
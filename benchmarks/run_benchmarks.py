@@ -0,0 +1,343 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import statistics
+import pandas as pd
+
+# Make sure Python can see the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.local_db import connect, apply_schema
+from benchmarks.mock_balldontlie import LeagueData, Faults, start_server
+from etl_scripts.generate_synthetic_league import generate_league
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(PROJECT_ROOT, "benchmarks")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+SCHEMA_PATH = os.path.join(BENCH_DIR, "schema.sql")
+RUNNER_PATH = os.path.join(BENCH_DIR, "stage_runner.py")
+
+# Code copied into every workspace; outputs (data/, models/, CSVs) stay in there
+CODE_DIRS = ["analytics", "etl_scripts", "dashboard", "benchmarks"]
+CODE_FILES = ["config_goat.py", "query_profiler.py", "profiling.py"]
+
+THRESHOLD = 0.20           # +20% over baseline is a regression...
+MIN_DELTA_S = 0.05         # ...if it is also at least this many seconds
+MIN_DELTA_MB = 5.0         # ...or this many MB of traced Python memory
+
+WORKSPACE_CONFIG = '''import os
+from benchmarks.local_db import connect
+from query_profiler import wrap
+
+# Written by benchmarks/run_benchmarks.py — every script in this workspace
+# talks to the local benchmark database instead of Oracle.
+def get_connection():
+    return wrap(connect(os.environ["SDI_BENCH_DB"]))
+'''
+
+
+# =====================================
+# Stages (run in order; later ones read what earlier ones wrote)
+# =====================================
+def stage(name, group, kind, target, *args):
+    return {"name": name, "group": group, "kind": kind, "target": target, "args": list(args)}
+
+
+STAGES = [
+    stage("load_game_logs", "loaders", "call", "etl_scripts.load_game_logs:load_game_logs", "{input}/nba_game_logs.csv"),
+    stage("load_team_stats", "loaders", "call", "etl_scripts.load_csv_to_oracle:load_csv_to_oracle", "{input}/nba_team_stats.csv"),
+    stage("load_player_stats", "loaders", "call", "etl_scripts.load_player_stats_csv:load_player_stats_from_csv", "{input}/nba_player_stats.csv"),
+
+    stage("api_fetch_players", "api", "script", "etl_scripts/fetch_players.py"),
+    stage("api_fetch_games", "api", "script", "etl_scripts/fetch_games.py"),
+    stage("api_load_players", "api", "call", "etl_scripts.etl_load_players:load_players", 10),
+
+    stage("build_v1", "builders", "call", "analytics.build_win_training_data:build_training_data"),
+    stage("build_v2", "builders", "script", "analytics/build_win_training_data_v2.py"),
+    stage("build_v3", "builders", "script", "analytics/build_win_training_data_v3.py"),
+    stage("build_leaders", "builders", "call", "analytics.leaderboards:update_leaderboards"),
+    stage("build_player_store", "builders", "call", "analytics.player_log_store:build_player_store"),
+    stage("build_player_form", "builders", "call", "analytics.player_form:update_player_form"),
+    stage("build_player_advanced", "builders", "call", "analytics.player_advanced:update_player_advanced"),
+
+    stage("train_v1", "training", "call", "analytics.train_win_model:train_model"),
+    stage("train_v2", "training", "script", "analytics/train_win_model_v2.py"),
+    stage("train_v3", "training", "script", "analytics/train_win_model_v3.py"),
+
+    stage("dash_team_view", "dashboards", "streamlit", "sections.team_view:render_team_view"),
+    stage("dash_players_view", "dashboards", "streamlit", "sections.players_view:render_players_view"),
+    stage("dash_game_logs_view", "dashboards", "streamlit", "sections.game_logs_view:render_game_logs_view"),
+]
+
+
+# =====================================
+# Workspace
+# =====================================
+def prepare_workspace(workspace, seasons, seed):
+    """Copy the code, point config.py at the stand-in and generate the input data."""
+    for name in CODE_DIRS:
+        dst = os.path.join(workspace, name)
+        shutil.rmtree(dst, ignore_errors=True)
+        shutil.copytree(os.path.join(PROJECT_ROOT, name), dst,
+                        ignore=shutil.ignore_patterns("__pycache__", "results", "*.pkl", "*.forest"))
+    for name in CODE_FILES:
+        shutil.copy(os.path.join(PROJECT_ROOT, name), workspace)
+    with open(os.path.join(workspace, "config.py"), "w", encoding="utf-8") as f:
+        f.write(WORKSPACE_CONFIG)
+    for name in ["data", "models", "logs"]:
+        os.makedirs(os.path.join(workspace, name), exist_ok=True)
+
+    input_dir = os.path.join(workspace, "input")
+    generate_league(seasons, seed=seed, out_dir=input_dir)
+    return input_dir
+
+
+def reset_database(db_path, input_dir):
+    """Fresh schema plus the tables the API loaders would normally fill (not timed)."""
+    for suffix in ["", "-wal", "-shm"]:
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    apply_schema(db_path, SCHEMA_PATH)
+
+    box = pd.read_csv(os.path.join(input_dir, "nba_player_game_stats.csv"))
+    cols = ["PLAYER_ID", "PLAYER_NAME", "TEAM_NAME", "SEASON", "GAME_DATE", "POINTS",
+            "REBOUNDS", "ASSISTS", "STEALS", "BLOCKS", "TURNOVERS", "MINUTES"]
+    conn = connect(db_path)
+    cursor = conn.cursor()
+    cursor.executemany(f"""
+        INSERT INTO NBA_PLAYER_LIVE_STATS ({', '.join(cols)})
+        VALUES ({', '.join(f':{i + 1}' for i in range(len(cols)))})
+    """, box[cols].itertuples(index=False, name=None))
+    conn.commit()
+    conn.close()
+
+
+def run_stage(workspace, db_path, input_dir, definition, trace, log, api_url=None):
+    args = [a.format(input=input_dir) if isinstance(a, str) else a for a in definition["args"]]
+    definition = dict(definition, args=args)
+    out_path = os.path.join(workspace, "logs", f"{definition['name']}.json")
+
+    env = dict(os.environ, SDI_BENCH_DB=db_path, PYTHONIOENCODING="utf-8", MPLBACKEND="Agg",
+               SDI_QUERY_SOURCE=definition["name"])
+    if api_url:
+        env["BALLDONTLIE_BASE_URL"] = api_url
+    cmd = [sys.executable, RUNNER_PATH, "--workspace", workspace,
+           "--stage", json.dumps(definition), "--out", out_path]
+    if trace:
+        cmd.append("--trace")
+
+    proc = subprocess.run(cmd, cwd=workspace, env=env, stdout=log, stderr=subprocess.STDOUT)
+    if proc.returncode != 0 or not os.path.exists(out_path):
+        return {"stage": definition["name"], "status": "error", "error": f"runner exited {proc.returncode}"}
+    with open(out_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# =====================================
+# Results + baseline comparison
+# =====================================
+def summarize(name, group, runs, traced):
+    ok = [r for r in runs if r["status"] == "ok"]
+    summary = {"group": group, "status": "ok" if ok and len(ok) == len(runs) else "error"}
+    if not ok:
+        summary["error"] = runs[0].get("error") if runs else "not run"
+        return summary
+
+    walls = [r["wall_s"] for r in ok]
+    summary.update({
+        "wall_s": round(statistics.median(walls), 4),
+        "wall_min_s": min(walls),
+        "wall_runs": walls,
+        "cpu_s": round(statistics.median(r["cpu_s"] for r in ok), 4),
+        "peak_rss_mb": max((r["peak_rss_mb"] or 0) for r in ok) or None,
+        "db_queries": ok[-1]["db_queries"],
+        "db_rows_written": ok[-1]["db_rows_written"],
+        "db_time_s": round(statistics.median(r["db_time_s"] for r in ok), 4),
+    })
+    if traced and traced.get("status") == "ok":
+        summary["py_peak_mb"] = traced["py_peak_mb"]
+    return summary
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """Stages that got slower / hungrier than the baseline by more than the threshold."""
+    regressions = []
+    for name, cur in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if not base or base.get("status") != "ok":
+            continue
+        if cur.get("status") != "ok":
+            regressions.append((name, "status", base.get("status"), cur.get("status")))
+            continue
+
+        if cur["wall_s"] > base["wall_s"] * (1 + threshold) and cur["wall_s"] - base["wall_s"] >= MIN_DELTA_S:
+            regressions.append((name, "wall_s", base["wall_s"], cur["wall_s"]))
+
+        cur_mem, base_mem = cur.get("py_peak_mb"), base.get("py_peak_mb")
+        if cur_mem and base_mem and cur_mem > base_mem * (1 + threshold) and cur_mem - base_mem >= MIN_DELTA_MB:
+            regressions.append((name, "py_peak_mb", base_mem, cur_mem))
+    return regressions
+
+
+def print_table(results, baseline=None):
+    print(f"\n{'stage':<22}{'status':<8}{'wall s':>9}{'cpu s':>9}{'db s':>8}{'queries':>9}{'py MB':>9}{'rss MB':>9}{'vs base':>10}")
+    print("-" * 93)
+    for name, r in results["stages"].items():
+        if r["status"] != "ok":
+            print(f"{name:<22}{'ERROR':<8}  {r.get('error', '')[:60]}")
+            continue
+        delta = ""
+        base = (baseline or {}).get("stages", {}).get(name)
+        if base and base.get("status") == "ok" and base["wall_s"]:
+            delta = f"{(r['wall_s'] / base['wall_s'] - 1) * 100:+.0f}%"
+        print(f"{name:<22}{'ok':<8}{r['wall_s']:>9.3f}{r['cpu_s']:>9.3f}{r['db_time_s']:>8.2f}"
+              f"{r['db_queries']:>9}{r.get('py_peak_mb', 0) or 0:>9.1f}{r['peak_rss_mb'] or 0:>9.0f}{delta:>10}")
+    print()
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(seasons=2, seed=42, repeat=3, groups=None, only=None, trace=True,
+                   workspace=None, keep=False, faults=None):
+    selected = [s for s in STAGES
+                if (not groups or s["group"] in groups) and (not only or s["name"] in only)]
+    if any(s["group"] == "api" for s in selected):
+        try:
+            import requests  # noqa: F401
+        except ImportError:
+            print("⚠️ requests not installed — skipping API loader stages")
+            selected = [s for s in selected if s["group"] != "api"]
+    if any(s["kind"] == "streamlit" for s in selected):
+        try:
+            import streamlit.testing.v1  # noqa: F401
+        except ImportError:
+            print("⚠️ streamlit not installed — skipping dashboard stages")
+            selected = [s for s in selected if s["kind"] != "streamlit"]
+
+    workspace = workspace or tempfile.mkdtemp(prefix="sdi_bench_")
+    os.makedirs(workspace, exist_ok=True)
+    db_path = os.path.join(workspace, "bench.db")
+    print(f"\n⏱️ Benchmarking {len(selected)} stages — {seasons} season(s), {repeat} round(s)")
+    print(f"📁 Workspace: {workspace}")
+
+    input_dir = prepare_workspace(workspace, seasons, seed)
+
+    # API loaders talk to a local mock of balldontlie serving the same league
+    server = None
+    if any(s["group"] == "api" for s in selected):
+        server = start_server(LeagueData.from_dir(input_dir), faults=faults or Faults())
+        print(f"🛰️ Mock balldontlie API on {server.base_url}")
+
+    runs = {s["name"]: [] for s in selected}
+    traced = {}
+
+    # Timed rounds, then one traced round (tracemalloc skews timings, so it gets its own)
+    rounds = [(i, False) for i in range(repeat)] + ([(repeat, True)] if trace else [])
+    with open(os.path.join(workspace, "logs", "stages.log"), "w", encoding="utf-8") as log:
+        for i, is_traced in rounds:
+            print(f"\n🔁 Round {i + 1}/{len(rounds)}{' (tracemalloc)' if is_traced else ''}")
+            reset_database(db_path, input_dir)
+            for definition in selected:
+                log.write(f"\n===== round {i + 1} — {definition['name']} =====\n")
+                log.flush()
+                result = run_stage(workspace, db_path, input_dir, definition, is_traced, log,
+                                   server.base_url if server else None)
+                if is_traced:
+                    traced[definition["name"]] = result
+                else:
+                    runs[definition["name"]].append(result)
+                flag = "✅" if result["status"] == "ok" else "❌"
+                print(f"   {flag} {definition['name']:<22} {result.get('wall_s', 0):8.3f}s")
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"seasons": seasons, "seed": seed, "repeat": repeat},
+        "stages": {s["name"]: summarize(s["name"], s["group"], runs[s["name"]], traced.get(s["name"]))
+                   for s in selected},
+    }
+    if server:
+        results["api"] = server.snapshot()
+        server.shutdown()
+        server.server_close()
+
+    if not keep:
+        shutil.rmtree(workspace, ignore_errors=True)
+    else:
+        print(f"\n📝 Stage output kept in {os.path.join(workspace, 'logs')}")
+    return results
+
+
+def save_results(results, path=None):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = path or os.path.join(RESULTS_DIR, f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    for target in [path, os.path.join(RESULTS_DIR, "latest.json")]:
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return path
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time and memory-profile the ETL / builder / training / dashboard stages")
+    parser.add_argument("--seasons", type=int, default=2, help="synthetic seasons to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="timed rounds per stage (median is reported)")
+    parser.add_argument("--group", action="append", choices=["loaders", "api", "builders", "training", "dashboards"])
+    parser.add_argument("--only", action="append", help="run just these stages (repeatable)")
+    parser.add_argument("--no-trace", action="store_true", help="skip the tracemalloc round")
+    parser.add_argument("--workspace", help="reuse this directory instead of a temp dir")
+    parser.add_argument("--keep", action="store_true", help="keep the workspace (logs, DB, outputs)")
+    parser.add_argument("--out", help="results file (default benchmarks/results/bench_<timestamp>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="mock API latency per request (ms)")
+    parser.add_argument("--api-rate-limit", type=int, default=0, help="mock API requests per minute (0 = unlimited)")
+    parser.add_argument("--api-error-rate", type=float, default=0.0, help="fraction of mock API requests that fail")
+    args = parser.parse_args()
+
+    faults = Faults(latency_ms=args.api_latency, rate_limit=args.api_rate_limit, error_rate=args.api_error_rate)
+    results = run_benchmarks(args.seasons, args.seed, args.repeat, args.group, args.only,
+                             not args.no_trace, args.workspace, args.keep, faults)
+    out = save_results(results, args.out)
+
+    baseline = load_json(args.baseline) if os.path.exists(args.baseline) else None
+    print_table(results, baseline)
+    print(f"💾 Results → {out}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📌 Baseline updated → {args.baseline}")
+    elif baseline:
+        if baseline.get("config", {}).get("seasons") != results["config"]["seasons"]:
+            print("⚠️ Baseline was recorded with a different --seasons; comparison is not like-for-like")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for name, metric, old, new in regressions:
+                print(f"   • {name}: {metric} {old} → {new}")
+            sys.exit(1)
+        print(f"\n✅ No regressions over {args.threshold:.0%} vs baseline")
+    else:
+        print("ℹ️ No baseline yet — run again with --save-baseline to store one")
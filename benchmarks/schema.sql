@@ -0,0 +1,73 @@
+-- Base tables the loaders write into. On the real warehouse these already
+-- exist in Oracle; the benchmark stand-in (benchmarks/local_db.py) creates
+-- them in SQLite before each round. Derived tables (SRS, Elo, standings,
+-- head-to-head, ...) are created by the scripts themselves.
+
+CREATE TABLE IF NOT EXISTS NBA_GAME_LOGS (
+    GAME_ID      INTEGER PRIMARY KEY AUTOINCREMENT,
+    GAME_DATE    DATE,
+    SEASON       NUMBER,
+    HOME_TEAM    VARCHAR2(100),
+    AWAY_TEAM    VARCHAR2(100),
+    HOME_POINTS  NUMBER,
+    AWAY_POINTS  NUMBER,
+    WINNER       VARCHAR2(100),
+    LOSER        VARCHAR2(100),
+    HOME_STREAK  NUMBER,
+    AWAY_STREAK  NUMBER,
+    NOTES        VARCHAR2(200)
+);
+CREATE INDEX IF NOT EXISTS NBA_GAME_LOGS_SEASON_IX ON NBA_GAME_LOGS (SEASON, GAME_DATE);
+
+CREATE TABLE IF NOT EXISTS NBA_TEAM_STATS (
+    TEAM_ID    NUMBER,
+    TEAM_NAME  VARCHAR2(100),
+    SEASON     NUMBER,
+    WINS       NUMBER,
+    LOSSES     NUMBER,
+    WIN_PCT    NUMBER,
+    POINTS     NUMBER
+);
+
+CREATE TABLE IF NOT EXISTS NBA_PLAYER_STATS (
+    PLAYER_NAME    VARCHAR2(100),
+    TEAM_NAME      VARCHAR2(100),
+    SEASON         NUMBER,
+    GAMES_PLAYED   NUMBER,
+    MINUTES        NUMBER,
+    POINTS         NUMBER,
+    ASSISTS        NUMBER,
+    REBOUNDS       NUMBER,
+    STEALS         NUMBER,
+    BLOCKS         NUMBER,
+    TURNOVERS      NUMBER,
+    FG_PERCENT     NUMBER,
+    THREE_PERCENT  NUMBER,
+    FT_PERCENT     NUMBER
+);
+
+CREATE TABLE IF NOT EXISTS NBA_PLAYER_LIVE_STATS (
+    PLAYER_ID    NUMBER,
+    PLAYER_NAME  VARCHAR2(100),
+    TEAM_NAME    VARCHAR2(100),
+    SEASON       NUMBER,
+    GAME_DATE    DATE,
+    POINTS       NUMBER,
+    REBOUNDS     NUMBER,
+    ASSISTS      NUMBER,
+    STEALS       NUMBER,
+    BLOCKS       NUMBER,
+    TURNOVERS    NUMBER,
+    MINUTES      NUMBER
+);
+CREATE INDEX IF NOT EXISTS NBA_PLAYER_LIVE_STATS_IX ON NBA_PLAYER_LIVE_STATS (PLAYER_ID, GAME_DATE);
+
+CREATE TABLE IF NOT EXISTS NBA_PLAYERS (
+    PLAYER_ID   NUMBER PRIMARY KEY,
+    FIRST_NAME  VARCHAR2(50),
+    LAST_NAME   VARCHAR2(50),
+    TEAM_NAME   VARCHAR2(100),
+    POSITION    VARCHAR2(10),
+    HEIGHT      VARCHAR2(10),
+    WEIGHT      VARCHAR2(10)
+);
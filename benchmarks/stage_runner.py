@@ -0,0 +1,113 @@
+"""
+Runs ONE benchmark stage inside the benchmark workspace and writes its
+measurements as JSON. Started as a fresh subprocess by run_benchmarks.py so
+every stage pays its own imports, gets its own peak-RSS reading and cannot
+leak caches into the next stage.
+"""
+
+import os
+import sys
+import json
+import time
+import runpy
+import argparse
+import importlib
+import traceback
+import tracemalloc
+
+try:
+    import resource
+except ImportError:          # Windows
+    resource = None
+
+# Library imports are not what we are measuring — pay for them before the clock starts
+import numpy  # noqa: F401
+import pandas  # noqa: F401
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_target(stage, workspace):
+    kind, target = stage["kind"], stage["target"]
+    args = stage.get("args", [])
+
+    if kind == "call":
+        module_name, func_name = target.split(":")
+        return getattr(importlib.import_module(module_name), func_name)(*args)
+
+    if kind == "script":
+        sys.argv = [target] + list(args)
+        try:
+            runpy.run_path(os.path.join(workspace, target), run_name="__main__")
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                raise
+        return None
+
+    if kind == "streamlit":
+        from streamlit.testing.v1 import AppTest
+        module_name, func_name = target.split(":")
+        script = (
+            "import sys\n"
+            f"sys.path[:0] = [{workspace!r}, {os.path.join(workspace, 'dashboard')!r}]\n"
+            f"from {module_name} import {func_name}\n"
+            f"{func_name}()\n"
+        )
+        at = AppTest.from_string(script, default_timeout=stage.get("timeout", 120))
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return None
+
+    raise ValueError(f"Unknown stage kind: {kind}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one benchmark stage (used by run_benchmarks.py)")
+    parser.add_argument("--workspace", required=True)
+    parser.add_argument("--stage", required=True, help="stage definition as JSON")
+    parser.add_argument("--out", required=True, help="where to write the measurement JSON")
+    parser.add_argument("--trace", action="store_true", help="measure Python allocations with tracemalloc")
+    args = parser.parse_args()
+
+    stage = json.loads(args.stage)
+    os.chdir(args.workspace)
+    sys.path.insert(0, args.workspace)
+
+    from benchmarks import local_db
+
+    result = {"stage": stage["name"], "status": "ok"}
+    if args.trace:
+        tracemalloc.start()
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        run_target(stage, args.workspace)
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        traceback.print_exc()
+    result["wall_s"] = round(time.perf_counter() - wall, 4)
+    result["cpu_s"] = round(time.process_time() - cpu, 4)
+
+    if args.trace:
+        result["py_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+        tracemalloc.stop()
+
+    result["peak_rss_mb"] = peak_rss_mb()
+    result["db_queries"] = local_db.STATS["queries"]
+    result["db_rows_written"] = local_db.STATS["rows_written"]
+    result["db_time_s"] = round(local_db.STATS["db_time_s"], 4)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+if __name__ == "__main__":
+    main()
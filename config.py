@@ -1,4 +1,5 @@
 import cx_Oracle
+from query_profiler import wrap
 
 USERNAME = "ENV_DATABASE_USER"
 PASSWORD = "ENV_DATABASE_PASSWORD"
@@ -8,4 +9,5 @@ SERVICE_NAME = "orcl"
 
 def get_connection():
     dsn = cx_Oracle.makedsn(HOST, PORT, service_name=SERVICE_NAME)
-    return cx_Oracle.connect(user=USERNAME, password=PASSWORD, dsn=dsn)
+    # No-op unless SDI_QUERY_PROFILE is set (see query_profiler.py)
+    return wrap(cx_Oracle.connect(user=USERNAME, password=PASSWORD, dsn=dsn))
@@ -2,9 +2,12 @@
 #  GOAT / BallDontLie API CONFIG
 # ==============================
 
+import os
+
 API_KEY = "YOUR_API_KEY_HERE"  # your working key
 
-BASE_URL = "https://api.balldontlie.io/v1"
+# Point the ETL at benchmarks/mock_balldontlie.py (or any stand-in) without editing code
+BASE_URL = os.environ.get("BALLDONTLIE_BASE_URL", "https://api.balldontlie.io/v1").rstrip("/")
 
 HEADERS = {
     "Authorization": API_KEY
@@ -1,29 +1,62 @@
+import os
+import sys
 import streamlit as st
-import cx_Oracle
 import pandas as pd
 import altair as alt
 
-def connect():
-    return cx_Oracle.connect("sports_analytics/123@localhost:1521/XEPDB1")
+# Make sure Python can see config.py in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import get_connection
+from dashboard.utils.player_store import get_player_store
+
 
 st.title("📈 Game Log Explorer")
 
-player_id = st.number_input("Enter Player ID", min_value=1)
+store = get_player_store()
+
+if store is None:
+    # No store yet: one query per interaction, as before
+    st.caption("Run `python analytics/player_log_store.py` for instant lookups and overlays.")
+    player_id = st.number_input("Enter Player ID", min_value=1)
+
+    conn = get_connection()
+    df = pd.read_sql("""
+        SELECT GAME_DATE, POINTS, REBOUNDS, ASSISTS
+        FROM NBA_PLAYER_LIVE_STATS
+        WHERE PLAYER_ID = :player_id
+        ORDER BY GAME_DATE
+    """, conn, params={"player_id": int(player_id)})
+    conn.close()
+
+    st.write(df)
+    chart = (
+        alt.Chart(df)
+        .mark_line(point=True)
+        .encode(x="GAME_DATE:T", y="POINTS:Q")
+    )
+    st.altair_chart(chart, use_container_width=True)
+    st.stop()
+
+# "Name (id)" → id, so the pickers can show names
+labels = {f"{name or 'Player'} ({pid})": pid for pid, name in store.players().items()}
+windows = {"off": None, "last 5 games": 5, "last 10 games": 10, "last 20 games": 20}
+
+player = st.selectbox("Player", list(labels))
+others = st.multiselect("Overlay players", [p for p in labels if p != player])
+stat = st.selectbox("Stat", ["POINTS", "REBOUNDS", "ASSISTS", "STEALS", "BLOCKS", "MINUTES"])
+window = st.selectbox("Rolling average", list(windows), index=1)
 
-conn = connect()
-df = pd.read_sql(f"""
-    SELECT GAME_DATE, POINTS, REBOUNDS, ASSISTS
-    FROM NBA_PLAYER_LIVE_STATS
-    WHERE PLAYER_ID = {player_id}
-    ORDER BY GAME_DATE
-""", conn)
+st.write(store.game_log(labels[player], columns=["POINTS", "REBOUNDS", "ASSISTS"]))
 
-st.write(df)
+chosen = [player] + others
+overlay = store.overlay([labels[p] for p in chosen], stat, windows[window])
+overlay["PLAYER"] = overlay["PLAYER_ID"].map({labels[p]: p for p in chosen})
 
 chart = (
-    alt.Chart(df)
-    .mark_line(point=True)
-    .encode(x="GAME_DATE:T", y="POINTS:Q")
+    alt.Chart(overlay)
+    .mark_line(point=not others)
+    .encode(x="GAME_DATE:T", y=alt.Y(f"{stat}:Q", title=stat), color="PLAYER:N")
 )
 
 st.altair_chart(chart, use_container_width=True)
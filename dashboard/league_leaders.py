@@ -1,23 +1,32 @@
+import os
+import sys
 import streamlit as st
-import cx_Oracle
-import pandas as pd
 
-def connect():
-    return cx_Oracle.connect("sports_analytics/123@localhost:1521/XEPDB1")
+# Make sure Python can see config.py in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import get_connection
+from analytics.leaderboards import CATEGORIES, fetch_leaders, leader_seasons
 
 st.title("🏀 NBA League Leaders")
 
-metric = st.selectbox("Sort By", ["POINTS", "REBOUNDS", "ASSISTS", "STEALS", "BLOCKS"])
+conn = get_connection()
+seasons = leader_seasons(conn)
+
+if not seasons:
+    st.info("No leaderboards yet — run `python analytics/leaderboards.py` after loading live stats.")
+    conn.close()
+    st.stop()
 
-query = f"""
-    SELECT PLAYER_ID, AVG({metric}) AS AVG_STAT
-    FROM NBA_PLAYER_LIVE_STATS
-    GROUP BY PLAYER_ID
-    ORDER BY AVG_STAT DESC FETCH FIRST 10 ROWS ONLY
-"""
+season = st.selectbox("Season", seasons)
+metric = st.selectbox("Sort By", CATEGORIES)
 
-conn = connect()
-df = pd.read_sql(query, conn)
+# Precomputed top-k list: a keyed read of 10 rows, no aggregation over the stat table
+df = fetch_leaders(conn, season, metric, limit=10)
+conn.close()
 
-st.subheader(f"Top 10 in {metric}")
-st.table(df)
+st.subheader(f"Top 10 in {metric} per game")
+if not df.empty:
+    st.caption(f"Minimum {int(df['MIN_GAMES'].iloc[0])} games played")
+    df["PER_GAME"] = df["PER_GAME"].round(1)
+    st.table(df[["LEADER_RANK", "PLAYER_NAME", "TEAM_NAME", "GAMES", "PER_GAME"]].set_index("LEADER_RANK"))
@@ -1,30 +1,63 @@
+import os
+import sys
 import streamlit as st
-import cx_Oracle
 
-# Oracle connection helper
-def connect():
-    return cx_Oracle.connect("sports_analytics/123@localhost:1521/XEPDB1")
+# Make sure Python can see config.py in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-st.title("📊 Live NBA Player Stats Dashboard")
-
-conn = connect()
-cursor = conn.cursor()
+from config import get_connection
+from dashboard.utils.player_store import get_player_store
+from analytics.player_form import fetch_player_form
 
-# Dropdown list of active players
-cursor.execute("SELECT DISTINCT PLAYER_ID FROM NBA_PLAYER_LIVE_STATS ORDER BY PLAYER_ID")
-players = [row[0] for row in cursor.fetchall()]
 
-player_id = st.selectbox("Select Player ID", players)
-
-# Display latest 20 games
-cursor.execute("""
-    SELECT GAME_DATE, POINTS, REBOUNDS, ASSISTS, STEALS, BLOCKS, MINUTES
-    FROM NBA_PLAYER_LIVE_STATS
-    WHERE PLAYER_ID = :id
-    ORDER BY GAME_DATE DESC FETCH NEXT 20 ROWS ONLY
-""", {"id": player_id})
+st.title("📊 Live NBA Player Stats Dashboard")
 
-rows = cursor.fetchall()
+columns = ["POINTS", "REBOUNDS", "ASSISTS", "STEALS", "BLOCKS", "MINUTES"]
+store = get_player_store()
+
+if store is not None:
+    # Dropdown list of active players
+    players = list(store.players())
+    player_id = st.selectbox("Select Player ID", players)
+
+    # Display latest 20 games, newest first — sliced from the store, no query
+    rows = store.game_log(player_id, columns=columns, last=20).iloc[::-1].reset_index(drop=True)
+else:
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    # Dropdown list of active players
+    cursor.execute("SELECT DISTINCT PLAYER_ID FROM NBA_PLAYER_LIVE_STATS ORDER BY PLAYER_ID")
+    players = [row[0] for row in cursor.fetchall()]
+
+    player_id = st.selectbox("Select Player ID", players)
+
+    # Display latest 20 games
+    cursor.execute("""
+        SELECT GAME_DATE, POINTS, REBOUNDS, ASSISTS, STEALS, BLOCKS, MINUTES
+        FROM NBA_PLAYER_LIVE_STATS
+        WHERE PLAYER_ID = :id
+        ORDER BY GAME_DATE DESC FETCH NEXT 20 ROWS ONLY
+    """, {"id": player_id})
+
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+# Current form (analytics/player_form.py) — one keyed read
+conn = get_connection()
+try:
+    form = fetch_player_form(conn, player_id) if player_id is not None else None
+except Exception:
+    form = None   # form table not built yet
+conn.close()
+
+if form:
+    st.subheader("🔥 Current Form (last 5 vs last 10)")
+    for col, stat in zip(st.columns(4), ["POINTS", "REBOUNDS", "ASSISTS", "MINUTES"]):
+        col.metric(stat.title(), f"{form[f'L5_{stat}']:.1f}",
+                   delta=round(form[f"L5_{stat}"] - form[f"L10_{stat}"], 1))
+        col.caption(f"EWMA {form[f'EWMA_{stat}']:.1f}")
 
 st.subheader("📅 Last 20 Games")
 st.table(rows)
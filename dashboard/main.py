@@ -16,6 +16,7 @@ Select a module from the sidebar on the left to start analyzing.
 | 📈 Live Player Stats | View latest player game logs |
 | 📅 Game Log Explorer *(Coming Next)* | Trend charts across time |
 | 🏆 League Leaders *(Next Option)* | Top players by category |
+| 🎲 Season Simulation | Playoff odds and win totals via Monte Carlo |
 
 ---
 
@@ -25,5 +26,5 @@ Select a module from the sidebar on the left to start analyzing.
 | AI Win Predictions | **Done** |
 | Player Comparison Engine | **Now Active** |
 | League Trend Analyzer | Next |
-| Season Simulation Engine | On deck |
+| Season Simulation Engine | **Done** |
 """)
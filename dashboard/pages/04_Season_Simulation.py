@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import streamlit as st
+
+# ======================================
+# FIX PATH — ENSURE CONFIG IS IMPORTABLE
+# ======================================
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from analytics.season_simulation import run_simulation, PROB_SOURCES, DEFAULT_SIMS
+
+
+# Re-running the same settings within 10 minutes reuses the last result
+@st.cache_data(ttl=600, show_spinner=False)
+def simulate(source, n_sims, seed):
+    start = time.perf_counter()
+    result = run_simulation(source=source, n_sims=n_sims, seed=seed)
+    result["elapsed"] = time.perf_counter() - start
+    result["n_sims"] = n_sims
+    return result
+
+
+st.title("🎲 Season Simulation Engine")
+
+st.write("""
+Monte Carlo simulation of the rest of the season:
+✔ Final win-total distribution
+✔ Seed probabilities per conference
+✔ Play-in and playoff odds
+""")
+
+col1, col2, col3 = st.columns(3)
+source = col1.selectbox("Win Probabilities", PROB_SOURCES,
+                        format_func=lambda s: {"rating": "Rating (log5)", "elo": "Elo"}.get(s, f"Model {s.upper()}"))
+n_sims = col2.select_slider("Seasons", [5000, 10000, DEFAULT_SIMS, 50000], value=DEFAULT_SIMS)
+seed = col3.number_input("Seed", value=42, step=1)
+
+if st.button("▶️ Run Simulation"):
+    with st.spinner(f"Simulating {n_sims:,} seasons..."):
+        st.session_state["season_sim"] = simulate(source, n_sims, int(seed))
+
+result = st.session_state.get("season_sim")
+if result is None:
+    st.info("Pick a probability source and run the simulation.")
+    st.stop()
+
+st.caption(
+    f"Season {result['season']} · {result['games_remaining']} games remaining · "
+    f"{result['n_sims']:,} simulations in {result['elapsed']:.2f}s"
+)
+
+summary = result["summary"]
+
+# ======================================
+# Conference odds
+# ======================================
+for conf, table in summary.groupby("CONFERENCE"):
+    st.subheader(f"🏀 {conf}ern Conference")
+    st.dataframe(table.drop(columns="CONFERENCE"), use_container_width=True)
+
+st.markdown("---")
+
+# ======================================
+# Team drill-down
+# ======================================
+team = st.selectbox("Team", summary.index.tolist())
+
+col1, col2 = st.columns(2)
+with col1:
+    st.subheader("📊 Final Win Total")
+    dist = result["win_dist"].loc[team]
+    st.bar_chart(dist[dist > 0.0005])
+with col2:
+    st.subheader("🏅 Seed Probability")
+    st.bar_chart(result["seed_probs"].loc[team])
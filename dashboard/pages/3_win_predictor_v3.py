@@ -1,6 +1,5 @@
 import os
 import sys
-import joblib
 import pandas as pd
 import streamlit as st
 
@@ -11,6 +10,9 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 sys.path.insert(0, ROOT)
 
 from config import get_connection  # ← will work now
+from analytics.forest_compiler import load_forest
+from analytics.build_matchup_matrix import MATRIX_PATH, MatchupMatrix
+from analytics.predict_slate import predict_matchup
 
 MODEL_PATH = os.path.join(ROOT, "models", "win_predictor_v3.pkl")
 
@@ -23,10 +25,23 @@ def load_model():
     if not os.path.exists(MODEL_PATH):
         st.error("⚠ No V3 model found — Train first using train_win_model_v3.py")
         st.stop()
-    return joblib.load(MODEL_PATH)
+    # Memory-mapped .forest export when available, else compiled from the pickle
+    return load_forest("v3")
 
 model = load_model()
 
+
+# Nightly 30×29 matrix (analytics/build_matchup_matrix.py) — reloaded when rebuilt
+@st.cache_resource
+def load_matchup_matrix(built_mtime):
+    return MatchupMatrix.load()
+
+def get_matchup_matrix():
+    meta_path = os.path.join(MATRIX_PATH, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    return load_matchup_matrix(os.path.getmtime(meta_path))
+
 st.title("🏀 Win Predictor V3 — Live Player Impact + Momentum")
 
 st.write("""
@@ -49,40 +64,24 @@ if home == away:
     st.warning("Teams must be different.")
     st.stop()
 
-# ================================
-# PLAYER IMPACT
-# ================================
-impact = pd.read_sql("""
-    SELECT TEAM_NAME, AVG(POINTS) AS PPG FROM NBA_PLAYER_LIVE_STATS GROUP BY TEAM_NAME
-""", conn)
+matrix = get_matchup_matrix()
+prediction = matrix.lookup("v3", home, away) if matrix else None
+if prediction is None:
+    # Same features (analytics/team_features.py: latest season, default
+    # player PPG) and rounding as the matrix
+    prediction = predict_matchup(conn, "v3", home, away, model)
 
-ppg_map = dict(zip(impact.TEAM_NAME, impact.PPG))
-
-# TEAM SEASON METRICS
-team_stats = pd.read_sql("SELECT TEAM_NAME, WIN_PCT, POINTS FROM NBA_TEAM_STATS", conn)
-
-home_season = team_stats[team_stats.TEAM_NAME == home].iloc[0]
-away_season = team_stats[team_stats.TEAM_NAME == away].iloc[0]
-
-home_ppg = ppg_map.get(home, 10)
-away_ppg = ppg_map.get(away, 10)
-
-X = pd.DataFrame([{
-    "HOME_WIN_PCT": home_season.WIN_PCT,
-    "AWAY_WIN_PCT": away_season.WIN_PCT,
-    "HOME_SEASON_PTS": home_season.POINTS,
-    "AWAY_SEASON_PTS": away_season.POINTS,
-    "HOME_PPG": home_ppg,
-    "AWAY_PPG": away_ppg
-}])
+if prediction is None:
+    st.warning(f"No season stats in NBA_TEAM_STATS for {home} or {away} — cannot predict.")
+    conn.close()
+    st.stop()
 
 # ================================
 # Predict
 # ================================
 if st.button("🔮 Predict Matchup"):
-    proba = model.predict_proba(X)[0]
-    home_prob = round(proba[1] * 100, 2)
-    away_prob = round(proba[0] * 100, 2)
+    home_prob = prediction["home_prob"]
+    away_prob = prediction["away_prob"]
 
     st.subheader("📊 Win Probability")
     st.metric(home, f"{home_prob}%")
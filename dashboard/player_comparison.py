@@ -9,6 +9,7 @@ import streamlit as st
 # Make sure we can import config.get_connection
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import get_connection
+from analytics.player_advanced import fetch_player_advanced
 
 # ==============================
 # Streamlit Page Setup
@@ -107,6 +108,12 @@ if row_a is None or row_b is None:
     conn.close()
     st.stop()
 
+# Advanced metrics are precomputed (analytics/player_advanced.py) — one keyed read
+try:
+    advanced = fetch_player_advanced(conn, season, [player_a, player_b])
+except Exception:
+    advanced = pd.DataFrame()   # advanced table not built yet
+
 # We no longer need the DB connection
 conn.close()
 
@@ -183,6 +190,43 @@ with scol_b:
 
 st.markdown("---")
 
+# ==============================
+# 🧮 Advanced Metrics
+# ==============================
+st.markdown("### 🧮 Advanced Metrics")
+
+advanced_metrics = [
+    ("PER",               "PER",           "{:.1f}"),
+    ("Win Shares (est.)", "WIN_SHARES",    "{:.1f}"),
+    ("Efficiency / game", "EFFICIENCY",    "{:.1f}"),
+    ("Scoring Usage",     "SCORING_USAGE", "{:.1f}%"),
+    ("Team Points Share", "POINTS_SHARE",  "{:.1%}"),
+    ("Points / 36",       "POINTS_36",     "{:.1f}"),
+    ("Rebounds / 36",     "REBOUNDS_36",   "{:.1f}"),
+    ("Assists / 36",      "ASSISTS_36",    "{:.1f}"),
+]
+
+def advanced_row(row):
+    if advanced.empty:
+        return None
+    match = advanced[(advanced["PLAYER_NAME"] == row["PLAYER_NAME"]) & (advanced["TEAM_NAME"] == row["TEAM_NAME"])]
+    return match.iloc[0] if not match.empty else None
+
+adv_a, adv_b = advanced_row(row_a), advanced_row(row_b)
+
+if adv_a is None or adv_b is None:
+    st.caption("Run `python analytics/player_advanced.py` to compute PER, usage and per-36 rates.")
+else:
+    st.table(pd.DataFrame({
+        row_a["PLAYER_NAME"]: [fmt.format(adv_a[col]) if pd.notna(adv_a[col]) else "N/A" for _, col, fmt in advanced_metrics],
+        row_b["PLAYER_NAME"]: [fmt.format(adv_b[col]) if pd.notna(adv_b[col]) else "N/A" for _, col, fmt in advanced_metrics],
+    }, index=[label for label, _, _ in advanced_metrics]))
+    if pd.isna(adv_a["WIN_SHARES"]) or pd.isna(adv_b["WIN_SHARES"]):
+        st.caption("Win shares are N/A where NBA_PLAYER_STATS lists too little of the team's roster "
+                   "to split its wins across.")
+
+st.markdown("---")
+
 # ==============================
 # 🕸 Radar Chart Comparison
 # ==============================
@@ -253,7 +297,7 @@ for line in summary_lines:
     st.write(line)
 
 st.info(
-    "This comparison uses per-game season averages. "
-    "Later you can extend this to use **live stats**, advanced metrics (PER, WS, BPM), "
+    "This comparison uses per-game season averages and the precomputed advanced metrics "
+    "in `NBA_PLAYER_ADVANCED`. Later you can extend this to use **live stats** "
     "or your AI models for **overall impact scoring**."
 )
@@ -8,19 +8,34 @@ import pandas as pd
 import streamlit as st
 import matplotlib.pyplot as plt
 from config import get_connection
+from analytics.leaderboards import fetch_leaders
+
+# Per-player season rows, in the shape this view expects, from each source table
+SOURCE_COLUMNS = {
+    # Season totals folded from NBA_PLAYER_LIVE_STATS by analytics/leaderboards.py
+    "NBA_PLAYER_SEASON_TOTALS": """
+        PLAYER_NAME, TEAM_NAME, SEASON,
+        GAMES AS GAMES_PLAYED, MINUTES, POINTS, ASSISTS, REBOUNDS,
+        STEALS, BLOCKS, TURNOVERS""",
+    "NBA_PLAYER_STATS": """
+        PLAYER_NAME, TEAM_NAME, SEASON,
+        GAMES_PLAYED, MINUTES, POINTS, ASSISTS, REBOUNDS,
+        STEALS, BLOCKS, TURNOVERS,
+        FG_PERCENT, THREE_PERCENT, FT_PERCENT""",
+}
 
 
 def _get_player_source_table(conn) -> str | None:
     """
     Decide whether to use live stats or base stats.
     Priority:
-      1. NBA_PLAYER_LIVE_STATS (if exists and has rows)
+      1. NBA_PLAYER_SEASON_TOTALS (live stats rolled up per season, if it has rows)
       2. NBA_PLAYER_STATS
     """
-    for table in ["NBA_PLAYER_LIVE_STATS", "NBA_PLAYER_STATS"]:
+    for table in SOURCE_COLUMNS:
         try:
-            df = pd.read_sql(f"SELECT COUNT(*) AS CNT FROM {table}", conn)
-            if df["CNT"].iloc[0] > 0:
+            df = pd.read_sql(f"SELECT 1 AS HAS_ROWS FROM {table} WHERE ROWNUM = 1", conn)
+            if not df.empty:
                 return table
         except Exception:
             # Table might not exist yet
@@ -28,6 +43,13 @@ def _get_player_source_table(conn) -> str | None:
     return None
 
 
+def _leaders_from_table(conn, season, category, col, limit):
+    """Stored top-k list → the columns the leader tables below show."""
+    df = fetch_leaders(conn, season, category, limit).rename(columns={"PER_GAME": col, "GAMES": "GAMES_PLAYED"})
+    df[col] = df[col].round(1)
+    return df
+
+
 def render_players_view():
     """Player overview: top scorers/rebounders/passers for a season."""
 
@@ -36,14 +58,14 @@ def render_players_view():
     source_table = _get_player_source_table(conn)
     if not source_table:
         st.error(
-            "No player stats found. Make sure NBA_PLAYER_STATS or "
-            "NBA_PLAYER_LIVE_STATS has data."
+            "No player stats found. Load NBA_PLAYER_STATS, or load "
+            "NBA_PLAYER_LIVE_STATS and run analytics/leaderboards.py."
         )
         conn.close()
         return
 
-    if source_table == "NBA_PLAYER_LIVE_STATS":
-        st.info("Using LIVE player stats (NBA_PLAYER_LIVE_STATS).")
+    if source_table == "NBA_PLAYER_SEASON_TOTALS":
+        st.info("Using LIVE player stats (season totals from NBA_PLAYER_LIVE_STATS).")
     else:
         st.info("Using base player stats table (NBA_PLAYER_STATS).")
 
@@ -82,10 +104,7 @@ def render_players_view():
 
     # Build query
     base_sql = f"""
-        SELECT PLAYER_NAME, TEAM_NAME, SEASON,
-               GAMES_PLAYED, MINUTES, POINTS, ASSISTS, REBOUNDS,
-               STEALS, BLOCKS, TURNOVERS,
-               FG_PERCENT, THREE_PERCENT, FT_PERCENT
+        SELECT {SOURCE_COLUMNS[source_table]}
         FROM {source_table}
         WHERE SEASON = :season
     """
@@ -97,6 +116,15 @@ def render_players_view():
         params["team"] = team_filter
 
     df = pd.read_sql(base_sql, conn, params=params)
+
+    # League-wide live leaders are precomputed (qualified players only)
+    stored = {}
+    if source_table == "NBA_PLAYER_SEASON_TOTALS" and team_filter == "All Teams":
+        stored = {
+            "PTS_PG": _leaders_from_table(conn, season, "POINTS", "PTS_PG", 10),
+            "AST_PG": _leaders_from_table(conn, season, "ASSISTS", "AST_PG", 5),
+            "REB_PG": _leaders_from_table(conn, season, "REBOUNDS", "REB_PG", 5),
+        }
     conn.close()
 
     if df.empty:
@@ -104,7 +132,7 @@ def render_players_view():
         return
 
     # Per-game metrics
-    df["GAMES_PLAYED"] = df["GAMES_PLAYED"].replace(0, pd.NA)
+    df["GAMES_PLAYED"] = df["GAMES_PLAYED"].where(df["GAMES_PLAYED"] > 0)
     df["PTS_PG"] = (df["POINTS"] / df["GAMES_PLAYED"]).round(1)
     df["AST_PG"] = (df["ASSISTS"] / df["GAMES_PLAYED"]).round(1)
     df["REB_PG"] = (df["REBOUNDS"] / df["GAMES_PLAYED"]).round(1)
@@ -128,9 +156,13 @@ def render_players_view():
     # Top players by category
     st.subheader("🏆 Leaders (Current Filters)")
 
-    top_pts = df.sort_values("PTS_PG", ascending=False).head(5)
-    top_ast = df.sort_values("AST_PG", ascending=False).head(5)
-    top_reb = df.sort_values("REB_PG", ascending=False).head(5)
+    if stored:
+        top10, top_ast, top_reb = stored["PTS_PG"], stored["AST_PG"], stored["REB_PG"]
+    else:
+        top10 = df.nlargest(10, "PTS_PG")
+        top_ast = df.nlargest(5, "AST_PG")
+        top_reb = df.nlargest(5, "REB_PG")
+    top_pts = top10.head(5)
 
     col_pts, col_ast, col_reb = st.columns(3)
 
@@ -163,7 +195,6 @@ def render_players_view():
     # Chart – Points per game for top N
     st.subheader("📈 Points Per Game – Top 10")
 
-    top10 = df.sort_values("PTS_PG", ascending=False).head(10)
     fig, ax = plt.subplots(figsize=(10, 4))
     ax.barh(top10["PLAYER_NAME"], top10["PTS_PG"], color="orange")
     ax.invert_yaxis()
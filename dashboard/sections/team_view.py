@@ -8,6 +8,62 @@ import pandas as pd
 import streamlit as st
 import matplotlib.pyplot as plt
 from config import get_connection
+from analytics.standings import standings_as_of, format_streak
+
+
+def render_standings_as_of(season):
+    """Point-in-time standings from NBA_STANDINGS_DAILY (analytics/standings.py)."""
+
+    conn = get_connection()
+    try:
+        bounds = pd.read_sql(
+            """
+            SELECT MIN(SNAPSHOT_DATE) AS FIRST_DAY, MAX(SNAPSHOT_DATE) AS LAST_DAY
+            FROM NBA_STANDINGS_DAILY
+            WHERE SEASON = :season
+            """,
+            conn,
+            params={"season": season},
+        ).iloc[0]
+    except Exception:
+        conn.close()
+        return  # snapshots not built yet
+
+    if pd.isna(bounds["FIRST_DAY"]):
+        conn.close()
+        return
+
+    with st.expander("🕰️ Standings as of a date"):
+        as_of = st.slider(
+            "As of",
+            min_value=bounds["FIRST_DAY"].date(),
+            max_value=bounds["LAST_DAY"].date(),
+            value=bounds["LAST_DAY"].date(),
+            key="standings_as_of",
+        )
+        table = standings_as_of(conn, season, pd.Timestamp(as_of).to_pydatetime())
+        table["STREAK"] = table["STREAK"].map(format_streak)
+        table["WIN_PCT"] = (table["WIN_PCT"] * 100).round(1)
+
+        for conf, conf_table in table.groupby("CONFERENCE"):
+            st.markdown(f"**{conf}**")
+            st.dataframe(
+                conf_table.drop(columns=["CONFERENCE", "SNAPSHOT_DATE"]).rename(
+                    columns={
+                        "CONF_RANK": "Rank",
+                        "TEAM_NAME": "Team",
+                        "WINS": "W",
+                        "LOSSES": "L",
+                        "WIN_PCT": "Win %",
+                        "GAMES_BACK": "GB",
+                        "STREAK": "Streak",
+                    }
+                ),
+                use_container_width=True,
+                hide_index=True,
+            )
+
+    conn.close()
 
 
 def render_team_view():
@@ -52,6 +108,21 @@ def render_team_view():
         conn.close()
         return
 
+    # Opponent-adjusted ratings (analytics/srs_ratings.py)
+    try:
+        srs_df = pd.read_sql(
+            """
+            SELECT TEAM_NAME, MOV, SOS, SRS
+            FROM NBA_TEAM_SRS
+            WHERE SEASON = :season
+            """,
+            conn,
+            params={"season": season},
+        )
+    except Exception:
+        srs_df = pd.DataFrame(columns=["TEAM_NAME", "MOV", "SOS", "SRS"])
+    league_df = league_df.merge(srs_df, on="TEAM_NAME", how="left")
+
     # Team selector for trend view (right side)
     teams = sorted(league_df["TEAM_NAME"].unique().tolist())
     team_name = st.selectbox(
@@ -122,6 +193,9 @@ def render_team_view():
                 "GAMES",
                 "WIN_PCT_PERCENT",
                 "POINTS",
+                "MOV",
+                "SOS",
+                "SRS",
             ]
         ].rename(
             columns={
@@ -138,6 +212,8 @@ def render_team_view():
 
         st.dataframe(df_standings, use_container_width=True, height=420)
 
+        render_standings_as_of(season)
+
         # Bar chart of win %
         fig, ax = plt.subplots(figsize=(10, max(4, len(df) * 0.35)))
         ax.barh(df["TEAM_NAME"], df["WIN_PCT_PERCENT"], color="mediumseagreen")
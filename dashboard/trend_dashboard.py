@@ -449,7 +449,8 @@ with tab_players:
         sel_season = st.selectbox(
             "Season:",
             ["All Seasons"] + [str(s) for s in seasons_live],
-            index=0
+            index=0,
+            key="trend_player_season"
         )
 
         df_p = df_live[df_live["PLAYER_NAME"] == sel_player].copy()
@@ -519,7 +520,8 @@ with tab_players:
             sel_season = st.selectbox(
                 "Season:",
                 ["All Seasons"] + [str(s) for s in seasons_pl],
-                index=0
+                index=0,
+                key="trend_player_season"
             )
 
             df_p = df_static[df_static["PLAYER_NAME"] == sel_player].copy()
@@ -570,7 +572,8 @@ with tab_games:
         season_sel = st.selectbox(
             "Season:",
             ["All Seasons"] + [str(s) for s in seasons_g],
-            index=0
+            index=0,
+            key="trend_games_season"
         )
 
         # Team filter from both home + away
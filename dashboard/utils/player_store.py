@@ -0,0 +1,25 @@
+import os
+import sys
+import streamlit as st
+
+# Allow import of analytics/ from project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from analytics.array_store import META_FILE, has_arrays
+from analytics.player_log_store import STORE_PATH, PlayerLogStore
+
+
+# Memory-mapped per-player logs (analytics/player_log_store.py) — one copy per
+# server process, shared by every page and session, reloaded when refreshed.
+# Only the current version stays cached, so superseded ones get unmapped and
+# array_store can delete their directories.
+@st.cache_resource(max_entries=1)
+def load_player_store(built_mtime):
+    return PlayerLogStore.load()
+
+
+def get_player_store():
+    """The current PlayerLogStore, or None until player_log_store.py has been run."""
+    if not has_arrays(STORE_PATH):
+        return None
+    return load_player_store(os.path.getmtime(os.path.join(STORE_PATH, META_FILE)))
@@ -0,0 +1,284 @@
+import os
+import sys
+import glob
+import json
+import time
+import queue
+import atexit
+import datetime
+import threading
+
+# Allow import of config.py from project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import get_connection
+from etl_scripts.db_utils import create_table_if_missing, add_column_if_missing
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SPILL_DIR = os.path.join(PROJECT_ROOT, "logs", "prediction_spill")
+
+LOG_COLUMNS = [
+    "HOME_TEAM", "AWAY_TEAM", "SEASON",
+    "HOME_WIN_PROB", "AWAY_WIN_PROB",
+    "HOME_STREAK", "AWAY_STREAK",
+    "HOME_WIN_PCT", "AWAY_WIN_PCT",
+    "HOME_POINTS", "AWAY_POINTS",
+    "PREDICTED_WINNER", "MODEL_VERSION", "PREDICTED_AT",
+]
+
+LOG_DDL = """
+    CREATE TABLE NBA_WIN_PREDICTIONS_LOG (
+        HOME_TEAM        VARCHAR2(100),
+        AWAY_TEAM        VARCHAR2(100),
+        SEASON           NUMBER,
+        HOME_WIN_PROB    NUMBER,
+        AWAY_WIN_PROB    NUMBER,
+        HOME_STREAK      NUMBER,
+        AWAY_STREAK      NUMBER,
+        HOME_WIN_PCT     NUMBER,
+        AWAY_WIN_PCT     NUMBER,
+        HOME_POINTS      NUMBER,
+        AWAY_POINTS      NUMBER,
+        PREDICTED_WINNER VARCHAR2(100),
+        MODEL_VERSION    VARCHAR2(10),
+        PREDICTED_AT     TIMESTAMP DEFAULT SYSTIMESTAMP
+    )
+"""
+
+# ORA- codes that mean the connection (not the row) is the problem: lost or
+# refused connections, TNS errors (12150-12599), instance down / starting up
+CONNECTION_ORA_CODES = {1012, 1033, 1034, 1089, 1090, 2396, 3113, 3114, 3135, 28547}
+
+INSERT_SQL = f"""
+    INSERT INTO NBA_WIN_PREDICTIONS_LOG ({", ".join(LOG_COLUMNS)})
+    VALUES ({", ".join(f":{i + 1}" for i in range(len(LOG_COLUMNS)))})
+"""
+
+
+def ensure_log_table(cursor):
+    """Create NBA_WIN_PREDICTIONS_LOG, or add the columns older copies of it lack."""
+    create_table_if_missing(cursor, LOG_DDL)
+    add_column_if_missing(cursor, "NBA_WIN_PREDICTIONS_LOG", "MODEL_VERSION VARCHAR2(10)")
+    add_column_if_missing(cursor, "NBA_WIN_PREDICTIONS_LOG", "PREDICTED_AT TIMESTAMP DEFAULT SYSTIMESTAMP")
+
+
+class PredictionLogWriter:
+    """
+    Background writer for NBA_WIN_PREDICTIONS_LOG.
+
+    log() only puts a row on an in-process queue. A daemon thread flushes
+    the queue with one executemany + commit when `batch_size` rows are
+    waiting or `flush_interval` seconds have passed. If the database is
+    unreachable the batch is appended to a local JSONL spill file and
+    replayed ahead of the next successful flush. Rows the database rejects
+    (constraint violations, bad binds) are retried one by one and the ones
+    that still fail go to a quarantine file, which is never replayed.
+    """
+
+    def __init__(self, connect=get_connection, batch_size=50, flush_interval=5.0,
+                 spill_dir=SPILL_DIR, max_queue=10000):
+        self.connect = connect
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_dir = spill_dir
+        self.spill_path = os.path.join(spill_dir, f"spill_{os.getpid()}.jsonl")
+        self.quarantine_path = os.path.join(spill_dir, f"quarantine_{os.getpid()}.jsonl")
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._spill_lock = threading.Lock()
+        self._conn = None
+        self._table_ready = False
+        self.written = 0
+        self.spilled = 0
+        self.quarantined = 0
+
+        self._thread = threading.Thread(target=self._run, name="prediction-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # -----------------------------
+    # Interaction path
+    # -----------------------------
+    def log(self, **record):
+        """Queue one prediction row; never blocks on the database."""
+        record.setdefault("PREDICTED_AT", datetime.datetime.now())
+        row = [record.get(col) for col in LOG_COLUMNS]
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._spill([row])
+
+    def close(self, timeout=10.0):
+        """Flush whatever is queued and stop the writer thread."""
+        if not self._stop.is_set():
+            self._stop.set()
+            self._thread.join(timeout)
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    # -----------------------------
+    # Writer thread
+    # -----------------------------
+    def _run(self):
+        batch = []
+        deadline = None
+
+        while not (self._stop.is_set() and self._queue.empty()):
+            timeout = self.flush_interval if deadline is None else max(0.0, deadline - _now())
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+                if deadline is None:
+                    deadline = _now() + self.flush_interval
+            except queue.Empty:
+                pass
+
+            due = deadline is not None and _now() >= deadline
+            if batch and (len(batch) >= self.batch_size or due or self._stop.is_set()):
+                self._flush(batch)
+                batch, deadline = [], None
+
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch):
+        claimed, rows, rejected = [], list(batch), []
+        try:
+            if self._conn is None:
+                self._conn = self.connect()
+            cursor = self._conn.cursor()
+            if not self._table_ready:
+                ensure_log_table(cursor)
+                self._table_ready = True
+
+            claimed = self._claim_spill_files()
+            rows = [row for path in claimed for row in self._read_claimed(path)] + list(batch)
+
+            try:
+                cursor.executemany(INSERT_SQL, rows)
+            except Exception as e:
+                if is_connection_error(e):
+                    raise
+                # Some row is bad, not the database — isolate it instead of
+                # spilling the whole batch and failing on it forever
+                self._conn.rollback()
+                rejected = self._insert_one_by_one(cursor, rows)
+            self._conn.commit()
+            cursor.close()
+
+            for path in claimed:
+                os.remove(path)
+            self.written += len(rows) - len(rejected)
+        except Exception as e:
+            rejected = []
+            print(f"⚠️ Prediction log flush failed ({e}) — spilling {len(rows)} rows locally")
+            # Replayed rows go back into this process's spill file with the new batch
+            self._spill(rows)
+            for path in claimed:
+                os.remove(path)
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+        if rejected:
+            print(f"⚠️ Prediction log rejected {len(rejected)} row(s) — quarantined in {self.quarantine_path}")
+            self._quarantine(rejected)
+
+    def _insert_one_by_one(self, cursor, rows):
+        """Insert rows individually; return [(row, error)] for the ones the database rejects."""
+        rejected = []
+        for row in rows:
+            try:
+                cursor.execute(INSERT_SQL, row)
+            except Exception as e:
+                if is_connection_error(e):
+                    raise
+                rejected.append((row, str(e)))
+        return rejected
+
+    def _read_claimed(self, path):
+        """Rows of a claimed spill file; lines that no longer parse are quarantined."""
+        rows, broken = _read_spill(path)
+        if broken:
+            self._quarantine([(line, "unreadable spill line") for line in broken])
+        return rows
+
+    def _quarantine(self, rejected):
+        with self._spill_lock:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(self.quarantine_path, "a", encoding="utf-8") as f:
+                for row, error in rejected:
+                    f.write(json.dumps({"row": row, "error": error}, default=_json_default) + "\n")
+            self.quarantined += len(rejected)
+
+    def _spill(self, rows):
+        with self._spill_lock:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, default=_json_default) + "\n")
+            self.spilled += len(rows)
+
+    def _claim_spill_files(self):
+        """Atomically take ownership of every spill file (any process) for replay."""
+        claimed = []
+        # The lock keeps the interaction path from appending to our own file mid-rename
+        with self._spill_lock:
+            for path in glob.glob(os.path.join(self.spill_dir, "spill_*.jsonl")):
+                target = f"{path}.replaying{os.getpid()}"
+                try:
+                    os.replace(path, target)
+                    claimed.append(target)
+                except OSError:
+                    continue  # another process claimed it first
+        return claimed
+
+
+def is_connection_error(exc):
+    """
+    True when `exc` means the database could not be reached (worth spilling
+    and retrying later), False for errors caused by the rows themselves.
+    """
+    if isinstance(exc, (OSError, TimeoutError)):
+        return True
+    if type(exc).__name__ in ("OperationalError", "InterfaceError"):
+        return True
+    # cx_Oracle.DatabaseError carries an _Error with the ORA- code
+    code = getattr(exc.args[0], "code", None) if exc.args else None
+    return code in CONNECTION_ORA_CODES or (code is not None and 12150 <= code <= 12599)
+
+
+def _now():
+    return time.monotonic()
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return {"__datetime__": value.isoformat()}
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        # Not a number at all — keep its repr so one bad value cannot kill the writer thread
+        return repr(value)
+
+
+def _read_spill(path):
+    """(rows, unparsable lines) of a spill file."""
+    rows, broken = [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+                rows.append([
+                    datetime.datetime.fromisoformat(v["__datetime__"]) if isinstance(v, dict) else v
+                    for v in row
+                ])
+            except (ValueError, TypeError, KeyError):
+                broken.append(line.rstrip("\n"))
+    return rows, broken
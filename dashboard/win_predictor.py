@@ -1,12 +1,18 @@
 import os
 import sys
-import joblib
+import datetime
 import pandas as pd
 import streamlit as st
 
 # allow oracle config import
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import get_connection
+from analytics.forest_compiler import load_forest
+from analytics.predict_slate import load_slate_predictions, predict_matchup
+from analytics.build_matchup_matrix import MATRIX_PATH, MatchupMatrix
+from analytics.elo_ratings import rating_as_of, elo_win_prob
+from analytics.head_to_head import fetch_head_to_head
+from dashboard.utils.prediction_log import PredictionLogWriter
 
 
 # =====================================
@@ -25,11 +31,28 @@ def load_model():
                  "`python analytics/build_win_training_data_v2.py` then\n"
                  "`python analytics/train_win_model_v2.py`")
         st.stop()
-    return joblib.load(MODEL_PATH)
+    # Memory-mapped .forest export when available, else compiled from the pickle
+    return load_forest("v2")
 
-artifact = load_model()
-model = artifact["model"]
-feature_cols = artifact["feature_cols"]  # Momentum features
+model = load_model()
+
+
+# One background writer per server process — logging never waits on Oracle
+@st.cache_resource
+def get_log_writer():
+    return PredictionLogWriter()
+
+
+# Nightly 30×29 matrix (analytics/build_matchup_matrix.py) — reloaded when rebuilt
+@st.cache_resource
+def load_matchup_matrix(built_mtime):
+    return MatchupMatrix.load()
+
+def get_matchup_matrix():
+    meta_path = os.path.join(MATRIX_PATH, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    return load_matchup_matrix(os.path.getmtime(meta_path))
 
 
 # =====================================
@@ -57,6 +80,19 @@ This model predicts win probability using **recent 10-game performance**, includ
 # =====================================
 conn = get_connection()
 
+# -------------------------------------
+# 📅 Today's slate — precomputed nightly by analytics/predict_slate.py
+# -------------------------------------
+try:
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    slate = load_slate_predictions(conn, today, "v2")
+except Exception:
+    slate = pd.DataFrame()  # NBA_WIN_PREDICTIONS not created yet
+
+if not slate.empty:
+    with st.expander(f"📅 Today's Slate — {len(slate)} games (precomputed)", expanded=False):
+        st.dataframe(slate, use_container_width=True, hide_index=True)
+
 teams = pd.read_sql("""
     SELECT DISTINCT TEAM_NAME FROM NBA_PLAYER_LIVE_STATS
     JOIN NBA_PLAYERS ON NBA_PLAYERS.ID = NBA_PLAYER_LIVE_STATS.PLAYER_ID
@@ -72,35 +108,19 @@ st.markdown("---")
 
 
 # =====================================
-# Fetch last 10 games team metrics
+# Last-10 form + prediction — matrix cell, or scored live the same way
 # =====================================
-def last10(team):
-    q = """
-        SELECT
-            AVG(PTS) AS AVG_PTS,
-            SUM(CASE WHEN PTS > OPP_PTS THEN 1 ELSE 0 END)/10 AS WIN_PCT
-        FROM (
-            SELECT
-                g.HOME_TEAM AS TEAM,
-                g.HOME_POINTS AS PTS,
-                g.AWAY_POINTS AS OPP_PTS
-            FROM NBA_GAME_LOGS g WHERE HOME_TEAM = :team
-            UNION ALL
-            SELECT
-                g.AWAY_TEAM AS TEAM,
-                g.AWAY_POINTS AS PTS,
-                g.HOME_POINTS AS OPP_PTS
-            FROM NBA_GAME_LOGS g WHERE AWAY_TEAM = :team
-        )
-        WHERE ROWNUM <= 10
-    """
-    return pd.read_sql(q, conn, params={"team": team}).iloc[0]
-
-
 st.subheader("📊 Recent Last-10-Game Form")
 
-home10 = last10(home)
-away10 = last10(away)
+matrix = get_matchup_matrix()
+prediction = matrix.lookup("v2", home, away) if matrix else None
+if prediction is None:
+    # Same features (analytics/team_features.py) and rounding as the matrix
+    prediction = predict_matchup(conn, "v2", home, away, model)
+
+f = prediction["features"]
+home10 = pd.Series({"WIN_PCT": f["HOME_LAST10_WIN_PCT"], "AVG_PTS": f["HOME_LAST10_PTS"]})
+away10 = pd.Series({"WIN_PCT": f["AWAY_LAST10_WIN_PCT"], "AVG_PTS": f["AWAY_LAST10_PTS"]})
 
 col1, col2 = st.columns(2)
 
@@ -112,16 +132,21 @@ with col2:
     st.metric("Away Last-10 Win %", round(away10.WIN_PCT*100,1))
     st.metric("Away Avg Points", round(away10.AVG_PTS,1))
 
+# -------------------------------------
+# 🆚 Head-to-head — one keyed read of NBA_HEAD_TO_HEAD
+# -------------------------------------
+try:
+    h2h = fetch_head_to_head(conn, home, away)
+except Exception:
+    h2h = None  # analytics/head_to_head.py not run yet
+
+if h2h:
+    st.caption(
+        f"🆚 {home} vs {away}: {h2h['WINS']:.0f}-{h2h['LOSSES']:.0f} all-time · "
+        f"avg margin {h2h['AVG_MARGIN']:+.1f} · last {len(h2h['LAST_RESULTS'])} "
+        f"(newest first): {' '.join(h2h['LAST_RESULTS'])}"
+    )
 
-# =====================================
-# Build feature input for model
-# =====================================
-input_row = pd.DataFrame([{
-    "HOME_LAST10_WIN_PCT": home10.WIN_PCT,
-    "AWAY_LAST10_WIN_PCT": away10.WIN_PCT,
-    "HOME_LAST10_PTS": home10.AVG_PTS,
-    "AWAY_LAST10_PTS": away10.AVG_PTS
-}])[feature_cols]
 
 st.markdown("---")
 
@@ -131,9 +156,8 @@ st.markdown("---")
 # =====================================
 if st.button("Predict Outcome"):
 
-    probs = model.predict_proba(input_row)[0]
-    homeProb = round(probs[1] * 100, 2)
-    awayProb = round(probs[0] * 100, 2)
+    homeProb = prediction["home_prob"]
+    awayProb = prediction["away_prob"]
 
     winner = home if homeProb > awayProb else away
 
@@ -142,13 +166,31 @@ if st.button("Predict Outcome"):
     st.metric(f"{away} Win Probability", f"{awayProb}%")
     st.progress(homeProb/100)
 
-    # Log to database
-    conn.execute("""
-        INSERT INTO NBA_WIN_PREDICTIONS_LOG
-        (HOME_TEAM, AWAY_TEAM, HOME_WIN_PROB, AWAY_WIN_PROB, WINNER_PREDICTED)
-        VALUES (:1,:2,:3,:4,:5)
-    """, (home, away, homeProb, awayProb, winner))
-    conn.commit()
+    # Elo cross-check (analytics/elo_ratings.py) — two indexed lookups
+    try:
+        now = datetime.datetime.now()
+        home_elo = rating_as_of(conn, home, now)
+        away_elo = rating_as_of(conn, away, now)
+        st.caption(
+            f"📈 Elo: {home} {home_elo:.0f} vs {away} {away_elo:.0f} → "
+            f"home win {elo_win_prob(home_elo, away_elo) * 100:.1f}%"
+        )
+    except Exception:
+        pass  # Elo tables not built yet
+
+    # Log to database (queued; flushed in batches by the writer thread)
+    get_log_writer().log(
+        HOME_TEAM=home,
+        AWAY_TEAM=away,
+        HOME_WIN_PROB=homeProb,
+        AWAY_WIN_PROB=awayProb,
+        HOME_WIN_PCT=float(home10.WIN_PCT),
+        AWAY_WIN_PCT=float(away10.WIN_PCT),
+        HOME_POINTS=float(home10.AVG_PTS),
+        AWAY_POINTS=float(away10.AVG_PTS),
+        PREDICTED_WINNER=winner,
+        MODEL_VERSION="v2",
+    )
     st.info("📄 Saved to prediction history.")
 
 
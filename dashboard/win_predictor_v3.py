@@ -1,12 +1,18 @@
 import os
 import sys
-import joblib
+import datetime
 import pandas as pd
 import streamlit as st
 
 # Allow imports from project root (config, etc.)
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import get_connection
+from analytics.forest_compiler import load_forest
+from analytics.predict_slate import load_slate_predictions, predict_matchup
+from analytics.build_matchup_matrix import MATRIX_PATH, MatchupMatrix
+from analytics.head_to_head import fetch_head_to_head
+from analytics.player_form import fetch_team_form
+from dashboard.utils.prediction_log import PredictionLogWriter
 
 # =====================================
 # 🔁 Load V2 Momentum Model Artifact
@@ -24,11 +30,29 @@ def load_model_artifact():
             "  2) python analytics\\train_win_model_v2.py"
         )
         st.stop()
-    return joblib.load(MODEL_PATH)
+    # Memory-mapped .forest export when available, else compiled from the pickle
+    return load_forest("v2")
 
-artifact = load_model_artifact()
-model = artifact["model"]
-feature_cols = artifact["feature_cols"]  # e.g. HOME_LAST10_WIN_PCT, etc.
+model = load_model_artifact()
+feature_cols = model.feature_names  # e.g. HOME_LAST10_WIN_PCT, etc.
+
+
+# One background writer per server process — logging never waits on Oracle
+@st.cache_resource
+def get_log_writer():
+    return PredictionLogWriter()
+
+
+# Nightly 30×29 matrix (analytics/build_matchup_matrix.py) — reloaded when rebuilt
+@st.cache_resource
+def load_matchup_matrix(built_mtime):
+    return MatchupMatrix.load()
+
+def get_matchup_matrix():
+    meta_path = os.path.join(MATRIX_PATH, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    return load_matchup_matrix(os.path.getmtime(meta_path))
 
 # =====================================
 # 🎨 Streamlit Page Setup
@@ -54,6 +78,19 @@ but the **UI + explanation** incorporates star players and betting context.
 # =====================================
 conn = get_connection()
 
+# -------------------------------------
+# 📅 Today's slate — precomputed nightly by analytics/predict_slate.py
+# -------------------------------------
+try:
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    slate = load_slate_predictions(conn, today, "v2")
+except Exception:
+    slate = pd.DataFrame()  # NBA_WIN_PREDICTIONS not created yet
+
+if not slate.empty:
+    with st.expander(f"📅 Today's Slate — {len(slate)} games (precomputed)", expanded=False):
+        st.dataframe(slate, use_container_width=True, hide_index=True)
+
 # -------------------------------------
 # Helper: get list of teams that appear in logs
 # -------------------------------------
@@ -92,49 +129,17 @@ if home_team == away_team:
 st.markdown("---")
 
 # =====================================
-# 🧠 Momentum: Last-10 Team Form
+# 🧠 Momentum: Last-10 Team Form — matrix cell, or scored live the same way
 # =====================================
-def get_last10_form(team_name):
-    """
-    Returns a row with AVG_PTS and WIN_PCT over last 10 games (home+away combined).
-    """
-    q = """
-        SELECT
-            AVG(PTS) AS AVG_PTS,
-            CASE 
-                WHEN COUNT(*) = 0 THEN 0
-                ELSE SUM(CASE WHEN PTS > OPP_PTS THEN 1 ELSE 0 END) / COUNT(*)
-            END AS WIN_PCT
-        FROM (
-            SELECT
-                HOME_TEAM AS TEAM,
-                HOME_POINTS AS PTS,
-                AWAY_POINTS AS OPP_PTS,
-                GAME_DATE
-            FROM NBA_GAME_LOGS
-            WHERE HOME_TEAM = :team
-            UNION ALL
-            SELECT
-                AWAY_TEAM AS TEAM,
-                AWAY_POINTS AS PTS,
-                HOME_POINTS AS OPP_PTS,
-                GAME_DATE
-            FROM NBA_GAME_LOGS
-            WHERE AWAY_TEAM = :team
-        )
-        WHERE ROWNUM <= 10
-    """
-    df = pd.read_sql(q, conn, params={"team": team_name})
-    if df.empty:
-        return pd.Series({"AVG_PTS": 0.0, "WIN_PCT": 0.0})
-    row = df.iloc[0]
-    return pd.Series({
-        "AVG_PTS": float(row["AVG_PTS"] or 0.0),
-        "WIN_PCT": float(row["WIN_PCT"] or 0.0)
-    })
-
-home10 = get_last10_form(home_team)
-away10 = get_last10_form(away_team)
+matrix = get_matchup_matrix()
+prediction = matrix.lookup("v2", home_team, away_team) if matrix else None
+if prediction is None:
+    # Same features (analytics/team_features.py) and rounding as the matrix
+    prediction = predict_matchup(conn, "v2", home_team, away_team, model)
+
+f = prediction["features"]
+home10 = pd.Series({"AVG_PTS": f["HOME_LAST10_PTS"], "WIN_PCT": f["HOME_LAST10_WIN_PCT"]})
+away10 = pd.Series({"AVG_PTS": f["AWAY_LAST10_PTS"], "WIN_PCT": f["AWAY_LAST10_WIN_PCT"]})
 
 st.subheader("📊 Recent Last-10 Game Momentum")
 
@@ -149,6 +154,21 @@ with m2:
     st.metric("Win %", f"{away10.WIN_PCT*100:.1f}%")
     st.metric("Avg Points Scored", f"{away10.AVG_PTS:.1f}")
 
+# -------------------------------------
+# 🆚 Head-to-head — one keyed read of NBA_HEAD_TO_HEAD
+# -------------------------------------
+try:
+    h2h = fetch_head_to_head(conn, home_team, away_team)
+except Exception:
+    h2h = None  # analytics/head_to_head.py not run yet
+
+if h2h:
+    st.caption(
+        f"🆚 {home_team} vs {away_team}: {h2h['WINS']:.0f}-{h2h['LOSSES']:.0f} all-time · "
+        f"avg margin {h2h['AVG_MARGIN']:+.1f} · last {len(h2h['LAST_RESULTS'])} "
+        f"(newest first): {' '.join(h2h['LAST_RESULTS'])}"
+    )
+
 st.markdown("---")
 
 # =====================================
@@ -158,31 +178,21 @@ st.subheader("⭐ Player Impact — Top Scorers (Last Few Games)")
 
 def get_team_top_players(team_name, limit_players=5, limit_games=10):
     """
-    Returns top players by average points in NBA_PLAYER_LIVE_STATS
-    joined with NBA_PLAYERS for the given team.
+    Returns the team's top scorers by points over their last `limit_games`
+    (5 or 10) games, read from the precomputed NBA_PLAYER_FORM
+    (analytics/player_form.py) instead of aggregating raw stat rows.
     """
-    q = f"""
-        SELECT *
-        FROM (
-            SELECT 
-                p.ID AS PLAYER_ID,
-                p.PLAYER_NAME,
-                AVG(s.PTS) AS AVG_PTS,
-                COUNT(*) AS GAMES
-            FROM NBA_PLAYERS p
-            JOIN NBA_PLAYER_LIVE_STATS s 
-                ON s.PLAYER_ID = p.ID
-            WHERE p.TEAM_NAME = :team
-            GROUP BY p.ID, p.PLAYER_NAME
-            ORDER BY AVG_PTS DESC
-        )
-        WHERE ROWNUM <= :limit_players
-    """
-    df = pd.read_sql(q, conn, params={"team": team_name, "limit_players": limit_players})
+    window = 5 if limit_games <= 5 else 10
+    try:
+        df = fetch_team_form(conn, team_name, limit_players, order_by=f"L{window}_POINTS")
+    except Exception:
+        # Form table not built yet
+        return pd.DataFrame(columns=["PLAYER_ID", "PLAYER_NAME", "AVG_PTS", "EWMA_PTS", "GAMES"])
+    df = df.rename(columns={f"L{window}_POINTS": "AVG_PTS", "EWMA_POINTS": "EWMA_PTS"})
     # Clean nulls
     if not df.empty:
         df["AVG_PTS"] = df["AVG_PTS"].fillna(0.0)
-    return df
+    return df[["PLAYER_ID", "PLAYER_NAME", "AVG_PTS", "EWMA_PTS", "GAMES"]]
 
 home_players_df = get_team_top_players(home_team)
 away_players_df = get_team_top_players(away_team)
@@ -196,7 +206,7 @@ with c1:
         home_star_name = None
         home_star_avg = 0.0
     else:
-        st.dataframe(home_players_df[["PLAYER_NAME", "AVG_PTS", "GAMES"]], use_container_width=True)
+        st.dataframe(home_players_df[["PLAYER_NAME", "AVG_PTS", "EWMA_PTS", "GAMES"]], use_container_width=True)
         home_star_name = st.selectbox(
             "Select key home player (for impact)",
             ["(None)"] + home_players_df["PLAYER_NAME"].tolist(),
@@ -215,7 +225,7 @@ with c2:
         away_star_name = None
         away_star_avg = 0.0
     else:
-        st.dataframe(away_players_df[["PLAYER_NAME", "AVG_PTS", "GAMES"]], use_container_width=True)
+        st.dataframe(away_players_df[["PLAYER_NAME", "AVG_PTS", "EWMA_PTS", "GAMES"]], use_container_width=True)
         away_star_name = st.selectbox(
             "Select key away player (for impact)",
             ["(None)"] + away_players_df["PLAYER_NAME"].tolist(),
@@ -297,9 +307,15 @@ X_input = X_input[feature_cols]
 # =====================================
 if st.button("🔮 Predict Win Probability (V3 View)"):
 
-    proba = model.predict_proba(X_input)[0]
-    home_prob = round(float(proba[1]) * 100, 2)
-    away_prob = round(float(proba[0]) * 100, 2)
+    # The stored/live prediction uses unadjusted features — rescore only when a star is ruled out
+    adjusted = (home_star_out and home_star_avg > 0) or (away_star_out and away_star_avg > 0)
+    if not adjusted:
+        home_prob = prediction["home_prob"]
+        away_prob = prediction["away_prob"]
+    else:
+        proba = model.predict_proba(X_input)[0]
+        home_prob = round(float(proba[1]) * 100, 2)
+        away_prob = round(float(proba[0]) * 100, 2)
     predicted_winner = home_team if home_prob > away_prob else away_team
 
     st.subheader("🔥 Prediction Result")
@@ -364,33 +380,20 @@ if st.button("🔮 Predict Win Probability (V3 View)"):
     # =============================
     # 📝 LOG PREDICTION (same table)
     # =============================
-    try:
-        cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO NBA_WIN_PREDICTIONS_LOG
-            (HOME_TEAM, AWAY_TEAM, SEASON, HOME_WIN_PROB, AWAY_WIN_PROB,
-             HOME_STREAK, AWAY_STREAK, HOME_WIN_PCT, AWAY_WIN_PCT,
-             HOME_POINTS, AWAY_POINTS, PREDICTED_WINNER)
-            VALUES (:1,:2,:3,:4,:5,:6,:7,:8,:9,:10,:11,:12)
-        """, [
-            home_team,
-            away_team,
-            None,                     # SEASON not tied in this V3 view (can adjust later)
-            home_prob,
-            away_prob,
-            None,                     # HOME_STREAK (not used here)
-            None,                     # AWAY_STREAK
-            home_win_pct_10_adj,
-            away_win_pct_10_adj,
-            home_pts_10_adj,
-            away_pts_10_adj,
-            predicted_winner
-        ])
-        conn.commit()
-        cur.close()
-        st.info("📄 Prediction logged to NBA_WIN_PREDICTIONS_LOG.")
-    except Exception as e:
-        st.warning(f"Could not log prediction: {e}")
+    get_log_writer().log(
+        HOME_TEAM=home_team,
+        AWAY_TEAM=away_team,
+        HOME_WIN_PROB=home_prob,
+        AWAY_WIN_PROB=away_prob,
+        HOME_WIN_PCT=home_win_pct_10_adj,
+        AWAY_WIN_PCT=away_win_pct_10_adj,
+        HOME_POINTS=home_pts_10_adj,
+        AWAY_POINTS=away_pts_10_adj,
+        PREDICTED_WINNER=predicted_winner,
+        # V2 model with the star-player adjustment applied on top
+        MODEL_VERSION="v2_star",
+    )
+    st.info("📄 Prediction queued for NBA_WIN_PREDICTIONS_LOG.")
 
 # Close connection at end
 conn.close()
@@ -0,0 +1,40 @@
+def create_table_if_missing(cursor, ddl):
+    """Run a CREATE TABLE, ignoring ORA-00955 (name already used)."""
+    cursor.execute(f"""
+        BEGIN
+            EXECUTE IMMEDIATE '{ddl.replace("'", "''")}';
+        EXCEPTION
+            WHEN OTHERS THEN
+                IF SQLCODE != -955 THEN
+                    RAISE;
+                END IF;
+        END;
+    """)
+
+
+def create_index_if_missing(cursor, ddl):
+    """Run a CREATE INDEX, ignoring ORA-00955 / ORA-01408 (already exists / already indexed)."""
+    cursor.execute(f"""
+        BEGIN
+            EXECUTE IMMEDIATE '{ddl.replace("'", "''")}';
+        EXCEPTION
+            WHEN OTHERS THEN
+                IF SQLCODE NOT IN (-955, -1408) THEN
+                    RAISE;
+                END IF;
+        END;
+    """)
+
+
+def add_column_if_missing(cursor, table, column_ddl):
+    """ALTER TABLE ... ADD (column), ignoring ORA-01430 (column already exists)."""
+    cursor.execute(f"""
+        BEGIN
+            EXECUTE IMMEDIATE 'ALTER TABLE {table} ADD ({column_ddl.replace("'", "''")})';
+        EXCEPTION
+            WHEN OTHERS THEN
+                IF SQLCODE != -1430 THEN
+                    RAISE;
+                END IF;
+        END;
+    """)
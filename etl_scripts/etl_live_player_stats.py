@@ -5,9 +5,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config_goat import API_KEY, BASE_URL, HEADERS
 from config import get_connection
+from etl_scripts.instrumentation import Run, SUMMARY
+from analytics.leaderboards import refresh_leaderboards
+from analytics.player_log_store import refresh_player_store
+from analytics.player_form import refresh_player_form
+from profiling import profile_from_env
 
 import requests
-import cx_Oracle
 import time
 # =========================================================
 # SAFETY CONVERSION FUNCTIONS
@@ -37,29 +41,32 @@ def convert_minutes(value):
 # =========================================================
 # 1) FETCH ACTIVE NBA PLAYERS
 # =========================================================
-def fetch_active_players(limit=300):
+def fetch_active_players(limit=300, run=None):
+    run = run or Run("fetch_active_players")
     players = []
     per_page = 100
     pages = limit // per_page
 
-    print("\n📡 Fetching active NBA players...\n")
-
     for page in range(1, pages + 1):
-        url = f"{BASE_URL}/players?per_page={per_page}&page={page}"
-        response = requests.get(url, headers=HEADERS)
+        with run.stage("fetch_players") as span:
+            url = f"{BASE_URL}/players?per_page={per_page}&page={page}"
+            response = requests.get(url, headers=HEADERS)
+
+            if response.status_code == 200:
+                data = response.json()["data"]
+                players.extend(data)
+                span.add(len(data))
 
         if response.status_code != 200:
-            print(f"❌ API ERROR Page {page}: {response.status_code}")
+            run.error(f"❌ API ERROR Page {page}: {response.status_code}", page=page)
             break
 
-        data = response.json()["data"]
-        players.extend(data)
-
-        print(f"📥 Page {page} loaded — Total players: {len(players)}")
+        run.event(f"📥 Page {page} loaded — Total players: {len(players)}", page=page, total=len(players))
+        run.progress("fetch_players", page, pages)
 
         time.sleep(0.5)  # prevent rate limiting
 
-    print(f"\n✅ Finished. Total active players retrieved: {len(players)}\n")
+    run.event(f"✅ Finished. Total active players retrieved: {len(players)}", level=SUMMARY, players=len(players))
     return players
 
 
@@ -79,34 +86,53 @@ def fetch_player_stats(player_id, limit=50):
 # =========================================================
 # 3) SAVE ALL STATS TO ORACLE — FULLY SAFE VERSION
 # =========================================================
-def save_player_stats_to_oracle(stats):
+def save_player_stats_to_oracle(stats, run=None):
+    run = run or Run("save_player_stats")
     conn = get_connection()
     cursor = conn.cursor()
 
     insert_sql = """
         INSERT INTO NBA_PLAYER_LIVE_STATS
-        (PLAYER_ID, GAME_DATE, POINTS, REBOUNDS, ASSISTS, STEALS, BLOCKS, MINUTES)
-        VALUES (:1, TO_DATE(:2,'YYYY-MM-DD'), :3, :4, :5, :6, :7, :8)
+        (PLAYER_ID, PLAYER_NAME, TEAM_NAME, SEASON, GAME_DATE,
+         POINTS, REBOUNDS, ASSISTS, STEALS, BLOCKS, TURNOVERS, MINUTES)
+        VALUES (:1, :2, :3, :4, TO_DATE(:5,'YYYY-MM-DD'), :6, :7, :8, :9, :10, :11, :12)
     """
 
-    batch = []
-    for s in stats:
-        batch.append([
-            safe_int(s.get("player", {}).get("id")),
-            s.get("game", {}).get("date", "")[:10],
-
-            safe_int(s.get("pts")),
-            safe_int(s.get("reb")),
-            safe_int(s.get("ast")),
-            safe_int(s.get("stl")),
-            safe_int(s.get("blk")),
-            convert_minutes(s.get("min"))
-        ])
-
-    cursor.executemany(insert_sql, batch)
-    conn.commit()
-
-    print(f"\n💾 Saved {len(batch)} new stat rows to Oracle.\n")
+    with run.stage("transform") as span:
+        batch = []
+        for s in stats:
+            player = s.get("player") or {}
+            batch.append([
+                safe_int(player.get("id")),
+                f"{player.get('first_name', '')} {player.get('last_name', '')}".strip() or None,
+                (s.get("team") or {}).get("full_name"),
+                safe_int(s.get("game", {}).get("season")) or None,   # leaderboards group by season
+                s.get("game", {}).get("date", "")[:10],
+
+                safe_int(s.get("pts")),
+                safe_int(s.get("reb")),
+                safe_int(s.get("ast")),
+                safe_int(s.get("stl")),
+                safe_int(s.get("blk")),
+                safe_int(s.get("turnover")),
+                convert_minutes(s.get("min"))
+            ])
+        span.add(len(batch))
+
+    with run.stage("write") as span:
+        cursor.executemany(insert_sql, batch)
+        conn.commit()
+        span.add(len(batch))
+
+    run.event(f"💾 Saved {len(batch)} new stat rows to Oracle.", level=SUMMARY, rows=len(batch))
+
+    # Fold the new rows into season totals / league leaders
+    with run.stage("leaders") as span:
+        span.add(refresh_leaderboards(conn))
+    with run.stage("player_store") as span:
+        span.add(refresh_player_store(conn))
+    with run.stage("player_form") as span:
+        span.add(refresh_player_form(conn))
 
     cursor.close()
     conn.close()
@@ -116,28 +142,35 @@ def save_player_stats_to_oracle(stats):
 # MAIN EXECUTION PIPELINE
 # =========================================================
 if __name__ == "__main__":
-    players = fetch_active_players(limit=300)  # adjust number anytime
+    profile_from_env()
+    run = Run("etl_live_player_stats")
+    players = fetch_active_players(limit=300, run=run)  # adjust number anytime
 
-    print("\n📊 Fetching live stats for players...\n")
     all_stats = []
 
-    for p in players:
+    for i, p in enumerate(players, start=1):
         pid = p["id"]
         name = f"{p['first_name']} {p['last_name']}"
 
-        stats = fetch_player_stats(pid)
+        with run.stage("fetch_stats") as span:
+            stats = fetch_player_stats(pid)
+            span.add(len(stats))
 
         if stats:
-            print(f"📈 Loaded stats → {name} ({len(stats)} games)")
+            run.event(f"📈 Loaded stats → {name} ({len(stats)} games)", player_id=pid, games=len(stats))
             all_stats.extend(stats)
+        else:
+            run.count("players_without_stats")
+        run.progress("fetch_stats", i, len(players))
 
         time.sleep(0.4)  # avoid API rate limits
 
-    print(f"\n📁 Total Game Logs Retrieved: {len(all_stats)}\n")
+    run.event(f"📁 Total Game Logs Retrieved: {len(all_stats)}", level=SUMMARY, game_logs=len(all_stats))
 
     if all_stats:
-        save_player_stats_to_oracle(all_stats)
+        save_player_stats_to_oracle(all_stats, run=run)
 
+    run.finish()
     print("=======================================")
     print("   🔥 LIVE PLAYER STATS SYNCED 🔥")
     print("=======================================\n")
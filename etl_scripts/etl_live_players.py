@@ -2,51 +2,74 @@ import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import requests
-import cx_Oracle
 from config import get_connection
+from config_goat import BASE_URL
+from etl_scripts.instrumentation import Run
+from analytics.leaderboards import refresh_leaderboards
+from analytics.player_log_store import refresh_player_store
+from analytics.player_form import refresh_player_form
+from profiling import profile_from_env
 
-API_URL = "https://api.balldontlie.io/v1/stats"
+API_URL = f"{BASE_URL}/stats"
 API_KEY = "YOUR_API_KEY_HERE"   # <- must be valid
 
 headers = {"Authorization": f"Bearer {API_KEY}"}
 
-def fetch_stats(page=1):
-    response = requests.get(f"{API_URL}?per_page=100&page={page}", headers=headers)
-    if response.status_code != 200:
-        print("❌ API ERROR:", response.status_code)
-        return []
-    
-    data = response.json().get("data", [])
+def fetch_stats(page=1, run=None):
+    run = run or Run("fetch_live_stats")
+    with run.stage("fetch") as span:
+        response = requests.get(f"{API_URL}?per_page=100&page={page}", headers=headers)
+        if response.status_code != 200:
+            run.error(f"❌ API ERROR: {response.status_code}", page=page)
+            return []
+
+        data = response.json().get("data", [])
+        span.add(len(data))
     return data
 
-def load_into_oracle(records):
+def load_into_oracle(records, run=None):
+    run = run or Run("load_live_stats")
     conn = get_connection()
     cursor = conn.cursor()
 
-    for rec in records:
-        try:
-            cursor.execute("""
-                INSERT INTO NBA_PLAYER_LIVE_STATS
-                (PLAYER_ID, PLAYER_NAME, TEAM_NAME, SEASON, GAME_DATE,
-                POINTS, REBOUNDS, ASSISTS, STEALS, BLOCKS, TURNOVERS, MINUTES)
-                VALUES (:1,:2,:3,:4,:5,:6,:7,:8,:9,:10,:11,:12)
-            """, (
-                rec["player"]["id"],
-                rec["player"]["first_name"] + " " + rec["player"]["last_name"],
-                rec["team"]["full_name"],
-                rec["game"]["season"],
-                rec["game"]["date"][:10],
-                rec["pts"], rec["reb"], rec["ast"], rec["stl"], rec["blk"], rec["turnover"], rec["min"]
-            ))
-        except:
-            continue
-
-    conn.commit()
+    with run.stage("write") as span:
+        for rec in records:
+            try:
+                cursor.execute("""
+                    INSERT INTO NBA_PLAYER_LIVE_STATS
+                    (PLAYER_ID, PLAYER_NAME, TEAM_NAME, SEASON, GAME_DATE,
+                    POINTS, REBOUNDS, ASSISTS, STEALS, BLOCKS, TURNOVERS, MINUTES)
+                    VALUES (:1,:2,:3,:4,:5,:6,:7,:8,:9,:10,:11,:12)
+                """, (
+                    rec["player"]["id"],
+                    rec["player"]["first_name"] + " " + rec["player"]["last_name"],
+                    rec["team"]["full_name"],
+                    rec["game"]["season"],
+                    rec["game"]["date"][:10],
+                    rec["pts"], rec["reb"], rec["ast"], rec["stl"], rec["blk"], rec["turnover"], rec["min"]
+                ))
+                span.add()
+            except:
+                run.count("skipped")
+                continue
+        conn.commit()
+
+    # Fold the new rows into season totals / league leaders
+    with run.stage("leaders") as span:
+        span.add(refresh_leaderboards(conn))
+    with run.stage("player_store") as span:
+        span.add(refresh_player_store(conn))
+    with run.stage("player_form") as span:
+        span.add(refresh_player_form(conn))
+
     cursor.close()
     conn.close()
 
 if __name__ == "__main__":
+    profile_from_env()
+    run = Run("etl_live_players")
     print("📡 Fetching live player stats…")
-    data = fetch_stats()
-    load_into_oracle(data)
+    data = fetch_stats(run=run)
+    load_into_oracle(data, run=run)
     print("✅ Live stats inserted into Oracle!")
+    run.finish()
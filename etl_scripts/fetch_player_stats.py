@@ -1,6 +1,9 @@
 import sys, os, requests
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import get_connection
+from config_goat import BASE_URL
+from etl_scripts.instrumentation import Run, SUMMARY
+from profiling import profile_from_env
 
 def create_table(cursor):
     cursor.execute("""
@@ -26,7 +29,7 @@ def create_table(cursor):
         END;
     """)
 
-def insert_player_stats(cursor, stats):
+def insert_player_stats(cursor, stats, run=None):
     for s in stats:
         player = s.get('player', {})
         game = s.get('game', {})
@@ -47,36 +50,47 @@ def insert_player_stats(cursor, stats):
         except Exception as e:
             if "ORA-00001" in str(e):
                 continue
+            elif run:
+                run.count("skipped")
+                run.event(f"⚠️ Skipping record due to error: {e}")
             else:
                 print(f"⚠️ Skipping record due to error: {e}")
 
 def main():
+    run = Run("fetch_player_stats")
     conn = get_connection()
     cursor = conn.cursor()
     create_table(cursor)
-    print("🧱 Player_Stats table ready.")
+    run.event("🧱 Player_Stats table ready.")
 
     headers = {
         "Accept": "application/json",
         "Authorization": "081aceca-0dd3-40f8-a617-bf5ce7212364"  # Replace with your real key
     }
 
-    print("📡 Fetching player stats from API...")
-    response = requests.get("https://api.balldontlie.io/v1/stats?per_page=50", headers=headers)
-    print("HTTP Status:", response.status_code)
-    print("Response text:", response.text[:200])
+    run.event("📡 Fetching player stats from API...")
+    with run.stage("fetch") as span:
+        response = requests.get(f"{BASE_URL}/stats?per_page=50", headers=headers)
+        run.event(f"HTTP Status: {response.status_code}", status=response.status_code)
+        run.event(f"Response text: {response.text[:200]}")
+        data = response.json()['data'] if response.status_code == 200 else []
+        span.add(len(data))
 
     if response.status_code != 200:
-        print("❌ API request failed.")
+        run.error("❌ API request failed.", status=response.status_code)
+        run.finish()
         return
 
-    data = response.json()['data']
-    insert_player_stats(cursor, data)
-    conn.commit()
-    print(f"✅ Inserted {len(data)} player stat records into Oracle DB.")
+    with run.stage("write") as span:
+        insert_player_stats(cursor, data, run)
+        conn.commit()
+        span.add(len(data))
+    run.event(f"✅ Inserted {len(data)} player stat records into Oracle DB.", level=SUMMARY, records=len(data))
 
     cursor.close()
     conn.close()
+    run.finish()
 
 if __name__ == "__main__":
+    profile_from_env()
     main()
@@ -3,6 +3,9 @@ import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import requests
 from config import get_connection
+from config_goat import BASE_URL
+from etl_scripts.instrumentation import Run, SUMMARY
+from profiling import profile_from_env
 
 def create_table(cursor):
     cursor.execute("""
@@ -44,32 +47,36 @@ def insert_players(cursor, players):
 
 
 def main():
+    run = Run("fetch_players")
     conn = get_connection()
     cursor = conn.cursor()
 
     # Create table
     create_table(cursor)
-    print("🧱 Players table ready.")
+    run.event("🧱 Players table ready.")
 
     # Fetch player data from the API
-    print("📡 Fetching data from API...")
-    headers = {"Accept": "application/json","Authorization": "081aceca-0dd3-40f8-a617-bf5ce7212364"}
-    response = requests.get("https://api.balldontlie.io/v1/players?per_page=50", headers=headers)
-    print("HTTP Status:", response.status_code)
-    print("Response text:", response.text[:200])  # shows first 200 chars
+    with run.stage("fetch") as span:
+        headers = {"Accept": "application/json","Authorization": "081aceca-0dd3-40f8-a617-bf5ce7212364"}
+        response = requests.get(f"{BASE_URL}/players?per_page=50", headers=headers)
+        run.event(f"HTTP Status: {response.status_code}", status=response.status_code)
+        run.event(f"Response text: {response.text[:200]}")  # shows first 200 chars
+
+        data = response.json()['data']
+        span.add(len(data))
 
-    data = response.json()['data']
-    insert_players(cursor, data)
-    conn.commit()
-    print(f"✅ Inserted {len(data)} players into Oracle DB.")
     # Insert into Oracle
-    insert_players(cursor, data)
-    conn.commit()
+    with run.stage("write") as span:
+        insert_players(cursor, data)
+        conn.commit()
+        span.add(len(data))
 
-    print(f"✅ Inserted {len(data)} players into Oracle DB.")
+    run.event(f"✅ Inserted {len(data)} players into Oracle DB.", level=SUMMARY, records=len(data))
 
     cursor.close()
     conn.close()
+    run.finish()
 
 if __name__ == "__main__":
+    profile_from_env()
     main()
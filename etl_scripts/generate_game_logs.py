@@ -1,7 +1,15 @@
+import os
+import sys
 import csv
 import random
 from datetime import datetime, timedelta
 
+# Make sure Python can see the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from profiling import profile_from_env
+
+profile_from_env()
+
 # === Config ===
 output_path = r"D:\sports-data-intelligence\data\nba_game_logs\nba_game_logs.csv"
 
@@ -59,8 +67,9 @@ for i in range(num_games):
         winner = away
         loser = home
 
-    home_streak = random.randint(0, 6)
-    away_streak = random.randint(0, 6)
+    # Real pre-game streaks are computed by load_game_logs.py from the results
+    home_streak = 0
+    away_streak = 0
 
     note = random.choice(notes_pool)
 
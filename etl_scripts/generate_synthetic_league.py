@@ -0,0 +1,369 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# Make sure Python can see the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.streaks import pregame_streaks
+from analytics.team_name_map import CONFERENCES
+from profiling import profile_from_env
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUT = os.path.join(PROJECT_ROOT, "data", "synthetic")
+
+TEAMS = sorted(CONFERENCES)
+FIRST_TEAM_ID = 1610612737
+
+ROSTER_SIZE = 13
+ACTIVE_PLAYERS = 10            # players who see the floor each game
+ROSTER_TURNOVER = 3            # new players per team per season
+EXTRA_ROUNDS = 24              # 58 round-robin games + 24 = 82 per team
+GAMES_PER_DAY = 8             # a 15-game round is split 8 / 7 over two days
+
+LEAGUE_PPG = 112.0
+HOME_EDGE = 2.5
+MARGIN_SD = 12.0
+STRENGTH_SD = 4.5
+STRENGTH_CARRYOVER = 0.6       # AR(1) season-to-season team strength
+
+FIRST_NAMES = ["James", "Marcus", "Tyrese", "Jalen", "Luka", "Devin", "Anthony", "Jaylen",
+               "Kevin", "Darius", "Mikal", "Donovan", "Trae", "Jamal", "Bam", "Scottie",
+               "Evan", "Paolo", "Franz", "Cade", "Zion", "Shai", "De'Aaron", "Desmond"]
+LAST_NAMES = ["Walker", "Brooks", "Harris", "Green", "Mitchell", "Johnson", "Young", "Murray",
+              "Barnes", "Banchero", "Wagner", "Cunningham", "Williams", "Brown", "Allen", "Holiday",
+              "Porter", "Bridges", "Adebayo", "Mobley", "Garland", "Fox", "Bane", "Jackson"]
+
+GAME_LOG_COLUMNS = [
+    "GAME_DATE", "SEASON", "HOME_TEAM", "AWAY_TEAM",
+    "HOME_POINTS", "AWAY_POINTS", "WINNER", "LOSER",
+    "HOME_STREAK", "AWAY_STREAK", "NOTES",
+]
+
+
+# =====================================
+# Schedule
+# =====================================
+def round_robin_rounds(n_teams):
+    """Circle method: n-1 rounds of n/2 (home, away) index pairs, everyone plays once per round."""
+    teams = np.arange(n_teams)
+    rounds = []
+    for r in range(n_teams - 1):
+        order = np.concatenate([[0], np.roll(teams[1:], r)])
+        rounds.append(np.column_stack([order[: n_teams // 2], order[::-1][: n_teams // 2]]))
+    return rounds
+
+
+def season_schedule(rng, n_teams=len(TEAMS)):
+    """
+    82 rounds x n/2 games: a home-and-home round robin (58 rounds for 30
+    teams) plus EXTRA_ROUNDS random pairings with random home court.
+    Each round is spread over two days so no team plays twice on one date.
+    """
+    base = round_robin_rounds(n_teams)
+    rounds = base + [r[:, ::-1] for r in base]
+    for _ in range(EXTRA_ROUNDS):
+        perm = rng.permutation(n_teams).reshape(-1, 2)
+        flip = rng.random(len(perm)) < 0.5
+        rounds.append(np.where(flip[:, None], perm[:, ::-1], perm))
+
+    order = rng.permutation(len(rounds))
+    pairs = np.concatenate([rounds[i] for i in order])
+    per_round = n_teams // 2
+    idx = np.arange(len(pairs))
+    day = (idx // per_round) * 2 + (idx % per_round >= GAMES_PER_DAY)
+    return pairs[:, 0], pairs[:, 1], day
+
+
+# =====================================
+# Teams and players
+# =====================================
+def new_players(rng, n, next_id):
+    ids = np.arange(next_id, next_id + n)
+    names = [f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i * 7) % len(LAST_NAMES)]} {i}" for i in ids]
+    return pd.DataFrame({
+        "PLAYER_ID": ids,
+        "PLAYER_NAME": names,
+        "USAGE": rng.gamma(2.0, 1.0, n),
+        "MINUTES_W": rng.gamma(3.0, 1.0, n),
+        "REB_W": rng.gamma(2.0, 1.0, n),
+        "AST_W": rng.gamma(1.5, 1.0, n),
+        "FG_PCT": rng.normal(0.46, 0.035, n).clip(0.35, 0.62),
+        "FG3_PCT": rng.normal(0.35, 0.04, n).clip(0.20, 0.46),
+        "FT_PCT": rng.normal(0.77, 0.07, n).clip(0.50, 0.95),
+    })
+
+
+def initial_rosters(rng):
+    players = new_players(rng, len(TEAMS) * ROSTER_SIZE, 1)
+    players["TEAM_IDX"] = np.repeat(np.arange(len(TEAMS)), ROSTER_SIZE)
+    return players
+
+
+def turn_over_rosters(rng, rosters):
+    """Replace the lowest-usage ROSTER_TURNOVER players on every team with new ones."""
+    drop = rosters.groupby("TEAM_IDX")["USAGE"].rank(method="first") <= ROSTER_TURNOVER
+    fresh = new_players(rng, int(drop.sum()), int(rosters["PLAYER_ID"].max()) + 1)
+    fresh["TEAM_IDX"] = rosters.loc[drop, "TEAM_IDX"].to_numpy()
+    return pd.concat([rosters[~drop], fresh], ignore_index=True).sort_values(
+        ["TEAM_IDX", "PLAYER_ID"], ignore_index=True
+    )
+
+
+# =====================================
+# One season, fully vectorized
+# =====================================
+def simulate_season(rng, season, strength, offense, rosters, first_game_id):
+    home, away, day = season_schedule(rng)
+    n_games = len(home)
+    start = pd.Timestamp(year=season - 1, month=10, day=24)
+    game_date = start + pd.to_timedelta(day, unit="D")
+
+    # Scores: margin from the strength gap, total from both offenses
+    margin = rng.normal(strength[home] - strength[away] + HOME_EDGE, MARGIN_SD)
+    total = rng.normal(2 * LEAGUE_PPG + offense[home] + offense[away], 10.0)
+    margin = np.rint(margin).astype(int)
+    margin[margin == 0] = rng.choice([-1, 1], (margin == 0).sum())   # no ties — overtime
+    away_pts = np.rint((total - margin) / 2).astype(int)
+    home_pts = away_pts + margin
+
+    games = pd.DataFrame({
+        "GAME_ID": first_game_id + np.arange(n_games),
+        "GAME_DATE": game_date,
+        "SEASON": season,
+        "HOME_TEAM": np.array(TEAMS)[home],
+        "AWAY_TEAM": np.array(TEAMS)[away],
+        "HOME_POINTS": home_pts,
+        "AWAY_POINTS": away_pts,
+    })
+    home_won = margin > 0
+    games["WINNER"] = np.where(home_won, games["HOME_TEAM"], games["AWAY_TEAM"])
+    games["LOSER"] = np.where(home_won, games["AWAY_TEAM"], games["HOME_TEAM"])
+    games[["HOME_STREAK", "AWAY_STREAK"]] = pregame_streaks(games)
+    games["NOTES"] = np.where(np.abs(margin) >= 20, "Blowout win",
+                              np.where(np.abs(margin) <= 3, "Close game", "Synthetic game"))
+
+    box = simulate_box_scores(rng, games, home, away, home_pts, away_pts, rosters)
+    return games, box
+
+
+def simulate_box_scores(rng, games, home, away, home_pts, away_pts, rosters):
+    """
+    Player lines for both sides of every game. Team totals are split across
+    the ACTIVE_PLAYERS with multinomial draws, so player points always add
+    up to the team score in the game log.
+    """
+    n_games = len(games)
+    side_team = np.concatenate([home, away])                 # (2G,)
+    side_pts = np.concatenate([home_pts, away_pts])
+    n_sides = len(side_team)
+
+    # rosters sorted by TEAM_IDX: a (teams, ROSTER_SIZE) view of each weight
+    def per_team(col):
+        return rosters[col].to_numpy().reshape(len(TEAMS), ROSTER_SIZE)
+
+    # Pick the active players for every side: highest minutes weight plus noise
+    minutes_w = per_team("MINUTES_W")[side_team] * rng.gamma(8.0, 1 / 8.0, (n_sides, ROSTER_SIZE))
+    active = np.argsort(-minutes_w, axis=1)[:, :ACTIVE_PLAYERS]
+    rows = np.arange(n_sides)[:, None]
+
+    def weights(col, noise=4.0):
+        w = per_team(col)[side_team][rows, active] * rng.gamma(noise, 1 / noise, (n_sides, ACTIVE_PLAYERS))
+        return w / w.sum(axis=1, keepdims=True)
+
+    minutes_share = minutes_w[rows, active] / minutes_w[rows, active].sum(axis=1, keepdims=True)
+    minutes = np.round(minutes_share * 240, 1)
+
+    usage = weights("USAGE") * minutes_share
+    usage /= usage.sum(axis=1, keepdims=True)
+    points = rng.multinomial(side_pts, usage)
+    rebounds = rng.multinomial(rng.poisson(44, n_sides), weights("REB_W"))
+    assists = rng.multinomial(rng.poisson(25, n_sides), weights("AST_W"))
+    steals = rng.multinomial(rng.poisson(7.5, n_sides), minutes_share)
+    blocks = rng.multinomial(rng.poisson(5, n_sides), weights("REB_W"))
+    turnovers = rng.multinomial(rng.poisson(13.5, n_sides), usage)
+
+    player_ids = per_team("PLAYER_ID")[side_team][rows, active]
+    names = rosters["PLAYER_NAME"].to_numpy().reshape(len(TEAMS), ROSTER_SIZE)[side_team][rows, active]
+    game_idx = np.tile(np.arange(n_games), 2)
+
+    flat = lambda a: a.ravel()
+    return pd.DataFrame({
+        "PLAYER_ID": flat(player_ids),
+        "PLAYER_NAME": flat(names),
+        "TEAM_NAME": np.repeat(np.array(TEAMS)[side_team], ACTIVE_PLAYERS),
+        "SEASON": games["SEASON"].iloc[0],
+        "GAME_ID": np.repeat(games["GAME_ID"].to_numpy()[game_idx], ACTIVE_PLAYERS),
+        "GAME_DATE": np.repeat(games["GAME_DATE"].dt.strftime("%Y-%m-%d").to_numpy()[game_idx], ACTIVE_PLAYERS),
+        "POINTS": flat(points),
+        "REBOUNDS": flat(rebounds),
+        "ASSISTS": flat(assists),
+        "STEALS": flat(steals),
+        "BLOCKS": flat(blocks),
+        "TURNOVERS": flat(turnovers),
+        "MINUTES": flat(minutes),
+    })
+
+
+# =====================================
+# Season aggregates
+# =====================================
+def team_season_stats(games):
+    """NBA_TEAM_STATS-shaped rows (what load_csv_to_oracle.py reads)."""
+    long = pd.DataFrame({
+        "TEAM_NAME": np.concatenate([games["HOME_TEAM"], games["AWAY_TEAM"]]),
+        "PTS": np.concatenate([games["HOME_POINTS"], games["AWAY_POINTS"]]),
+        "OPP": np.concatenate([games["AWAY_POINTS"], games["HOME_POINTS"]]),
+    })
+    long["W"] = (long["PTS"] > long["OPP"]).astype(int)
+    agg = long.groupby("TEAM_NAME").agg(GP=("W", "size"), W=("W", "sum"), PTS=("PTS", "mean"), OPP=("OPP", "mean"))
+    agg["L"] = agg["GP"] - agg["W"]
+    agg["W_PCT"] = (agg["W"] / agg["GP"]).round(3)
+    agg["PLUS_MINUS"] = (agg["PTS"] - agg["OPP"]).round(1) + 0.0
+    agg["PTS"] = agg["PTS"].round(1)
+    agg["TEAM_ID"] = FIRST_TEAM_ID + agg.index.map({t: i for i, t in enumerate(TEAMS)})
+    agg["SEASON"] = int(games["SEASON"].iloc[0])
+    return agg.reset_index()[["TEAM_ID", "TEAM_NAME", "SEASON", "GP", "W", "L", "W_PCT", "PTS", "PLUS_MINUS"]]
+
+
+def player_season_stats(box, rosters):
+    """NBA_PLAYER_STATS-shaped per-game averages (what load_player_stats_csv.py reads)."""
+    agg = box.groupby(["PLAYER_ID", "PLAYER_NAME", "TEAM_NAME", "SEASON"]).agg(
+        GAMES_PLAYED=("POINTS", "size"),
+        MINUTES=("MINUTES", "mean"),
+        POINTS=("POINTS", "mean"),
+        ASSISTS=("ASSISTS", "mean"),
+        REBOUNDS=("REBOUNDS", "mean"),
+        STEALS=("STEALS", "mean"),
+        BLOCKS=("BLOCKS", "mean"),
+        TURNOVERS=("TURNOVERS", "mean"),
+    ).round(1).reset_index()
+
+    skills = rosters.set_index("PLAYER_ID")
+    agg["FG_PERCENT"] = agg["PLAYER_ID"].map(skills["FG_PCT"]).round(3)
+    agg["THREE_PERCENT"] = agg["PLAYER_ID"].map(skills["FG3_PCT"]).round(3)
+    agg["FT_PERCENT"] = agg["PLAYER_ID"].map(skills["FT_PCT"]).round(3)
+    return agg.drop(columns="PLAYER_ID")
+
+
+# =====================================
+# Season stream
+# =====================================
+def iter_seasons(n_seasons=1, start_season=2024, seed=42):
+    """
+    Yield (games, box_scores, rosters) one season at a time. Each season
+    draws from its own SeedSequence child, so the output for a given seed
+    does not depend on how many seasons are requested or how they are
+    consumed (files, the mock API server, ...).
+    """
+    root = np.random.SeedSequence(seed)
+    league_rng = np.random.default_rng(root.spawn(1)[0])
+    season_seeds = root.spawn(n_seasons)
+
+    strength = league_rng.normal(0, STRENGTH_SD, len(TEAMS))
+    offense = league_rng.normal(0, 3.0, len(TEAMS))
+    rosters = initial_rosters(league_rng)
+    game_id = 1
+
+    for i in range(n_seasons):
+        rng = np.random.default_rng(season_seeds[i])
+        if i:
+            strength = STRENGTH_CARRYOVER * strength + rng.normal(0, STRENGTH_SD * 0.8, len(TEAMS))
+            offense = 0.7 * offense + rng.normal(0, 2.0, len(TEAMS))
+            rosters = turn_over_rosters(rng, rosters)
+
+        games, box = simulate_season(rng, start_season + i, strength, offense, rosters, game_id)
+        game_id += len(games)
+        yield games, box, rosters
+
+
+# =====================================
+# Streaming writers
+# =====================================
+class TableWriter:
+    """Append DataFrames to one CSV or Parquet file without holding earlier chunks."""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self._parquet = None
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write(self, df):
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, mode="a", header=self.rows == 0, index=False)
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def generate_league(n_seasons=1, start_season=2024, seed=42, out_dir=DEFAULT_OUT,
+                    fmt="csv", players=True):
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("⚠️ pyarrow not installed — falling back to CSV")
+            fmt = "csv"
+
+    os.makedirs(out_dir, exist_ok=True)
+    ext = "parquet" if fmt == "parquet" else "csv"
+    writers = {
+        "game_logs": TableWriter(os.path.join(out_dir, f"nba_game_logs.{ext}"), fmt),
+        "team_stats": TableWriter(os.path.join(out_dir, f"nba_team_stats.{ext}"), fmt),
+    }
+    if players:
+        writers["player_games"] = TableWriter(os.path.join(out_dir, f"nba_player_game_stats.{ext}"), fmt)
+        writers["player_stats"] = TableWriter(os.path.join(out_dir, f"nba_player_stats.{ext}"), fmt)
+
+    print(f"\n🏭 Generating {n_seasons} synthetic season(s) → {out_dir} ({fmt}, seed {seed})\n")
+    start = time.perf_counter()
+
+    for i, (games, box, rosters) in enumerate(iter_seasons(n_seasons, start_season, seed)):
+        out_games = games.assign(GAME_DATE=games["GAME_DATE"].dt.strftime("%Y-%m-%d"))[GAME_LOG_COLUMNS]
+        writers["game_logs"].write(out_games)
+        writers["team_stats"].write(team_season_stats(games))
+        if players:
+            writers["player_games"].write(box)
+            writers["player_stats"].write(player_season_stats(box, rosters))
+
+        if (i + 1) % 10 == 0 or i + 1 == n_seasons:
+            print(f"   • {i + 1}/{n_seasons} seasons | {writers['game_logs'].rows:,} games "
+                  f"| {time.perf_counter() - start:.1f}s")
+
+    for w in writers.values():
+        w.close()
+
+    print()
+    for name, w in writers.items():
+        size = os.path.getsize(w.path) / 1e6
+        print(f"💾 {name:<13} {w.rows:>12,} rows  {size:>9.1f} MB  {w.path}")
+    print(f"\n🎉 Done in {time.perf_counter() - start:.1f}s\n")
+
+
+if __name__ == "__main__":
+    profile_from_env()
+    parser = argparse.ArgumentParser(description="Generate a synthetic NBA league for load/benchmark testing")
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--start-season", type=int, default=2024, help="first season (end year)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--no-players", action="store_true", help="skip player box scores and season stats")
+    args = parser.parse_args()
+
+    generate_league(args.seasons, args.start_season, args.seed, args.out, args.format, not args.no_players)
@@ -0,0 +1,161 @@
+"""
+Stage timing and throughput for the ETL scripts.
+
+    run = Run("etl_load_players")
+    with run.stage("fetch") as s:
+        data = requests.get(...).json()["data"]
+        s.add(len(data))                  # records handled by this span
+    run.count("api_errors")
+    run.progress("fetch", page, pages)    # throttled, replaces one print per page
+    run.finish()                          # summary: calls, records, seconds, rec/s per stage
+
+Spans with the same name accumulate, so a stage opened once per page still
+reports one line. Console output is controlled by SDI_ETL_VERBOSITY:
+0 = errors only, 1 = start/progress/summary (default), 2 = every span,
+3 = every event. Spans, events at or below the sink level and the summary
+are appended as JSON lines to SDI_ETL_LOG (default logs/etl_runs.jsonl;
+"off" disables the sink).
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import atexit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LOG = os.path.join(PROJECT_ROOT, "logs", "etl_runs.jsonl")
+
+QUIET, SUMMARY, STAGE, DEBUG = 0, 1, 2, 3
+PROGRESS_SECONDS = 5.0     # at most one progress line per stage this often
+
+
+def env_level(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class Span:
+    """One timed pass through a stage; `add()` the records it handled."""
+
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+        self.records = 0
+
+    def add(self, n=1):
+        self.records += n
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.run._close_span(self, time.perf_counter() - self.start, exc)
+        return False
+
+
+class Run:
+    def __init__(self, name, verbosity=None, log_path=None):
+        self.name = name
+        self.run_id = uuid.uuid4().hex[:12]
+        self.verbosity = env_level("SDI_ETL_VERBOSITY", SUMMARY) if verbosity is None else verbosity
+        self.sink_level = max(self.verbosity, env_level("SDI_ETL_LOG_LEVEL", STAGE))
+        self.stages = {}       # name → {"calls", "records", "seconds", "errors"}
+        self.counters = {}
+        self.last_progress = {}
+        self.started = time.perf_counter()
+        self.finished = False
+
+        log_path = log_path or os.environ.get("SDI_ETL_LOG", DEFAULT_LOG)
+        self.sink = None
+        if log_path.lower() not in ("off", "none", "0", ""):
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            self.sink = open(log_path, "a", encoding="utf-8")
+
+        self.emit("run_start", SUMMARY, f"🚀 {name} started", argv=sys.argv[1:])
+        atexit.register(self.finish)
+
+    # ---------------------------------
+    # Recording
+    # ---------------------------------
+    def emit(self, kind, level, text=None, **fields):
+        if text and level <= self.verbosity:
+            print(text)
+        if self.sink and level <= self.sink_level and not self.sink.closed:
+            record = {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "run": self.name,
+                      "run_id": self.run_id, "kind": kind, **fields}
+            self.sink.write(json.dumps(record, default=str) + "\n")
+
+    def stage(self, name):
+        return Span(self, name)
+
+    def _close_span(self, span, seconds, exc):
+        s = self.stages.setdefault(span.name, {"calls": 0, "records": 0, "seconds": 0.0, "errors": 0})
+        s["calls"] += 1
+        s["records"] += span.records
+        s["seconds"] += seconds
+        s["errors"] += exc is not None
+        self.emit("span", STAGE, f"   ⏱️ {span.name}: {span.records} records in {seconds:.3f}s",
+                  stage=span.name, records=span.records, seconds=round(seconds, 6),
+                  error=f"{type(exc).__name__}: {exc}" if exc else None)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def event(self, message, level=DEBUG, **fields):
+        """A log line for things that used to be print()s inside loops."""
+        self.emit("event", level, message, message=message, **fields)
+
+    def error(self, message, **fields):
+        self.count("errors")
+        self.emit("error", QUIET, message, message=message, **fields)
+
+    def progress(self, stage, done, total=None):
+        """Throttled progress line (at most one per PROGRESS_SECONDS per stage)."""
+        now = time.perf_counter()
+        if total is None or done < total:
+            if now - self.last_progress.get(stage, self.started) < PROGRESS_SECONDS:
+                return
+        self.last_progress[stage] = now
+        s = self.stages.get(stage, {"records": 0, "seconds": 0.0})
+        rate = s["records"] / s["seconds"] if s["seconds"] else 0.0
+        of = f"/{total}" if total else ""
+        self.emit("progress", SUMMARY, f"   ⏳ {stage}: {done}{of} — {s['records']} records, {rate:,.0f} rec/s",
+                  stage=stage, done=done, total=total, records=s["records"])
+
+    # ---------------------------------
+    # Summary
+    # ---------------------------------
+    def summary(self):
+        stages = {}
+        for name, s in self.stages.items():
+            stages[name] = dict(s, seconds=round(s["seconds"], 4),
+                                records_per_s=round(s["records"] / s["seconds"], 1) if s["seconds"] else None)
+        return {"wall_s": round(time.perf_counter() - self.started, 4), "stages": stages,
+                "counters": dict(self.counters)}
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        result = self.summary()
+
+        if self.verbosity >= SUMMARY and self.stages:
+            print(f"\n📊 {self.name} — {result['wall_s']:.2f}s")
+            print(f"   {'stage':<16}{'calls':>7}{'records':>10}{'seconds':>10}{'rec/s':>10}{'share':>8}")
+            for name, s in result["stages"].items():
+                rate = f"{s['records_per_s']:,.0f}" if s["records_per_s"] else "-"
+                share = s["seconds"] / result["wall_s"] * 100 if result["wall_s"] else 0
+                print(f"   {name:<16}{s['calls']:>7}{s['records']:>10}{s['seconds']:>10.3f}{rate:>10}{share:>7.0f}%")
+            if self.counters:
+                print("   " + ", ".join(f"{k}={v}" for k, v in self.counters.items()))
+            print()
+
+        self.emit("summary", QUIET, **result)
+        if self.sink and not self.sink.closed:
+            self.sink.close()
+        return result
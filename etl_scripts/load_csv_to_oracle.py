@@ -1,38 +1,58 @@
-import cx_Oracle
 import csv
 import os
+import sys
+
+# Make sure Python can see config.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from config import get_connection
+from etl_scripts.instrumentation import Run
+from analytics.player_advanced import refresh_player_advanced
+from profiling import profile_from_env
 
 def load_csv_to_oracle(csv_path):
+    run = Run("load_csv_to_oracle")
     conn = get_connection()
     cursor = conn.cursor()
 
     print(f"📂 Loading data from {csv_path}")
+    seasons = set()
+
+    with run.stage("write") as span:
+        with open(csv_path, 'r', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                season = int(row.get('SEASON') or 2024)   # NBA API exports have no SEASON column
+                seasons.add(season)
+                cursor.execute("""
+                    INSERT INTO nba_team_stats (team_id, team_name, season, wins, losses, win_pct, points)
+                    VALUES (:1, :2, :3, :4, :5, :6, :7)
+                """, (
+                    row['TEAM_ID'],
+                    row['TEAM_NAME'],
+                    season,
+                    row['W'],
+                    row['L'],
+                    row['W_PCT'],
+                    row['PTS']
+                ))
+                span.add()
+
+        conn.commit()
 
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            cursor.execute("""
-                INSERT INTO nba_team_stats (team_id, team_name, season, wins, losses, win_pct, points)
-                VALUES (:1, :2, :3, :4, :5, :6, :7)
-            """, (
-                row['TEAM_ID'],
-                row['TEAM_NAME'],
-                2024,
-                row['W'],
-                row['L'],
-                row['W_PCT'],
-                row['PTS']
-            ))
-
-    conn.commit()
     print("✅ Data inserted successfully!")
 
+    # Team scoring and wins feed the advanced player metrics of those seasons
+    with run.stage("advanced") as span:
+        span.add(refresh_player_advanced(conn, sorted(seasons)))
+
     cursor.close()
     conn.close()
+    run.finish()
 
 
 if __name__ == "__main__":
+    profile_from_env()
     csv_path = r"D:\sports-data-intelligence\data\nba_team_stats\nba_team_stats.csv"
     if os.path.exists(csv_path):
         load_csv_to_oracle(csv_path)
@@ -1,60 +1,96 @@
-import cx_Oracle
-import csv
 import os
 import sys
+import pandas as pd
 
 # Make sure Python can see config.py
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import get_connection
+from analytics.streaks import refresh_streaks
+from analytics.srs_ratings import update_srs
+from etl_scripts.instrumentation import Run
+from profiling import profile_from_env
+
+CSV_COLUMNS = [
+    "GAME_DATE", "SEASON", "HOME_TEAM", "AWAY_TEAM",
+    "HOME_POINTS", "AWAY_POINTS", "WINNER", "LOSER",
+    "HOME_STREAK", "AWAY_STREAK", "NOTES",
+]
 
 
 def load_game_logs(csv_path):
-    """Load NBA game logs from CSV into Oracle."""
+    """Load NBA game logs from CSV into Oracle, then compute real pre-game streaks."""
 
     if not os.path.exists(csv_path):
         print("❌ CSV file not found:", csv_path)
         return
 
     print(f"📂 Loading game logs from: {csv_path}")
+    run = Run("load_game_logs")
+
+    with run.stage("read") as span:
+        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        span.add(len(df))
+
+    # Your CSV has **11 columns** — enforce that
+    if list(df.columns) != CSV_COLUMNS:
+        print("❌ Unexpected CSV header:", list(df.columns))
+        return
+
+    with run.stage("transform") as span:
+        for col in ["SEASON", "HOME_POINTS", "AWAY_POINTS"]:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        bad = df[["SEASON", "HOME_POINTS", "AWAY_POINTS"]].isna().any(axis=1) | (df["GAME_DATE"] == "")
+        if bad.any():
+            print(f"⚠️ Skipping {bad.sum()} rows with missing date / season / score")
+            run.count("skipped", int(bad.sum()))
+            df = df[~bad]
+
+        # Streak columns in the CSV are placeholders; real values are computed below
+        batch = [
+            [r.GAME_DATE, int(r.SEASON), r.HOME_TEAM, r.AWAY_TEAM, int(r.HOME_POINTS),
+             int(r.AWAY_POINTS), r.WINNER, r.LOSER, r.NOTES]
+            for r in df.itertuples(index=False)
+        ]
+        span.add(len(batch))
 
     conn = get_connection()
     cursor = conn.cursor()
 
-    with open(csv_path, "r", encoding="utf-8") as file:
-        reader = csv.reader(file)
-        headers = next(reader)  # skip header row
-
-        inserted_rows = 0
-
-        for row in reader:
-            # Your CSV has **11 columns** — enforce that
-            if len(row) != 11:
-                print("⚠️ Skipping row with incorrect column count:", row)
-                continue
-
-            cursor.execute("""
-                INSERT INTO NBA_GAME_LOGS (
-                    GAME_DATE, SEASON, HOME_TEAM, AWAY_TEAM,
-                    HOME_POINTS, AWAY_POINTS, WINNER, LOSER,
-                    HOME_STREAK, AWAY_STREAK, NOTES
-                )
-                VALUES (
-                    TO_DATE(:1, 'YYYY-MM-DD'),
-                    :2, :3, :4, :5, :6, :7, :8, :9, :10, :11
-                )
-            """, row)
-
-            inserted_rows += 1
-
-    conn.commit()
-    cursor.close()
+    with run.stage("write") as span:
+        cursor.executemany("""
+            INSERT INTO NBA_GAME_LOGS (
+                GAME_DATE, SEASON, HOME_TEAM, AWAY_TEAM,
+                HOME_POINTS, AWAY_POINTS, WINNER, LOSER,
+                HOME_STREAK, AWAY_STREAK, NOTES
+            )
+            VALUES (
+                TO_DATE(:1, 'YYYY-MM-DD'),
+                :2, :3, :4, :5, :6, :7, :8, 0, 0, :9
+            )
+        """, batch)
+        conn.commit()
+        cursor.close()
+        span.add(len(batch))
+
+    print(f"✅ Successfully inserted {len(batch)} game log records!")
+
+    # Pre-game streaks over every game of the touched seasons (not just this file)
+    seasons = sorted(df["SEASON"].astype(int).unique())
+    with run.stage("streaks") as span:
+        updated = refresh_streaks(conn, seasons)
+        span.add(updated)
+    print(f"🔥 Pre-game streaks computed — {updated} games updated across seasons {seasons}")
+
     conn.close()
 
-    print(f"✅ Successfully inserted {inserted_rows} game log records!")
+    # NBA_TEAM_SRS for the team view; re-solves only seasons whose games changed
+    with run.stage("srs"):
+        update_srs()
+    run.finish()
 
 
 if __name__ == "__main__":
+    profile_from_env()
     csv_path = r"D:\sports-data-intelligence\data\nba_game_logs\nba_game_logs.csv"
     load_game_logs(csv_path)
-
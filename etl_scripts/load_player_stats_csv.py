@@ -1,12 +1,21 @@
 import os
+import sys
 import pandas as pd
+
+# Make sure Python can see config.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from config import get_connection
+from etl_scripts.instrumentation import Run
+from analytics.player_advanced import refresh_player_advanced
+from profiling import profile_from_env
 
 # Default CSV path – update if needed
 CSV_PATH = r"D:\sports-data-intelligence\data\nba_player_stats\nba_player_stats.csv"
 
 
 def load_player_stats_from_csv(csv_path: str = CSV_PATH):
+    run = Run("load_player_stats_csv")
     print(f"📂 Looking for CSV at: {csv_path}")
 
     if not os.path.exists(csv_path):
@@ -14,7 +23,9 @@ def load_player_stats_from_csv(csv_path: str = CSV_PATH):
         return
 
     # Read CSV
-    df = pd.read_csv(csv_path)
+    with run.stage("read") as span:
+        df = pd.read_csv(csv_path)
+        span.add(len(df))
 
     # Expected columns
     required_cols = [
@@ -56,37 +67,46 @@ def load_player_stats_from_csv(csv_path: str = CSV_PATH):
 
     rows_inserted = 0
 
-    for _, row in df.iterrows():
-        try:
-            cur.execute(
-                insert_sql,
-                (
-                    row["PLAYER_NAME"],
-                    row["TEAM_NAME"],
-                    int(row["SEASON"]) if not pd.isna(row["SEASON"]) else None,
-                    row["GAMES_PLAYED"],
-                    row["MINUTES"],
-                    row["POINTS"],
-                    row["ASSISTS"],
-                    row["REBOUNDS"],
-                    row["STEALS"],
-                    row["BLOCKS"],
-                    row["TURNOVERS"],
-                    row["FG_PERCENT"],
-                    row["THREE_PERCENT"],
-                    row["FT_PERCENT"],
-                ),
-            )
-            rows_inserted += 1
-        except Exception as e:
-            print(f"⚠️ Skipping row for player {row.get('PLAYER_NAME', 'UNKNOWN')}: {e}")
-
-    conn.commit()
+    with run.stage("write") as span:
+        for _, row in df.iterrows():
+            try:
+                cur.execute(
+                    insert_sql,
+                    (
+                        row["PLAYER_NAME"],
+                        row["TEAM_NAME"],
+                        int(row["SEASON"]) if not pd.isna(row["SEASON"]) else None,
+                        row["GAMES_PLAYED"],
+                        row["MINUTES"],
+                        row["POINTS"],
+                        row["ASSISTS"],
+                        row["REBOUNDS"],
+                        row["STEALS"],
+                        row["BLOCKS"],
+                        row["TURNOVERS"],
+                        row["FG_PERCENT"],
+                        row["THREE_PERCENT"],
+                        row["FT_PERCENT"],
+                    ),
+                )
+                rows_inserted += 1
+            except Exception as e:
+                run.count("skipped")
+                run.event(f"⚠️ Skipping row for player {row.get('PLAYER_NAME', 'UNKNOWN')}: {e}")
+
+        conn.commit()
+        span.add(rows_inserted)
+
+    # Per-36, usage and PER for the reloaded seasons (NBA_PLAYER_ADVANCED)
+    with run.stage("advanced") as span:
+        span.add(refresh_player_advanced(conn, seasons_in_csv))
     cur.close()
     conn.close()
 
     print(f"✅ Done. Inserted {rows_inserted} player rows into NBA_PLAYER_STATS.")
+    run.finish()
 
 
 if __name__ == "__main__":
+    profile_from_env()
     load_player_stats_from_csv()
@@ -0,0 +1,226 @@
+"""
+Opt-in profiling for the script entry points.
+
+Every ETL main, analytics builder / trainer and visualize_* script calls
+profile_from_env() when it starts. It does nothing unless SDI_PROFILE is set:
+
+    SDI_PROFILE=cprofile           → deterministic profile (cProfile)
+    SDI_PROFILE=sample             → statistical sampling, every 5 ms
+    SDI_PROFILE=sample:1           → ... every 1 ms
+    SDI_PROFILE_DIR=<dir>          → where to write (default profiles/)
+
+When the script exits, two files are written per run:
+    <script>_<timestamp>_<pid>.pstats       → python -m pstats / snakeviz
+    <script>_<timestamp>_<pid>.collapsed    → flamegraph.pl / speedscope
+
+Sampling mode writes a pstats file too. Each sample is weighted by the wall
+time measured since the previous one, not by the nominal interval: the
+sampler needs the GIL, so under CPU-bound code it wakes far less often than
+asked. Both modes write collapsed weights in µs. cProfile does not keep full stacks, so its collapsed file
+splits each function's time across call paths in proportion to the time
+spent on each caller → callee edge.
+"""
+
+import os
+import sys
+import time
+import atexit
+import marshal
+import cProfile
+import pstats
+import threading
+from collections import Counter, defaultdict
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIR = os.path.join(PROJECT_ROOT, "profiles")
+DEFAULT_INTERVAL_MS = 5.0
+MAX_DEPTH = 200               # deepest stack kept when collapsing a cProfile graph
+MIN_PATH_SHARE = 1e-4         # ...and paths under this fraction of total time are dropped
+MAX_PATHS = 200_000           # hard cap on call paths visited (the graph can fan out a lot)
+
+_active = None
+
+
+def frame_label(key):
+    """(file, line, function) → 'module.py:function:line' for flame graphs."""
+    filename, line, name = key
+    return f"{os.path.basename(filename)}:{name}:{line}"
+
+
+def output_base(name, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    return os.path.join(out_dir, f"{name}_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}")
+
+
+def write_collapsed(path, stacks):
+    """stacks: {('root', ..., 'leaf'): weight} → one 'a;b;c weight' line per stack."""
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, weight in sorted(stacks.items(), key=lambda kv: -kv[1]):
+            if weight > 0:
+                f.write(f"{';'.join(stack)} {int(round(weight))}\n")
+
+
+# =====================================
+# Deterministic: cProfile
+# =====================================
+class DeterministicProfiler:
+    mode = "cprofile"
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self, base):
+        self.profile.disable()
+        self.profile.dump_stats(base + ".pstats")
+        stats = pstats.Stats(base + ".pstats").stats
+        write_collapsed(base + ".collapsed", self.collapse(stats))
+        return [base + ".pstats", base + ".collapsed"]
+
+    @staticmethod
+    def collapse(stats):
+        """Approximate full stacks from the caller → callee graph (weights in µs)."""
+        callees = defaultdict(dict)
+        for func, (_, _, _, _, callers) in stats.items():
+            for caller, edge in callers.items():
+                callees[caller][func] = edge[3]   # cumulative time of func when called from caller
+
+        stacks = Counter()
+        roots = [f for f, (_, _, _, _, callers) in stats.items() if not callers]
+        min_share = sum(stats[r][3] for r in roots) * MIN_PATH_SHARE
+        visited = [0]
+
+        def walk(func, path, share):
+            # share: the part of func's cumulative time that runs under this path
+            _, _, tt, ct, _ = stats[func]
+            visited[0] += 1
+            if ct <= 0 or share <= min_share or visited[0] > MAX_PATHS:
+                return
+            fraction = min(share / ct, 1.0)
+            path = path + (frame_label(func),)
+            stacks[path] += tt * fraction * 1e6
+            if len(path) >= MAX_DEPTH:
+                return
+            for callee, edge_ct in callees.get(func, {}).items():
+                if frame_label(callee) not in path:     # recursion is folded into the first frame
+                    walk(callee, path, edge_ct * fraction)
+
+        for root in roots:
+            walk(root, (), stats[root][3])
+        return stacks
+
+
+# =====================================
+# Statistical: stack sampling thread
+# =====================================
+class SamplingProfiler:
+    mode = "sample"
+
+    def __init__(self, interval_ms=DEFAULT_INTERVAL_MS):
+        self.interval = interval_ms / 1000.0
+        self.samples = Counter()         # tuple of frame keys (root → leaf) → count
+        self.seconds = Counter()         # ... → wall time those samples stand for
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="sdi-profiler", daemon=True)
+        if self.interval < sys.getswitchinterval():
+            print(f"⚠️ Sampling every {interval_ms:g} ms, but the GIL switches every "
+                  f"{sys.getswitchinterval() * 1000:g} ms — busy code is sampled less often than that "
+                  f"(times are still weighted by the measured gaps)")
+
+    def start(self):
+        self.last_sample = time.perf_counter()
+        self.thread.start()
+
+    def run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self.stopping.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, self.last_sample = now - self.last_sample, now
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.reverse()
+                if ident not in names:
+                    thread = threading._active.get(ident)
+                    names[ident] = thread.name if thread else str(ident)
+                if names[ident] != "MainThread":
+                    stack.insert(0, ("<thread>", 0, names[ident]))
+                self.samples[tuple(stack)] += 1
+                self.seconds[tuple(stack)] += elapsed
+
+    def stop(self, base):
+        self.stopping.set()
+        self.thread.join()
+        if not self.samples:
+            return []   # ran for less than one interval
+        write_collapsed(base + ".collapsed",
+                        {tuple(frame_label(k) for k in stack): t * 1e6 for stack, t in self.seconds.items()})
+        with open(base + ".pstats", "wb") as f:
+            marshal.dump(self.to_pstats(), f)
+        return [base + ".pstats", base + ".collapsed"]
+
+    def to_pstats(self):
+        """
+        Samples in the shape pstats.Stats loads: {func: (cc, nc, tt, ct, callers)}.
+        Counts are sample counts; times are the measured seconds the samples stand for.
+        """
+        count, self_time, inclusive = Counter(), Counter(), Counter()
+        edge_count, edge_time = defaultdict(Counter), defaultdict(Counter)
+        for stack, n in self.samples.items():
+            t = self.seconds[stack]
+            self_time[stack[-1]] += t
+            for func in set(stack):
+                count[func] += n
+                inclusive[func] += t
+            for caller, callee in set(zip(stack, stack[1:])):
+                edge_count[callee][caller] += n
+                edge_time[callee][caller] += t
+
+        stats = {}
+        for func, n in count.items():
+            callers = {c: (k, k, 0.0, edge_time[func][c]) for c, k in edge_count[func].items()}
+            stats[func] = (n, n, self_time[func], inclusive[func], callers)
+        return stats
+
+
+# =====================================
+# Entry point hook
+# =====================================
+def profile_from_env(name=None):
+    """Start the profiler named by SDI_PROFILE (if any); results are written at exit."""
+    global _active
+    setting = os.environ.get("SDI_PROFILE", "").strip().lower()
+    if not setting or setting in ("0", "off", "false", "no") or _active is not None:
+        return None
+
+    mode, _, arg = setting.partition(":")
+    if mode in ("cprofile", "1", "on", "true", "yes"):
+        profiler = DeterministicProfiler()
+    elif mode == "sample":
+        profiler = SamplingProfiler(float(arg) if arg else DEFAULT_INTERVAL_MS)
+    else:
+        print(f"⚠️ Unknown SDI_PROFILE={setting!r} — expected cprofile or sample[:ms]; not profiling")
+        return None
+
+    name = name or os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+    out_dir = os.environ.get("SDI_PROFILE_DIR", DEFAULT_DIR)
+
+    def finish():
+        files = profiler.stop(output_base(name, out_dir))
+        if files:
+            print(f"🔬 Profile ({profiler.mode}) → {', '.join(files)}")
+        else:
+            print(f"🔬 Profile ({profiler.mode}): no samples collected — try a shorter interval")
+
+    _active = profiler
+    atexit.register(finish)
+    profiler.start()
+    return profiler
@@ -0,0 +1,465 @@
+"""
+Optional SQL profiling for every connection handed out by config.get_connection().
+
+Off unless SDI_QUERY_PROFILE is set:
+
+    SDI_QUERY_PROFILE=1            → profile into logs/query_profile/
+    SDI_QUERY_PROFILE=<dir>        → profile into <dir>
+
+When on, connections are wrapped so each statement records its fingerprint
+(literals and binds replaced by ?), bind count, execute time, fetch time, rows
+and an estimate of the bytes fetched. Records go to an in-process ring buffer
+(recent()), to <dir>/queries_<source>_<pid>.jsonl, and are aggregated per
+fingerprint into a Prometheus textfile (<dir>/sdi_queries_<source>.prom) that
+node_exporter's textfile collector can pick up. pd.read_sql calls are tagged,
+and the DataFrame build time pandas adds on top of the driver is recorded.
+
+    python query_profiler.py [dir] --top 20   # top offenders across all JSONL files
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import hashlib
+import weakref
+import argparse
+import threading
+from collections import deque, defaultdict
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIR = os.path.join(PROJECT_ROOT, "logs", "query_profile")
+
+RING_SIZE = 5000          # statements kept in memory for recent()
+FLUSH_EVERY = 200         # statements between textfile rewrites...
+FLUSH_SECONDS = 30.0      # ...or this long, whichever comes first (dashboards never exit)
+SQL_PREVIEW = 200         # characters of the fingerprint kept in the textfile info metric
+
+
+def profile_dir():
+    """Where profiles go, or None when profiling is off."""
+    value = os.environ.get("SDI_QUERY_PROFILE", "").strip()
+    if value.lower() in ("", "0", "false", "off", "no"):
+        return None
+    return DEFAULT_DIR if value.lower() in ("1", "true", "on", "yes") else value
+
+
+def source_name():
+    name = os.environ.get("SDI_QUERY_SOURCE")
+    if name:
+        return name
+    script = os.path.splitext(os.path.basename(sys.argv[0] if sys.argv and sys.argv[0] else "python"))[0]
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", script) or "python"
+
+
+# =====================================
+# Fingerprints
+# =====================================
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_BINDS = re.compile(r"(?<![:\w]):(?:\d+|[A-Za-z_]\w*)\b|\?|%s|%\(\w+\)s")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Normalised SQL: statements that differ only in literals / binds share a fingerprint."""
+    text = _COMMENTS.sub(" ", sql)
+    text = _STRINGS.sub("?", text)
+    text = _BINDS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _IN_LISTS.sub("(?+)", text)
+    return _SPACES.sub(" ", text).strip().rstrip(";").upper()
+
+
+def fingerprint_id(text):
+    return hashlib.md5(text.encode("utf-8")).hexdigest()[:12]
+
+
+def bind_count(params):
+    if params is None:
+        return 0
+    if isinstance(params, (dict, list, tuple)):
+        return len(params)
+    return 1
+
+
+def row_bytes(rows):
+    """Rough payload size: text/bytes by length, everything else as 8 bytes."""
+    total = 0
+    for row in rows:
+        for value in row:
+            if value is None:
+                continue
+            total += len(value) if isinstance(value, (str, bytes, bytearray)) else 8
+    return total
+
+
+# =====================================
+# Collector: ring buffer + sinks
+# =====================================
+class Collector:
+    def __init__(self, out_dir, source):
+        self.out_dir = out_dir
+        self.source = source
+        self.ring = deque(maxlen=RING_SIZE)
+        self.totals = defaultdict(lambda: {"calls": 0, "errors": 0, "exec_s": 0.0, "fetch_s": 0.0,
+                                           "rows": 0, "bytes": 0, "sql": ""})
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.since_flush = 0
+        self.last_flush = time.time()
+        self.cursors = weakref.WeakSet()   # open cursors — their last statement is still pending
+
+        os.makedirs(out_dir, exist_ok=True)
+        self.jsonl_path = os.path.join(out_dir, f"queries_{source}_{os.getpid()}.jsonl")
+        self.prom_path = os.path.join(out_dir, f"sdi_queries_{source}.prom")
+        self.jsonl = open(self.jsonl_path, "a", encoding="utf-8", buffering=1)
+        atexit.register(self.close)
+
+    def record(self, rec):
+        # Inside pd.read_sql: hold the record until the DataFrame is built (frame_ms)
+        pending = getattr(self.local, "pending", None)
+        if pending is not None:
+            pending.append(rec)
+            return
+        self.emit(rec)
+
+    def emit(self, rec):
+        with self.lock:
+            self.ring.append(rec)
+            agg = self.totals[rec["fp_id"]]
+            agg["calls"] += 1
+            agg["errors"] += 1 if rec.get("error") else 0
+            agg["exec_s"] += rec["exec_ms"] / 1000
+            agg["fetch_s"] += rec["fetch_ms"] / 1000
+            agg["rows"] += rec["rows"]
+            agg["bytes"] += rec["bytes"]
+            agg["sql"] = rec["fingerprint"]
+            if not self.jsonl.closed:
+                self.jsonl.write(json.dumps(rec) + "\n")
+
+            self.since_flush += 1
+            if self.since_flush >= FLUSH_EVERY or time.time() - self.last_flush >= FLUSH_SECONDS:
+                self.write_textfile()
+
+    def write_textfile(self):
+        """Prometheus text exposition, written atomically (textfile collectors read mid-write files)."""
+        metrics = [
+            ("sdi_sql_statements_total", "counter", "Statements executed", "calls"),
+            ("sdi_sql_errors_total", "counter", "Statements that raised", "errors"),
+            ("sdi_sql_exec_seconds_total", "counter", "Time spent in execute()", "exec_s"),
+            ("sdi_sql_fetch_seconds_total", "counter", "Time spent fetching rows", "fetch_s"),
+            ("sdi_sql_rows_total", "counter", "Rows fetched (or bound, for executemany)", "rows"),
+            ("sdi_sql_bytes_total", "counter", "Estimated bytes fetched", "bytes"),
+        ]
+        lines = []
+        for name, kind, help_text, field in metrics:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for fp_id, agg in self.totals.items():
+                value = round(agg[field], 6) if isinstance(agg[field], float) else agg[field]
+                lines.append(f'{name}{{source="{self.source}",fingerprint="{fp_id}"}} {value}')
+
+        lines += ["# HELP sdi_sql_fingerprint_info Fingerprint id to normalised SQL",
+                  "# TYPE sdi_sql_fingerprint_info gauge"]
+        for fp_id, agg in self.totals.items():
+            sql = agg["sql"][:SQL_PREVIEW].replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'sdi_sql_fingerprint_info{{source="{self.source}",fingerprint="{fp_id}",sql="{sql}"}} 1')
+
+        tmp = f"{self.prom_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.prom_path)
+        self.since_flush = 0
+        self.last_flush = time.time()
+
+    def close(self):
+        # A statement is recorded when its cursor moves on or closes; cursors left
+        # open until exit (conn.close() without cursor.close()) still hold one
+        with self.lock:
+            cursors = list(self.cursors)
+        for cursor in cursors:
+            cursor._finish()
+
+        with self.lock:
+            if self.totals:
+                self.write_textfile()
+            if not self.jsonl.closed:
+                self.jsonl.close()
+
+
+_collector = None
+_collector_lock = threading.Lock()
+
+
+def get_collector():
+    """The process-wide collector, or None when profiling is off."""
+    global _collector
+    out_dir = profile_dir()
+    if out_dir is None:
+        return None
+    with _collector_lock:
+        if _collector is None:
+            _collector = Collector(out_dir, source_name())
+            install_read_sql_hook()
+    return _collector
+
+
+def recent(n=None):
+    """Most recent statement records from the ring buffer (newest last)."""
+    if _collector is None:
+        return []
+    with _collector.lock:
+        items = list(_collector.ring)
+    return items[-n:] if n else items
+
+
+# =====================================
+# DB-API wrappers
+# =====================================
+class ProfiledCursor:
+    def __init__(self, cursor, collector):
+        object.__setattr__(self, "_cur", cursor)
+        object.__setattr__(self, "_collector", collector)
+        object.__setattr__(self, "_current", None)
+        with collector.lock:
+            collector.cursors.add(self)
+
+    def _start(self, sql, binds, batch=None):
+        self._finish()
+        fp = fingerprint(sql)
+        rec = {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "source": self._collector.source,
+               "fp_id": fingerprint_id(fp), "fingerprint": fp, "binds": binds,
+               "exec_ms": 0.0, "fetch_ms": 0.0, "rows": 0, "bytes": 0}
+        if batch is not None:
+            rec["batch"] = batch
+        object.__setattr__(self, "_current", rec)
+        return rec
+
+    def _finish(self):
+        rec = self._current
+        if rec is not None:
+            object.__setattr__(self, "_current", None)
+            rec["exec_ms"] = round(rec["exec_ms"], 3)
+            rec["fetch_ms"] = round(rec["fetch_ms"], 3)
+            self._collector.record(rec)
+
+    def _execute(self, fn, rec, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            rec["error"] = f"{type(e).__name__}: {str(e)[:200]}"
+            raise
+        finally:
+            rec["exec_ms"] += (time.perf_counter() - start) * 1000
+            if rec.get("error"):
+                self._finish()
+
+    def execute(self, sql, *args, **kwargs):
+        params = args[0] if args else (kwargs or None)
+        rec = self._start(sql, bind_count(params))
+        result = self._execute(self._cur.execute, rec, sql, *args, **kwargs)
+        # cx_Oracle returns the cursor itself for queries — hand back the wrapper instead
+        return self if result is self._cur else result
+
+    def executemany(self, sql, seq, *args, **kwargs):
+        seq = seq if isinstance(seq, (list, tuple)) else list(seq)
+        rec = self._start(sql, bind_count(seq[0]) if seq else 0, batch=len(seq))
+        rec["rows"] = len(seq)
+        return self._execute(self._cur.executemany, rec, sql, seq, *args, **kwargs)
+
+    def _fetched(self, rows, start):
+        rec = self._current
+        if rec is not None:
+            rec["fetch_ms"] += (time.perf_counter() - start) * 1000
+            rec["rows"] += len(rows)
+            rec["bytes"] += row_bytes(rows)
+        return rows
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cur.fetchone()
+        self._fetched([row] if row is not None else [], start)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        start = time.perf_counter()
+        return self._fetched(self._cur.fetchmany(*args, **kwargs), start)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        return self._fetched(self._cur.fetchall(), start)
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany()
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        self._finish()
+        return self._cur.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def __setattr__(self, name, value):
+        # cursor.arraysize = 500 etc. must reach the real cursor
+        setattr(self._cur, name, value)
+
+
+class ProfiledConnection:
+    def __init__(self, conn, collector):
+        self._conn = conn
+        self._collector = collector
+
+    def cursor(self, *args, **kwargs):
+        return ProfiledCursor(self._conn.cursor(*args, **kwargs), self._collector)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def wrap(conn):
+    """Profiled connection when SDI_QUERY_PROFILE is set, otherwise `conn` unchanged."""
+    collector = get_collector()
+    if collector is None or isinstance(conn, ProfiledConnection):
+        return conn
+    return ProfiledConnection(conn, collector)
+
+
+# =====================================
+# pd.read_sql tagging
+# =====================================
+_read_sql_installed = False
+
+
+def install_read_sql_hook():
+    """Tag statements issued through pd.read_sql and record the DataFrame build time."""
+    global _read_sql_installed
+    if _read_sql_installed:
+        return
+    try:
+        import pandas as pd
+    except ImportError:
+        return
+    original = pd.read_sql
+
+    def read_sql(*args, **kwargs):
+        collector = _collector
+        if collector is None or getattr(collector.local, "pending", None) is not None:
+            return original(*args, **kwargs)
+
+        collector.local.pending = []
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            total_ms = (time.perf_counter() - start) * 1000
+            pending, collector.local.pending = collector.local.pending, None
+            for rec in pending:
+                rec["via"] = "read_sql"
+            if pending:
+                driver_ms = sum(r["exec_ms"] + r["fetch_ms"] for r in pending)
+                pending[-1]["frame_ms"] = round(max(total_ms - driver_ms, 0.0), 3)
+            for rec in pending:
+                collector.emit(rec)
+
+    read_sql.__wrapped__ = original
+    pd.read_sql = read_sql
+    _read_sql_installed = True
+
+
+# =====================================
+# Aggregation across runs
+# =====================================
+def load_records(paths):
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from a killed process
+
+
+def aggregate(records):
+    """Per (source, fingerprint) totals, like the textfile but across every run on disk."""
+    groups = {}
+    for rec in records:
+        key = (rec.get("source", "?"), rec["fp_id"])
+        g = groups.setdefault(key, {"source": key[0], "fp_id": rec["fp_id"], "fingerprint": rec["fingerprint"],
+                                    "calls": 0, "errors": 0, "exec_ms": 0.0, "fetch_ms": 0.0,
+                                    "frame_ms": 0.0, "rows": 0, "bytes": 0, "max_ms": 0.0})
+        elapsed = rec["exec_ms"] + rec["fetch_ms"] + rec.get("frame_ms", 0.0)
+        g["calls"] += 1
+        g["errors"] += 1 if rec.get("error") else 0
+        g["exec_ms"] += rec["exec_ms"]
+        g["fetch_ms"] += rec["fetch_ms"]
+        g["frame_ms"] += rec.get("frame_ms", 0.0)
+        g["rows"] += rec["rows"]
+        g["bytes"] += rec["bytes"]
+        g["max_ms"] = max(g["max_ms"], elapsed)
+    for g in groups.values():
+        g["total_ms"] = g["exec_ms"] + g["fetch_ms"] + g["frame_ms"]
+        g["avg_ms"] = g["total_ms"] / g["calls"]
+    return list(groups.values())
+
+
+def print_top(groups, by="total_ms", top=20):
+    ranked = sorted(groups, key=lambda g: g[by], reverse=True)[:top]
+    print(f"\n{'source':<32}{'calls':>7}{'total ms':>11}{'avg ms':>9}{'max ms':>9}{'fetch %':>9}{'rows':>10}{'MB':>8}  sql")
+    print("-" * 126)
+    for g in ranked:
+        fetch_share = g["fetch_ms"] / g["total_ms"] * 100 if g["total_ms"] else 0
+        print(f"{g['source'][:31]:<32}{g['calls']:>7}{g['total_ms']:>11.1f}{g['avg_ms']:>9.1f}{g['max_ms']:>9.1f}"
+              f"{fetch_share:>8.0f}%{g['rows']:>10}{g['bytes'] / 1e6:>8.2f}  {g['fingerprint'][:70]}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Top SQL offenders from SDI_QUERY_PROFILE output")
+    parser.add_argument("dir", nargs="?", default=DEFAULT_DIR)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--by", default="total_ms", choices=["total_ms", "avg_ms", "max_ms", "calls", "rows", "bytes"])
+    parser.add_argument("--source", action="append", help="only these scripts / pages (repeatable)")
+    args = parser.parse_args()
+
+    files = sorted(os.path.join(args.dir, f) for f in os.listdir(args.dir)
+                   if f.startswith("queries_") and f.endswith(".jsonl")) if os.path.isdir(args.dir) else []
+    if not files:
+        print(f"❌ No query profiles in {args.dir} — run something with SDI_QUERY_PROFILE=1 first")
+        sys.exit(1)
+
+    groups = aggregate(load_records(files))
+    if args.source:
+        groups = [g for g in groups if g["source"] in args.source]
+    print(f"📊 {sum(g['calls'] for g in groups)} statements, {len(groups)} fingerprints from {len(files)} file(s)")
+    print_top(groups, args.by, args.top)
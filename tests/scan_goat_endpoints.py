@@ -1,3 +1,4 @@
+import os
 import requests
 
 API_KEY = "081aceca-0dd3-40f8-a617-bf5ce7212364"   # <-- replace with your actual key
@@ -10,6 +11,10 @@ BASES = [
     "https://api.balldontlie.io/api"
 ]
 
+# e.g. a local benchmarks/mock_balldontlie.py instance
+if os.environ.get("BALLDONTLIE_BASE_URL"):
+    BASES.insert(0, os.environ["BALLDONTLIE_BASE_URL"].rstrip("/"))
+
 ENDPOINTS = [
     "players", "teams", "games", "stats", "season_averages",
     "standings", "boxscores", "schedule", "search","leagues",